@@ -1,18 +1,21 @@
 import streamlit as st
-from pgmpy.models import DiscreteBayesianNetwork
-from pgmpy.factors.discrete import TabularCPD
-from pgmpy.inference import VariableElimination
 import pandas as pd
-import itertools
-from collections import defaultdict
 import json
 
+from diagnosis.evidence import ABSENT, PRESENT, build_evidence
+from diagnosis.history import diagnosis_log
+from diagnosis.registry import DEFAULT_CROP, default_registry
+# Format nama yang sama dengan indeks pencarian gejala
+from diagnosis.search import format_label as format_name
+from diagnosis.telemetry import profile, telemetry
+from diagnosis.topk import complete_posterior
+
 # Import style loader
 from style_loader import load_css
 
 # Konfigurasi halaman
 st.set_page_config(
-    page_title="Diagnosis Hama & Penyakit Tembakau",
+    page_title="Diagnosis Hama & Penyakit Tanaman",
     page_icon="🌱",
     layout="wide",
 )
@@ -23,178 +26,81 @@ load_css('style/style.css')
 # Initialize session state untuk reset functionality
 if 'form_key' not in st.session_state:
     st.session_state.form_key = 0
+# Status gejala per tanaman (bertahan walau gejala tersaring dari grid) dan hasil terakhir
+if 'status_gejala' not in st.session_state:
+    st.session_state.status_gejala = {}
+if 'hasil_diagnosis' not in st.session_state:
+    st.session_state.hasil_diagnosis = None
+
+# Registry model per tanaman: rule_list.json di root (tembakau) + bundle di models/<tanaman>/
+registry = default_registry()
+daftar_tanaman = registry.names()
+
+# Pilih tanaman (hanya tampil jika ada lebih dari satu bundle model)
+if len(daftar_tanaman) > 1:
+    tanaman = st.sidebar.selectbox(
+        "🌿 Tanaman",
+        options=daftar_tanaman,
+        index=daftar_tanaman.index(DEFAULT_CROP) if DEFAULT_CROP in daftar_tanaman else 0,
+        format_func=registry.label,
+    )
+else:
+    tanaman = daftar_tanaman[0] if daftar_tanaman else DEFAULT_CROP
+label_tanaman = registry.label(tanaman) if tanaman in daftar_tanaman else tanaman.title()
 
-# Load data dari file JSON
-@st.cache_data
-def load_json_data():
+# Load model diagnosis lewat registry (dikompilasi saat pertama dipakai, cache dalam proses
+# berdasarkan hash isi rule_list.json). Dipanggil setiap rerun: edit rule_list.json diterapkan
+# inkremental dan model ditukar secara atomik, sementara diagnosis yang sedang berjalan tetap
+# memakai versi lama.
+def load_diagnosis_model(tanaman):
     try:
-        with open('rule_list.json', 'r', encoding='utf-8') as f:
-            rule_list = json.load(f)
-        
-        with open('individuals_list.json', 'r', encoding='utf-8') as f:
-            individuals_list = json.load(f)
-        
-        return rule_list, individuals_list, True
+        return registry.get(tanaman)
+    except KeyError:
+        st.error(f"Model tanaman tidak ditemukan: {tanaman}")
     except FileNotFoundError as e:
         st.error(f"File JSON tidak ditemukan: {e}")
-        return [], [], False
     except json.JSONDecodeError as e:
         st.error(f"Error parsing JSON: {e}")
-        return [], [], False
-
-# Load data
-rule_list, individuals_list, rules_loaded = load_json_data()
-
-# Daftar semua hama dan penyakit
-hama_penyakit_list = [
-    "Lanas", "Phytium_sp", "Ulat_tanah", "Jangkrik",
-    "Kutu_kebul", "Tobacco_mozaic_virus", "Phytophthora_daun",
-    "Begomovirus", "Cucumber_virus", "Virus_kerupuk", 
-    "Thrips_parvispinus", "Ulat_grayak" 
-]
-
-# Ekstrak daftar gejala LANGSUNG dari rule_list.json (SUMBER KEBENARAN)
-@st.cache_data
-def get_gejala_from_rules():
-    """Ekstrak dan urutkan gejala dari rule_list"""
-    if not rules_loaded:
-        return []
-    
-    # Kumpulkan semua gejala unik dari rule_list
-    gejala_set = set()
-    for item in rule_list:
-        gejala_set.add(item['gejala'])
-    
-    # Urutkan alfabetis
-    gejala_list = sorted(list(gejala_set))
-    
-    return gejala_list
-
-gejala_list = get_gejala_from_rules()
-
-# Fungsi untuk membangun model Bayesian Network
-@st.cache_resource
-def build_bayesian_model():
-    if not rules_loaded:
-        return None, None
-    
-    try:
-        # Buat struktur jaringan
-        edges = []
-        for item in rule_list:
-            edges.append((item['nama'], item['gejala']))
-
-        model = DiscreteBayesianNetwork(edges)
-
-        # Set prior probability untuk setiap penyakit/hama
-        penyakit_priors = {
-            'Lanas': 0.5,
-            'Phytium_sp': 0.5,
-            'Ulat_tanah': 0.5,
-            'Jangkrik': 0.5,
-            'Kutu_kebul': 0.5,
-            'Tobacco_mozaic_virus': 0.5,
-            'Phytophthora_daun': 0.5,
-            'Begomovirus': 0.5,
-            'Cucumber_virus': 0.5,
-            'Virus_kerupuk': 0.5,
-            'Thrips_parvispinus': 0.5,
-            'Ulat_grayak': 0.5
-        }
-        
-        # penyakit_priors = {
-        #     'Lanas': 0.15,
-        #     'Phytium_sp': 0.05,
-        #     'Ulat_tanah': 0.06,
-        #     'Jangkrik': 0.05,
-        #     'Kutu_kebul': 0.08,
-        #     'Tobacco_mozaic_virus': 0.07,
-        #     'Phytophthora_daun': 0.08,
-        #     'Begomovirus': 0.06,
-        #     'Cucumber_virus': 0.05,
-        #     'Virus_kerupuk': 0.05,
-        #     'Thrips_parvispinus': 0.12,
-        #     'Ulat_grayak': 0.18
-        # }
+    except ValueError as e:
+        st.error(f"Error membangun model: {e}")
+    return None
 
-        # Masukkan CPT untuk node penyakit/hama (prior)
-        penyakit = set([item['nama'] for item in rule_list])
-        for p in penyakit:
-            prior_prob = penyakit_priors.get(p, 0.1)
-            cpd_p = TabularCPD(variable=p, variable_card=2, 
-                              values=[[1-prior_prob], [prior_prob]])
-            model.add_cpds(cpd_p)
+diagnosis_model = load_diagnosis_model(tanaman)
 
-        # Group gejala berdasarkan parent nodes
-        gejala_to_parents = defaultdict(list)
-        gejala_to_scores = defaultdict(dict)
+# Daftar semua hama dan penyakit LANGSUNG dari model tanaman terpilih
+hama_penyakit_list = diagnosis_model.hama_penyakit_list if diagnosis_model else []
 
-        for item in rule_list:
-            g = item['gejala']
-            p = item['nama']
-            gejala_to_parents[g].append(p)
-            gejala_to_scores[g][p] = float(item['skor'])
+# Daftar gejala LANGSUNG dari rule_list.json (SUMBER KEBENARAN)
+gejala_list = diagnosis_model.gejala_list if diagnosis_model else []
 
-        # Masukkan CPT untuk gejala
-        for g, parents in gejala_to_parents.items():
-            if len(parents) == 1:
-                p = parents[0]
-                prob_given_disease = gejala_to_scores[g][p]
-                prob_given_no_disease = 0.1  # 10% leak probability (sesuai pakar)
-                
-                cpd_g = TabularCPD(variable=g, variable_card=2, 
-                                  values=[[1 - prob_given_no_disease, 1 - prob_given_disease],
-                                          [prob_given_no_disease, prob_given_disease]],
-                                  evidence=[p], evidence_card=[2])
-                model.add_cpds(cpd_g)
-            else:
-                # Multiple parents dengan noisy-OR
-                n_parents = len(parents)
-                values_0 = []
-                values_1 = []
-                
-                for parent_states in itertools.product([0, 1], repeat=n_parents):
-                    prob_not_symptom = 1.0
-                    
-                    for idx, state in enumerate(parent_states):
-                        p = parents[idx]
-                        if state == 1:
-                            prob_not_symptom *= (1 - gejala_to_scores[g][p])
-                    
-                    if sum(parent_states) == 0:
-                        prob_not_symptom = 0.9  # 10% leak probability (sesuai pakar)
-                    
-                    prob_symptom = 1 - prob_not_symptom
-                    values_0.append(1 - prob_symptom)
-                    values_1.append(prob_symptom)
-                
-                cpd_g = TabularCPD(variable=g, variable_card=2,
-                                   values=[values_0, values_1],
-                                   evidence=parents, evidence_card=[2]*n_parents)
-                model.add_cpds(cpd_g)
+# Jumlah maksimum gejala yang dirender sekaligus; sisanya dicapai lewat pencarian
+MAX_VISIBLE_SYMPTOMS = 45
 
-        # Validasi model
-        model.check_model()
-        return model, VariableElimination(model), penyakit_priors
-        
-    except Exception as e:
-        st.error(f"Error membangun model: {e}")
-        return None, None, None
+# Pilihan status gejala (tiga keadaan)
+STATUS_TIDAK_DICEK = "—"
+STATUS_GEJALA = {
+    STATUS_TIDAK_DICEK: None,
+    "Ada": PRESENT,
+    "Tidak ada": ABSENT,
+}
 
 # Helper functions
-def format_name(name):
-    """Format nama gejala"""
-    return name.replace('_', ' ').title()
-
-def display_results(selected_symptoms, posterior_probs):
-    """Tampilkan hasil diagnosis"""
+def display_results(selected_symptoms, posterior_probs, absent_symptoms=(), bounds=None):
+    """Tampilkan hasil diagnosis (bounds: nama -> (lower, upper) untuk penyakit di luar top 5)"""
+    bounds = bounds or {}
     st.markdown('<div class="result-section">', unsafe_allow_html=True)
     st.subheader("📊 Hasil Diagnosis")
     
     # Gejala yang dipilih
-    st.markdown("**🔍 Gejala yang dipilih:**")
-    symptoms_display = ", ".join([format_name(s) for s in selected_symptoms])
-    st.write(symptoms_display)
+    if selected_symptoms:
+        st.markdown("**🔍 Gejala yang dipilih:**")
+        symptoms_display = ", ".join([format_name(s) for s in selected_symptoms])
+        st.write(symptoms_display)
+    
+    # Gejala yang dipastikan tidak ada
+    if absent_symptoms:
+        st.markdown("**🚫 Gejala yang tidak ada:**")
+        st.write(", ".join([format_name(s) for s in absent_symptoms]))
     
     st.markdown("---")
     
@@ -224,9 +130,14 @@ def display_results(selected_symptoms, posterior_probs):
         st.subheader("📋 Detail Lengkap")
         df_results = []
         for hp, prob in sorted_results:
-            if prob > 0:
+            lower, upper = bounds.get(hp, (prob, prob))
+            if upper > 0:
                 nama = format_name(hp)
-                persen = f"{prob*100:.1f}%"
+                if upper > lower:
+                    # Batas (di luar top 5) atau interval kepercayaan (mode perkiraan)
+                    persen = f"{lower*100:.1f}–{upper*100:.1f}%"
+                else:
+                    persen = f"{prob*100:.1f}%"
                 df_results.append([nama, persen])
         
         if df_results:
@@ -237,22 +148,247 @@ def display_results(selected_symptoms, posterior_probs):
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def display_recommendations(recommendations):
+    """Tampilkan gejala yang sebaiknya dicek berikutnya"""
+    if not recommendations:
+        return
+    
+    st.subheader("🧭 Gejala yang Sebaiknya Dicek Berikutnya")
+    st.caption("Diurutkan berdasarkan seberapa besar gejala ini dapat memperjelas diagnosis teratas")
+    for i, rekomendasi in enumerate(recommendations):
+        st.write(f"**{i+1}. {format_name(rekomendasi['gejala'])}** "
+                 f"(kemungkinan ada {rekomendasi['p_ada']*100:.0f}%, "
+                 f"informasi {rekomendasi['gain']:.2f} bit)")
+
+def display_explanations(explanations):
+    """Tampilkan pengaruh tiap gejala yang ditandai terhadap diagnosis teratas"""
+    if not explanations or not any(penjelasan['kontribusi'] for penjelasan in explanations):
+        return
+    
+    st.subheader("🧩 Mengapa Diagnosis Ini?")
+    st.caption("Perubahan kemungkinan jika gejala tersebut tidak ditandai. "
+               "Rasio > 1 menguatkan diagnosis, rasio < 1 melemahkannya")
+    for penjelasan in explanations:
+        judul = f"{format_name(penjelasan['penyakit'])} ({penjelasan['posterior']*100:.1f}%)"
+        with st.expander(judul):
+            rows = [[format_name(k['gejala']),
+                     "Ada" if k['ada'] else "Tidak ada",
+                     f"{k['posterior_tanpa']*100:.1f}%",
+                     f"{k['selisih']*100:+.1f}",
+                     f"×{k['rasio']:.2f}"]
+                    for k in penjelasan['kontribusi']]
+            df = pd.DataFrame(rows, columns=["Gejala", "Status", "Tanpa gejala ini",
+                                             "Perubahan (poin %)", "Rasio likelihood"])
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+def simpan_status(statuses, gejala, key):
+    """Simpan status gejala agar tetap ada saat gejala tersaring dari grid"""
+    statuses[gejala] = st.session_state[key]
+
+def reset_form(statuses):
+    """Kosongkan semua status gejala dan hasil (dijalankan sebelum fragment dirender ulang)"""
+    # Increment form_key untuk memaksa widget baru dengan state bersih
+    st.session_state.form_key += 1
+    statuses.clear()
+    st.session_state.hasil_diagnosis = None
+
+def hitung_diagnosis(evidence_dict):
+    """Hitung posterior dan rekomendasi; None jika tidak ada gejala valid"""
+    selected_symptoms = [k for k, v in evidence_dict.items() if v == PRESENT]
+    absent_symptoms = [k for k, v in evidence_dict.items() if v == ABSENT]
+    
+    if not selected_symptoms and not absent_symptoms:
+        st.warning("⚠️ Silakan tandai minimal satu gejala untuk melakukan diagnosis!")
+        return None
+    
+    # Validasi evidence - pastikan gejala ada di model
+    all_nodes = set(diagnosis_model.gejala_list)
+    valid_symptoms = [s for s in selected_symptoms if s in all_nodes]
+    valid_absent = [s for s in absent_symptoms if s in all_nodes]
+    invalid_symptoms = [s for s in selected_symptoms + absent_symptoms if s not in all_nodes]
+    
+    if invalid_symptoms:
+        st.warning(f"⚠️ Gejala berikut tidak ditemukan di model: {', '.join([format_name(s) for s in invalid_symptoms])}")
+    
+    if not valid_symptoms and not valid_absent:
+        st.error("❌ Tidak ada gejala valid yang ditemukan di model!")
+        return None
+    
+    # DIAGNOSIS_PROFILE=file.prof memprofil diagnosis ini dengan cProfile
+    with st.spinner("🔄 Sedang menganalisis gejala..."), profile():
+        # Hitung probabilitas
+        posterior_probs = {}
+        # Gejala negatif diserap ke prior penyakit, tanpa biaya inferensi tambahan
+        evidence = build_evidence(valid_symptoms, valid_absent)
+        
+        # Posterior lengkap untuk log (bukan batas top-k yang ditampilkan)
+        logged = None
+        exact = True
+        bounds = {}
+        marginals = {}
+        try:
+            if diagnosis_model.exact_feasible(evidence):
+                # Hitung eksak hanya hama/penyakit yang masih mungkin masuk top 5; sisanya
+                # batas bawah/atas (cache bersama antar sesi, kunci = evidence + hash rule_list.json)
+                ranking = diagnosis_model.top_k(evidence, k=5)
+                bounds = ranking['bounds']
+                marginals = {hp: lower for hp, (lower, _) in bounds.items()}
+                if diagnosis_log.enabled:
+                    # Log butuh posterior eksak semua penyakit: lengkapi hasil top-k,
+                    # penyakit yang sudah eksak tidak dihitung ulang
+                    logged = complete_posterior(diagnosis_model.pruned, evidence, ranking)
+        except ValueError:
+            # Jalur eksak gagal: lanjut ke perkiraan di bawah
+            bounds = {}
+            marginals = {}
+        
+        if not marginals:
+            # Inferensi eksak terlalu mahal atau gagal: perkiraan dengan batas waktu
+            try:
+                hasil = diagnosis_model.approximate(evidence, n_samples=None, time_budget=1.0)
+                bounds = hasil['interval']
+                marginals = hasil['posterior']
+                logged, exact = marginals, False
+                st.info(f"ℹ️ Hasil perkiraan dari {hasil['samples']:,} sampel (interval kepercayaan 95%)")
+            except ValueError:
+                bounds = {}
+                marginals = {}
+        
+        for hp in hama_penyakit_list:
+            posterior_probs[hp] = marginals.get(hp, 0)
+        
+        # Catat diagnosis ke log Parquet (tren musiman dan prior empiris); yang gagal dihitung
+        # tidak dicatat, posterior perkiraan ditandai agar tidak masuk prevalensi
+        if logged is not None:
+            try:
+                diagnosis_log.append(diagnosis_model, evidence, logged, crop=tanaman, exact=exact)
+            except OSError as e:
+                st.warning(f"⚠️ Diagnosis tidak tercatat di log: {e}")
+        
+        # Rekomendasi gejala berikutnya: semua kandidat dalam satu kali jalan tervektorisasi
+        try:
+            recommendations = diagnosis_model.recommend(evidence, limit=3)
+        except ValueError:
+            recommendations = []
+    
+        # Penjelasan kontribusi gejala: posterior leave-one-out semua gejala dalam satu kali jalan
+        try:
+            explanations = diagnosis_model.explain(evidence)
+        except ValueError:
+            explanations = []
+    
+    return {
+        'tanaman': tanaman,
+        'gejala': valid_symptoms,
+        'posterior': posterior_probs,
+        'gejala_tidak_ada': valid_absent,
+        'bounds': bounds,
+        'rekomendasi': recommendations,
+        'penjelasan': explanations,
+    }
+
+@st.fragment
+def diagnosis_section():
+    """Pencarian, grid status gejala, dan hasil diagnosis (dijalankan ulang sendiri)"""
+    statuses = st.session_state.status_gejala.setdefault(tanaman, {})
+    form_key = st.session_state.form_key
+    
+    st.subheader("🔍 Pilih Gejala yang Terlihat")
+    
+    if not gejala_list:
+        st.error("❌ Tidak dapat memuat daftar gejala!")
+        return
+    
+    query = st.text_input(
+        "🔎 Cari gejala",
+        placeholder="Ketik sebagian nama gejala, mis. daun layu",
+        key=f"search_{tanaman}_{form_key}"
+    )
+    matches = diagnosis_model.search_index.search(query)
+    # Hanya sebagian gejala yang dirender agar biaya per interaksi tidak tumbuh dengan ontologi
+    shown = matches[:MAX_VISIBLE_SYMPTOMS]
+    
+    st.info(f"📝 Total {len(gejala_list)} gejala tersedia dalam sistem, {len(matches)} cocok dengan pencarian")
+    if len(matches) > len(shown):
+        st.caption(f"Menampilkan {len(shown)} gejala pertama. Gunakan pencarian untuk mempersempit daftar.")
+    
+    # Layout 3 kolom untuk status gejala
+    options = list(STATUS_GEJALA)
+    cols = st.columns(3)
+    for idx, gejala in enumerate(shown):
+        col_idx = idx % 3
+        with cols[col_idx]:
+            key = f"symptom_{tanaman}_{gejala}_{form_key}"
+            st.radio(
+                format_name(gejala),
+                options=options,
+                index=options.index(statuses.get(gejala, STATUS_TIDAK_DICEK)),
+                horizontal=True,
+                key=key,
+                on_change=simpan_status,
+                args=(statuses, gejala, key)
+            )
+    
+    # Gejala yang sudah ditandai tetap terlihat walau tersaring dari grid
+    ditandai = [f"{format_name(g)} ({status})" for g, status in statuses.items()
+                if status != STATUS_TIDAK_DICEK]
+    if ditandai:
+        st.caption("Sudah ditandai: " + ", ".join(ditandai))
+    
+    # Tombol submit dan reset
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col1:
+        st.button(
+            label="🔄 Reset",
+            type="secondary",
+            use_container_width=True,
+            key=f"reset_{tanaman}",
+            on_click=reset_form,
+            args=(statuses,)
+        )
+    
+    with col2:
+        submit_button = st.button(
+            label="🔍 Mulai Diagnosis",
+            type="primary",
+            use_container_width=True,
+            key=f"submit_{tanaman}"
+        )
+    
+    with col3:
+        # Kolom kosong untuk simetri
+        pass
+
+    # Proses hasil diagnosis
+    if submit_button:
+        evidence_dict = {g: STATUS_GEJALA[statuses.get(g, STATUS_TIDAK_DICEK)] for g in gejala_list}
+        st.session_state.hasil_diagnosis = hitung_diagnosis(evidence_dict)
+    
+    # Hasil terakhir tetap tampil saat gejala lain diubah, sampai diagnosis berikutnya
+    hasil = st.session_state.hasil_diagnosis
+    if hasil and hasil['tanaman'] == tanaman:
+        with telemetry.stage('render'):
+            display_results(hasil['gejala'], hasil['posterior'], hasil['gejala_tidak_ada'], hasil['bounds'])
+            display_explanations(hasil['penjelasan'])
+            display_recommendations(hasil['rekomendasi'])
+        
+        if submit_button and telemetry.enabled:
+            telemetry.write_jsonl()
+
 # Main application
 def main():
     """Function utama aplikasi"""
     
     # Load model
-    model_data = build_bayesian_model()
-    
-    if model_data is None or model_data[0] is None:
+    if diagnosis_model is None:
         st.error("❌ Tidak dapat memuat model diagnosis. Pastikan file rule_list.json dan individuals_list.json tersedia.")
         return
     
-    model, infer, penyakit_priors = model_data
-    
     # Header
-    st.markdown('<h1 class="main-title">Sistem Diagnosis Hama & Penyakit Tembakau</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="subtitle">Pilih gejala yang Anda amati pada tembakau untuk mendapatkan diagnosis yang akurat</p>', unsafe_allow_html=True)
+    st.markdown(f'<h1 class="main-title">Sistem Diagnosis Hama & Penyakit {label_tanaman}</h1>', unsafe_allow_html=True)
+    st.markdown(f'<p class="subtitle">Pilih gejala yang Anda amati pada {label_tanaman.lower()} untuk mendapatkan diagnosis yang akurat</p>', unsafe_allow_html=True)
 
     # Info box
     with st.container():
@@ -260,106 +396,23 @@ def main():
         <div class="info-container">
             <h4>📋 Cara Menggunakan:</h4>
             <ol>
-                <li><strong>Pilih gejala-gejala</strong> yang terlihat pada tanaman Anda di bawah ini</li>
+                <li><strong>Cari gejala</strong> dengan mengetik sebagian namanya untuk menyaring daftar</li>
+                <li><strong>Tandai gejala-gejala</strong> yang terlihat (<em>Ada</em>) atau sudah dipastikan tidak ada (<em>Tidak ada</em>) pada tanaman Anda</li>
                 <li><strong>Klik tombol</strong> "🔍 Mulai Diagnosis"</li>
                 <li><strong>Lihat hasil diagnosis</strong> dan tingkat kemungkinannya</li>
             </ol>
-            <p><strong>💡 Tips:</strong> Semakin banyak gejala yang dipilih, semakin akurat hasil diagnosisnya</p>
+            <p><strong>💡 Tips:</strong> Semakin banyak gejala yang ditandai, semakin akurat hasil diagnosisnya. Gejala yang tidak dicek dibiarkan "—"</p>
         </div>
         """, unsafe_allow_html=True)
 
-    # Form diagnosis
-    with st.form(key=f"diagnosis_form_{st.session_state.form_key}"):
-        st.subheader("🔍 Pilih Gejala yang Terlihat")
-        
-        if gejala_list:
-            st.info(f"📝 Total {len(gejala_list)} gejala tersedia dalam sistem")
-            
-            # Layout 3 kolom untuk checkbox
-            cols = st.columns(3)
-            evidence_dict = {}
-            
-            for idx, gejala in enumerate(gejala_list):
-                col_idx = idx % 3
-                with cols[col_idx]:
-                    display_name = format_name(gejala)
-                    evidence_dict[gejala] = st.checkbox(
-                        display_name, 
-                        key=f"symptom_{gejala}_{st.session_state.form_key}"
-                    )
-            
-            # Tombol submit dan reset dalam form
-            st.markdown("---")
-            col1, col2, col3 = st.columns([1, 2, 1])
-            
-            with col1:
-                reset_button = st.form_submit_button(
-                    label="🔄 Reset",
-                    type="secondary",
-                    use_container_width=True
-                )
-            
-            with col2:
-                submit_button = st.form_submit_button(
-                    label="🔍 Mulai Diagnosis",
-                    type="primary",
-                    use_container_width=True
-                )
-            
-            with col3:
-                # Kolom kosong untuk simetri
-                pass
-                
-        else:
-            st.error("❌ Tidak dapat memuat daftar gejala!")
-            submit_button = False
-            reset_button = False
-
-    # Handle reset button
-    if reset_button:
-        # Increment form_key untuk memaksa form baru dengan state bersih
-        st.session_state.form_key += 1
-        st.success("✅ Form telah direset!")
-        st.rerun()
-
-    # Proses hasil diagnosis
-    if submit_button:
-        selected_symptoms = [k for k, v in evidence_dict.items() if v]
-        
-        if not selected_symptoms:
-            st.warning("⚠️ Silakan pilih minimal satu gejala untuk melakukan diagnosis!")
-        else:
-            # Validasi evidence - pastikan gejala ada di model
-            all_nodes = set(model.nodes())
-            valid_symptoms = [s for s in selected_symptoms if s in all_nodes]
-            invalid_symptoms = [s for s in selected_symptoms if s not in all_nodes]
-            
-            if invalid_symptoms:
-                st.warning(f"⚠️ Gejala berikut tidak ditemukan di model: {', '.join([format_name(s) for s in invalid_symptoms])}")
-            
-            if not valid_symptoms:
-                st.error("❌ Tidak ada gejala valid yang ditemukan di model!")
-            else:
-                with st.spinner("🔄 Sedang menganalisis gejala..."):
-                    # Hitung probabilitas
-                    posterior_probs = {}
-                    evidence = {symptom: 1 for symptom in valid_symptoms}
-                    
-                    # Hitung posterior untuk setiap hama/penyakit
-                    for hp in hama_penyakit_list:
-                        try:
-                            result = infer.query(variables=[hp], evidence=evidence)
-                            posterior_probs[hp] = result.values[1]
-                        except Exception as e:
-                            posterior_probs[hp] = 0
-                    
-                    # Tampilkan hasil
-                    display_results(valid_symptoms, posterior_probs)
+    # Form gejala dan hasil diagnosis dalam fragment: interaksi tidak menjalankan ulang
+    # seluruh halaman (page config, CSS, pemuatan model)
+    diagnosis_section()
 
     # Footer
-    st.markdown("""
+    st.markdown(f"""
     <div class="footer">
-        <p>🌱 <strong>Sistem Diagnosis Hama & Penyakit Tembakau</strong></p>
+        <p>🌱 <strong>Sistem Diagnosis Hama & Penyakit {label_tanaman}</strong></p>
         <p>Built with Knowledge Graph and Bayesian Network</p>
     </div>
     """, unsafe_allow_html=True)
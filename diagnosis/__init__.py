@@ -0,0 +1,52 @@
+from diagnosis.cache import PosteriorCache, posterior_cache
+from diagnosis.core import DiagnosisModel, load_model, clear_cache
+from diagnosis.evidence import PRESENT, ABSENT, UNOBSERVED, build_evidence, observed_evidence
+from diagnosis.explain import explain_symptoms
+from diagnosis.factors import NoisyOrFactor, MAX_EXPANDED_PARENTS
+from diagnosis.junction_tree import JunctionTreeInference
+from diagnosis.noisy_or import NoisyOrModel, DEFAULT_LEAK, DEFAULT_PRIOR
+from diagnosis.priors import PENYAKIT_PRIORS
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.registry import ModelRegistry, default_registry
+from diagnosis.sampling import LikelihoodWeighting
+from diagnosis.subnetwork import Subnetwork
+from diagnosis.telemetry import Telemetry, telemetry, profile
+from diagnosis.topk import DEFAULT_TOP_K, posterior_bounds, top_k
+from diagnosis.vectorized import VectorizedInference
+from diagnosis.vocabulary import Vocabulary
+from diagnosis.voi import recommend_symptoms
+
+__all__ = [
+    'PosteriorCache',
+    'posterior_cache',
+    'DiagnosisModel',
+    'load_model',
+    'clear_cache',
+    'ModelRegistry',
+    'default_registry',
+    'NoisyOrFactor',
+    'MAX_EXPANDED_PARENTS',
+    'NoisyOrModel',
+    'DEFAULT_LEAK',
+    'DEFAULT_PRIOR',
+    'PENYAKIT_PRIORS',
+    'QuickscoreInference',
+    'VectorizedInference',
+    'Vocabulary',
+    'recommend_symptoms',
+    'explain_symptoms',
+    'JunctionTreeInference',
+    'LikelihoodWeighting',
+    'Subnetwork',
+    'Telemetry',
+    'telemetry',
+    'profile',
+    'DEFAULT_TOP_K',
+    'posterior_bounds',
+    'top_k',
+    'PRESENT',
+    'ABSENT',
+    'UNOBSERVED',
+    'build_evidence',
+    'observed_evidence',
+]
@@ -0,0 +1,158 @@
+"""
+Artefak model terkompilasi (.npz) agar startup tidak perlu parsing JSON
+dan membangun CPT.
+
+Artefak menyimpan indeks penyakit/gejala, matriks link, vektor prior dan
+leak, isi individuals_list.json, serta hash isi kedua file sumbernya.
+Artefak dianggap basi bila versi format, hash isi rule_list.json atau
+individuals_list.json, atau prior tidak cocok. Array yang dimuat divalidasi
+seperti model hasil kompilasi; artefak yang rusak juga dilewati.
+
+Contoh:
+    python -m diagnosis.artifact rule_list.json -o model_artifact.npz
+"""
+import argparse
+import json
+import logging
+import os
+import zipfile
+
+import numpy as np
+
+from diagnosis.noisy_or import NoisyOrModel
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 3
+DEFAULT_ARTIFACT_PATH = 'model_artifact.npz'
+
+
+def save_artifact(diagnosis_model, path=DEFAULT_ARTIFACT_PATH, individuals_path=None):
+    """
+    Simpan DiagnosisModel sebagai artefak .npz tanpa kompresi
+
+    Args:
+        diagnosis_model (DiagnosisModel): Model yang sudah dikompilasi
+        path (str): Path file artefak
+        individuals_path (str): Path individuals_list.json sumber model, default
+                                individuals_list.json di working directory
+    """
+    from diagnosis.core import DEFAULT_INDIVIDUALS_PATH, file_hash
+
+    noisy_or = diagnosis_model.noisy_or
+    rule_list = diagnosis_model.rule_list
+
+    np.savez(
+        path,
+        version=np.array(ARTIFACT_VERSION),
+        content_hash=np.array(diagnosis_model.content_hash),
+        individuals_hash=np.array(file_hash(individuals_path or DEFAULT_INDIVIDUALS_PATH)),
+        diseases=np.array(noisy_or.diseases, dtype=str),
+        symptoms=np.array(noisy_or.symptoms, dtype=str),
+        prior=noisy_or.prior,
+        link=noisy_or.link,
+        mask=noisy_or.mask,
+        leak=noisy_or.leak,
+        rule_id=np.array([item['rule'] for item in rule_list], dtype=str),
+        rule_symptom=np.array([noisy_or.symptom_index[item['gejala']] for item in rule_list]),
+        rule_disease=np.array([noisy_or.disease_index[item['nama']] for item in rule_list]),
+        rule_score=np.array([str(item['skor']) for item in rule_list], dtype=str),
+        # Prior/leak hasil diagnosis.learning (NaN jika rule tidak memilikinya)
+        rule_prior=np.array([float(item.get('prior', np.nan)) for item in rule_list]),
+        rule_leak=np.array([float(item.get('leak', np.nan)) for item in rule_list]),
+        individuals=np.array(json.dumps(diagnosis_model.individuals_list)),
+    )
+
+
+def load_artifact(path, content_hash, priors=None, individuals_hash=None):
+    """
+    Muat DiagnosisModel dari artefak jika masih sesuai dengan file rule
+
+    Args:
+        path (str): Path file artefak
+        content_hash (str): Hash isi rule_list.json saat ini
+        priors (dict): Prior yang diharapkan; artefak basi jika berbeda
+        individuals_hash (str): Hash isi individuals_list.json saat ini
+
+    Returns:
+        DiagnosisModel: Model dari artefak, atau None jika artefak basi atau rusak
+    """
+    try:
+        return _load_artifact(path, content_hash, priors, individuals_hash)
+    except (OSError, KeyError, IndexError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Artefak %s rusak, dilewati: %s", path, e)
+        return None
+
+
+def _load_artifact(path, content_hash, priors, individuals_hash):
+    from diagnosis.core import DiagnosisModel
+    from diagnosis.noisy_or import DEFAULT_PRIOR
+    from diagnosis.priors import PENYAKIT_PRIORS
+
+    with np.load(path, allow_pickle=False) as data:
+        if int(data['version']) != ARTIFACT_VERSION:
+            logger.warning("Artefak %s versi %s, diharapkan %s", path, data['version'], ARTIFACT_VERSION)
+            return None
+        if str(data['content_hash']) != content_hash:
+            logger.warning("Artefak %s basi: hash rule_list.json berubah", path)
+            return None
+        if str(data['individuals_hash']) != individuals_hash:
+            logger.warning("Artefak %s basi: hash individuals_list.json berubah", path)
+            return None
+
+        diseases = data['diseases'].tolist()
+        symptoms = data['symptoms'].tolist()
+        prior = data['prior']
+
+        rule_disease = data['rule_disease'].tolist()
+        rule_prior = data['rule_prior'].tolist()
+        rule_leak = data['rule_leak'].tolist()
+        learned_prior = {diseases[j]: p for j, p in zip(rule_disease, rule_prior) if not np.isnan(p)}
+
+        priors = PENYAKIT_PRIORS if priors is None else priors
+        expected_prior = np.array([learned_prior.get(d, priors.get(d, DEFAULT_PRIOR)) for d in diseases],
+                                  dtype=float)
+        if not np.array_equal(prior, expected_prior):
+            logger.warning("Artefak %s basi: prior penyakit berubah", path)
+            return None
+
+        link, mask, leak = data['link'], data['mask'], data['leak']
+        shape = (len(symptoms), len(diseases))
+        if prior.shape != shape[1:] or link.shape != shape or mask.shape != shape or \
+                leak.shape != shape[:1]:
+            raise ValueError("Ukuran array tidak cocok dengan jumlah penyakit/gejala")
+        noisy_or = NoisyOrModel(diseases, symptoms, prior, link, mask, leak)
+        noisy_or.validate()
+        rule_list = []
+        for rule, i, j, score, p, leak in zip(data['rule_id'].tolist(), data['rule_symptom'].tolist(),
+                                              rule_disease, data['rule_score'].tolist(),
+                                              rule_prior, rule_leak):
+            item = {'rule': rule, 'gejala': symptoms[i], 'nama': diseases[j], 'skor': score}
+            if not np.isnan(p):
+                item['prior'] = p
+            if not np.isnan(leak):
+                item['leak'] = leak
+            rule_list.append(item)
+        individuals_list = json.loads(str(data['individuals']))
+
+    return DiagnosisModel(noisy_or, content_hash, rule_list, individuals_list)
+
+
+def main(argv=None):
+    from diagnosis.core import DEFAULT_INDIVIDUALS_PATH, load_model
+
+    parser = argparse.ArgumentParser(description="Kompilasi rule_list.json menjadi artefak model")
+    parser.add_argument('rules', nargs='?', default='rule_list.json', help="Path rule_list.json")
+    parser.add_argument('--individuals', default=None, help="Path individuals_list.json")
+    parser.add_argument('-o', '--output', default=DEFAULT_ARTIFACT_PATH, help="Path artefak .npz")
+    args = parser.parse_args(argv)
+
+    individuals_path = args.individuals or os.path.join(os.path.dirname(args.rules),
+                                                        DEFAULT_INDIVIDUALS_PATH)
+    diagnosis_model = load_model(args.rules, individuals_path)
+    save_artifact(diagnosis_model, args.output, individuals_path)
+    print(f"Artefak ditulis ke {args.output} (hash {diagnosis_model.content_hash[:12]})")
+
+
+if __name__ == '__main__':
+    main()
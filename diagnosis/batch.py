@@ -0,0 +1,311 @@
+"""
+Diagnosis massal tanpa Streamlit untuk data observasi lapangan (CSV/JSONL).
+
+Format input:
+    CSV   : satu kolom per gejala berisi 1/0 (kosong = tidak diamati),
+            kolom 'id' opsional
+    JSONL : {"id": ..., "gejala": [gejala yang muncul],
+             "gejala_tidak_ada": [gejala yang dipastikan tidak ada],
+             "evidence": {gejala: 1/0/-1}}
+            (semua key opsional; -1 berarti tidak dicek, dan konflik antara
+            "evidence" dengan kedua list dilaporkan sebagai error)
+
+Record yang tidak dapat dibaca atau dihitung tidak menghentikan proses:
+hasilnya ditulis dengan kolom 'error' berisi pesan dan posterior kosong,
+serta dicatat sebagai warning.
+
+Contoh:
+    python -m diagnosis.batch observasi.csv -o hasil.csv --workers 4
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from diagnosis.core import DEFAULT_RULE_PATH, load_model
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED, build_evidence
+from diagnosis.subnetwork import PrunedInference
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CACHED_EVIDENCE = 100_000
+
+TRUE_VALUES = {'1', 'true', 'ya', 'y', 'yes'}
+FALSE_VALUES = {'0', 'false', 'tidak', 'n', 'no'}
+
+# Mesin inferensi dan vocabulary per proses worker (diisi oleh _init_worker)
+_worker_engine = None
+_worker_vocabulary = None
+
+
+def build_engine(rule_path=DEFAULT_RULE_PATH, priors=None):
+    """
+    Ambil mesin inferensi subnetwork dari model inti (cache per hash isi rule_list.json)
+
+    Args:
+        rule_path (str): Path ke rule_list.json
+        priors (dict): Prior per penyakit, default PENYAKIT_PRIORS
+
+    Returns:
+        PrunedInference: Mesin inferensi yang memangkas ke subnetwork evidence
+    """
+    return load_model(rule_path, priors=priors).pruned
+
+
+def _parse_state(value):
+    """Ubah nilai sel CSV menjadi 1/0/None"""
+    value = (value or '').strip().lower()
+    if not value:
+        return None
+    if value in TRUE_VALUES:
+        return 1
+    if value in FALSE_VALUES:
+        return 0
+    raise ValueError(f"Nilai evidence tidak dikenali: {value!r}")
+
+
+def _split_state_map(states):
+    """
+    Pisahkan map "evidence" record JSONL menjadi gejala ada dan tidak ada
+
+    Nilai -1 (UNOBSERVED) berarti tidak dicek dan diabaikan.
+
+    Raises:
+        ValueError: Jika map bukan objek atau ada nilai selain 1/0/-1
+    """
+    if not isinstance(states, dict):
+        raise ValueError("'evidence' harus berupa objek gejala -> 1/0")
+    present, absent = [], []
+    for symptom, state in states.items():
+        if isinstance(state, bool) or not isinstance(state, int) or \
+                state not in (PRESENT, ABSENT, UNOBSERVED):
+            raise ValueError(f"Nilai evidence tidak dikenali untuk {symptom}: {state!r}")
+        if state == PRESENT:
+            present.append(symptom)
+        elif state == ABSENT:
+            absent.append(symptom)
+    return present, absent
+
+
+def read_csv_records(path, label_field=None):
+    """
+    Baca record evidence dari CSV secara streaming
+
+    Args:
+        path (str): Path file CSV
+        label_field (str): Kolom yang bukan gejala (mis. 'penyakit' di diagnosis.learning);
+                           bila diisi, isi selnya ikut di-yield sebagai elemen keempat
+
+    Yields:
+        tuple: (record_id, evidence dict, None), atau (record_id, None, pesan error)
+               untuk baris yang tidak valid
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row_number, row in enumerate(csv.DictReader(f), start=1):
+            record_id = row.pop('id', None) or str(row_number)
+            label = row.pop(label_field, None) if label_field else None
+            evidence = {}
+            try:
+                for symptom, value in row.items():
+                    state = _parse_state(value)
+                    if state is not None:
+                        evidence[symptom] = state
+            except ValueError as e:
+                record = (record_id, None, f"{symptom}: {e}")
+            else:
+                record = (record_id, evidence, None)
+            yield record + (label,) if label_field else record
+
+
+def read_jsonl_records(path, label_field=None):
+    """
+    Baca record evidence dari JSONL secara streaming
+
+    Args:
+        path (str): Path file JSONL
+        label_field (str): Key yang bukan evidence (mis. 'penyakit' di diagnosis.learning);
+                           bila diisi, nilainya ikut di-yield sebagai elemen keempat
+
+    Yields:
+        tuple: (record_id, evidence dict, None), atau (record_id, None, pesan error)
+               untuk baris yang tidak valid
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record_id = str(line_number)
+            label = None
+            try:
+                item = json.loads(line)
+                if not isinstance(item, dict):
+                    raise ValueError("Record harus berupa objek JSON")
+                record_id = str(item.get('id', line_number))
+                label = item.get(label_field) if label_field else None
+                present, absent = _split_state_map(item.get('evidence', {}))
+                evidence = build_evidence(list(item.get('gejala', [])) + present,
+                                          list(item.get('gejala_tidak_ada', [])) + absent)
+            except (ValueError, TypeError, AttributeError) as e:
+                record = (record_id, None, str(e))
+            else:
+                record = (record_id, evidence, None)
+            yield record + (label,) if label_field else record
+
+
+def read_records(path, label_field=None):
+    """Pilih pembaca berdasarkan ekstensi file (.csv atau .jsonl), lihat read_csv_records"""
+    if path.endswith('.jsonl'):
+        return read_jsonl_records(path, label_field)
+    return read_csv_records(path, label_field)
+
+
+def canonical_evidence(vocabulary, evidence):
+    """Kunci kanonik evidence (bitset) untuk deduplikasi; gejala di luar model diabaikan"""
+    return vocabulary.encode({s: v for s, v in evidence.items() if s in vocabulary.symptom_index})
+
+
+def _posterior_or_error(engine, evidence):
+    """(posterior, None) untuk satu evidence, atau (None, pesan error) bila tidak dapat dihitung"""
+    try:
+        return engine.posterior_vector(evidence), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def _init_worker(model, max_terms):
+    global _worker_engine, _worker_vocabulary
+    _worker_vocabulary = model.vocabulary
+    _worker_engine = PrunedInference(model, _worker_vocabulary, max_terms)
+
+
+def _worker_posterior(bits):
+    return _posterior_or_error(_worker_engine, _worker_vocabulary.decode(bits))
+
+
+def chunks(iterable, size):
+    """Potong iterable menjadi list berisi paling banyak size item, secara streaming"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def diagnose_records(records, engine=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Diagnosis record evidence secara streaming
+
+    Evidence yang identik (bitset sama) hanya dihitung sekali. Gejala yang
+    tidak ada di model diabaikan, sama seperti validasi di app.py. Record
+    yang error (dari pembaca atau saat inferensi) diteruskan dengan pesannya
+    dan dicatat sebagai warning.
+
+    Args:
+        records (iterable): Tuple (record_id, evidence dict, pesan error atau None)
+        engine (PrunedInference): Mesin inferensi, default dari rule_list.json
+                                  (QuickscoreInference juga diterima)
+        workers (int): Jumlah proses worker (memakai PrunedInference); 1 berarti tanpa
+                       process pool
+        chunk_size (int): Jumlah record per potongan yang dikirim ke pool
+
+    Yields:
+        tuple: (record_id, dict penyakit -> posterior, None), atau
+               (record_id, None, pesan error)
+    """
+    engine = engine or build_engine()
+    diseases = engine.model.diseases
+    vocabulary = engine.model.vocabulary
+    workers = workers or os.cpu_count() or 1
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                       initargs=(engine.model, engine.max_terms))
+
+    cache = {}
+    try:
+        for chunk in chunks(records, chunk_size):
+            keys = [None if error else canonical_evidence(vocabulary, evidence)
+                    for _, evidence, error in chunk]
+            pending = [key for key in dict.fromkeys(keys) if key is not None and key not in cache]
+
+            if len(cache) + len(pending) > MAX_CACHED_EVIDENCE:
+                cache.clear()
+
+            if executor is not None:
+                per_worker = max(1, len(pending) // (workers * 4))
+                results = executor.map(_worker_posterior, pending, chunksize=per_worker)
+            else:
+                results = (_posterior_or_error(engine, vocabulary.decode(key)) for key in pending)
+            cache.update(zip(pending, results))
+
+            for (record_id, _, error), key in zip(chunk, keys):
+                posterior = None
+                if key is not None:
+                    posterior, error = cache[key]
+                if error:
+                    logger.warning("Record %s dilewati: %s", record_id, error)
+                    yield record_id, None, error
+                else:
+                    yield record_id, dict(zip(diseases, posterior.tolist())), None
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def write_results(results, path, diseases):
+    """
+    Tulis hasil diagnosis ke CSV atau JSONL (satu baris per record)
+
+    Record yang error ditulis dengan posterior kosong dan kolom/key 'error'.
+
+    Args:
+        results (iterable): Tuple (record_id, dict posterior atau None, pesan error atau None)
+        path (str): Path output; '-' untuk stdout (CSV)
+        diseases (list): Urutan kolom penyakit
+    """
+    f = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+    try:
+        if path.endswith('.jsonl'):
+            for record_id, posterior, error in results:
+                item = {'id': record_id, 'posterior': posterior}
+                if error:
+                    item['error'] = error
+                f.write(json.dumps(item) + '\n')
+        else:
+            writer = csv.writer(f)
+            writer.writerow(['id'] + list(diseases) + ['error'])
+            for record_id, posterior, error in results:
+                if error:
+                    writer.writerow([record_id] + [''] * len(diseases) + [error])
+                else:
+                    writer.writerow([record_id] + [f"{posterior[d]:.6f}" for d in diseases] + [''])
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diagnosis massal hama & penyakit tembakau")
+    parser.add_argument('input', help="File observasi (.csv atau .jsonl)")
+    parser.add_argument('-o', '--output', default='-', help="File hasil (.csv atau .jsonl)")
+    parser.add_argument('--rules', default=DEFAULT_RULE_PATH, help="Path rule_list.json")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses worker")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    engine = build_engine(args.rules)
+    results = diagnose_records(read_records(args.input), engine=engine,
+                               workers=args.workers, chunk_size=args.chunk_size)
+    write_results(results, args.output, engine.model.diseases)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Benchmark pembangunan model, diagnosis tunggal, dan diagnosis massal.
+
+Rule sintetis dibangkitkan dengan skema yang sama seperti rule_list.json,
+sehingga skala model dapat diatur tanpa ontologi sungguhan. Hasil ditulis
+sebagai JSON agar dapat dibandingkan antar versi.
+
+Contoh:
+    python -m diagnosis.benchmark --diseases 50 --symptoms 200 --max-parents 4 -o bench.json
+    python -m diagnosis.benchmark --rules rule_list.json --pgmpy
+"""
+import argparse
+import importlib
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from diagnosis.core import DiagnosisModel, build_bayesian_model
+from diagnosis.evidence import PRESENT, UNOBSERVED
+from diagnosis.junction_tree import HEURISTICS, JunctionTreeInference
+
+BENCHMARK_VERSION = 1
+
+
+def generate_rules(n_diseases, n_symptoms, max_parents, seed=0):
+    """
+    Bangkitkan rule sintetis dengan skema rule_list.json
+
+    Setiap gejala mendapat 1..max_parents parent acak, dan setiap penyakit
+    dijamin memiliki minimal satu gejala.
+
+    Args:
+        n_diseases (int): Jumlah penyakit/hama
+        n_symptoms (int): Jumlah gejala
+        max_parents (int): Jumlah parent maksimum per gejala
+        seed (int): Seed generator acak
+
+    Returns:
+        list: Rule dengan key 'rule', 'gejala', 'nama', 'skor'
+    """
+    rng = np.random.default_rng(seed)
+    diseases = [f"Penyakit_{j + 1:03d}" for j in range(n_diseases)]
+    symptoms = [f"Gejala_{i + 1:03d}" for i in range(n_symptoms)]
+
+    edges = set()
+    for i in range(n_symptoms):
+        n_parents = int(rng.integers(1, min(max_parents, n_diseases) + 1))
+        for j in rng.choice(n_diseases, size=n_parents, replace=False):
+            edges.add((i, int(j)))
+
+    covered = {j for _, j in edges}
+    for j in range(n_diseases):
+        if j not in covered:
+            edges.add((int(rng.integers(n_symptoms)), j))
+
+    rule_list = []
+    for n, (i, j) in enumerate(sorted(edges), start=1):
+        score = round(float(rng.uniform(0.1, 0.9)), 1)
+        rule_list.append({'rule': f"R{n:03d}", 'gejala': symptoms[i], 'nama': diseases[j],
+                          'skor': str(score)})
+    return rule_list
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _latency_stats(samples):
+    samples = np.asarray(samples) * 1000.0
+    return {
+        'n': int(len(samples)),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(samples.mean()),
+    }
+
+
+def random_evidence(n_symptoms, n_rows, n_present, seed=0):
+    """Matriks evidence dengan n_present gejala PRESENT per baris"""
+    rng = np.random.default_rng(seed)
+    evidence = np.full((n_rows, n_symptoms), UNOBSERVED, dtype=np.int8)
+    for row in evidence:
+        row[rng.choice(n_symptoms, size=min(n_present, n_symptoms), replace=False)] = PRESENT
+    return evidence
+
+
+def run_benchmark(rule_list, n_queries=200, n_present=3, batch_rows=10_000,
+                  with_pgmpy=False, seed=0):
+    """
+    Jalankan semua benchmark untuk satu rule set
+
+    Args:
+        rule_list (list): Rule dengan skema rule_list.json
+        n_queries (int): Jumlah diagnosis tunggal untuk statistik latensi
+        n_present (int): Jumlah gejala yang ditandai per diagnosis
+        batch_rows (int): Jumlah baris untuk throughput diagnosis massal
+        with_pgmpy (bool): Ikut ukur build dan loop query VariableElimination
+        seed (int): Seed evidence acak
+
+    Returns:
+        dict: Hasil benchmark
+    """
+    results = {}
+
+    tracemalloc.start()
+    diagnosis_model, build_seconds = _timed(DiagnosisModel.from_rules, rule_list, [], 'benchmark')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    noisy_or = diagnosis_model.noisy_or
+    results['model'] = {
+        'diseases': noisy_or.n_diseases,
+        'symptoms': noisy_or.n_symptoms,
+        'rules': len(rule_list),
+        'max_parents': max(row['parents'] for row in noisy_or.size_report()),
+    }
+    results['build'] = {'seconds': build_seconds, 'peak_memory_bytes': peak}
+
+    evidence_matrix = random_evidence(noisy_or.n_symptoms, n_queries, n_present, seed)
+    queries = [
+        {noisy_or.symptoms[i]: 1 for i in np.flatnonzero(row == PRESENT)}
+        for row in evidence_matrix
+    ]
+
+    latencies = [_timed(diagnosis_model.engine.posterior_vector, evidence)[1] for evidence in queries]
+    results['single_query'] = _latency_stats(latencies)
+
+    batch = random_evidence(noisy_or.n_symptoms, batch_rows, n_present, seed + 1)
+    _, batch_seconds = _timed(diagnosis_model.vectorized.posterior_matrix, batch)
+    results['batch'] = {
+        'rows': batch_rows,
+        'seconds': batch_seconds,
+        'rows_per_second': batch_rows / batch_seconds if batch_seconds > 0 else None,
+    }
+
+    # Junction tree: treewidth menunjukkan kapan inferensi eksak menjadi mahal
+    for heuristic in HEURISTICS:
+        try:
+            tree, compile_seconds = _timed(JunctionTreeInference, noisy_or, heuristic)
+        except ValueError as e:
+            results[f'junction_tree_{heuristic}'] = {'error': str(e)}
+            continue
+        jt_latencies = [_timed(tree.posterior_vector, evidence)[1]
+                        for evidence in queries[:max(1, n_queries // 10)]]
+        results[f'junction_tree_{heuristic}'] = {
+            'compile_seconds': compile_seconds,
+            'treewidth': tree.treewidth,
+            'cliques': len(tree.cliques),
+            'max_table_size': max(tree.table_sizes()),
+            'single_query': _latency_stats(jt_latencies),
+        }
+
+    if with_pgmpy:
+        # Import pgmpy (dan torch) di luar pengukuran
+        importlib.import_module('pgmpy.inference')
+
+        tracemalloc.start()
+        (model, infer), pgmpy_seconds = _timed(build_bayesian_model, noisy_or)
+        _, pgmpy_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results['pgmpy_build'] = {'seconds': pgmpy_seconds, 'peak_memory_bytes': pgmpy_peak}
+
+        def per_disease_loop(evidence):
+            return [infer.query(variables=[hp], evidence=evidence, show_progress=False).values[1]
+                    for hp in noisy_or.diseases]
+
+        pgmpy_latencies = [_timed(per_disease_loop, evidence)[1]
+                           for evidence in queries[:max(1, n_queries // 10)]]
+        results['pgmpy_single_query'] = _latency_stats(pgmpy_latencies)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model diagnosis")
+    parser.add_argument('--rules', default=None, help="rule_list.json; default rule sintetis")
+    parser.add_argument('--diseases', type=int, default=12)
+    parser.add_argument('--symptoms', type=int, default=26)
+    parser.add_argument('--max-parents', type=int, default=5)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--present', type=int, default=3, help="Gejala ditandai per diagnosis")
+    parser.add_argument('--batch-rows', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pgmpy', action='store_true', help="Ikut ukur pgmpy VariableElimination")
+    parser.add_argument('-o', '--output', default='-', help="File hasil JSON")
+    args = parser.parse_args(argv)
+
+    if args.rules:
+        with open(args.rules, 'r', encoding='utf-8') as f:
+            rule_list = json.load(f)
+        config = {'rules': args.rules}
+    else:
+        rule_list = generate_rules(args.diseases, args.symptoms, args.max_parents, args.seed)
+        config = {'diseases': args.diseases, 'symptoms': args.symptoms,
+                  'max_parents': args.max_parents}
+    config.update({'queries': args.queries, 'present': args.present,
+                   'batch_rows': args.batch_rows, 'seed': args.seed})
+
+    report = {
+        'benchmark_version': BENCHMARK_VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'config': config,
+        'results': run_benchmark(rule_list, args.queries, args.present, args.batch_rows,
+                                 args.pgmpy, args.seed),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Cache posterior dalam proses, dipakai bersama oleh semua sesi Streamlit.
+
+Kunci cache adalah evidence kanonik (bitset dari Vocabulary, atau frozenset
+bila tidak diberikan) ditambah kunci model (hash isi rule_list.json dan
+prior), sehingga perubahan file rule tidak pernah memakai hasil lama.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+def canonical_key(evidence):
+    """Kunci kanonik evidence yang tidak bergantung pada urutan"""
+    return frozenset(evidence.items())
+
+
+def _sizeof(value):
+    """Perkiraan memori nilai cache (dict/list/tuple/array bersarang) dalam byte"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    # Kunci string (nama penyakit/gejala) dipakai bersama dengan model, tidak dihitung
+    return getattr(value, 'nbytes', None) or sys.getsizeof(value)
+
+
+class PosteriorCache:
+    """
+    Cache posterior LRU dengan batas jumlah entri
+
+    Args:
+        maxsize (int): Jumlah entri maksimum sebelum entri terlama dibuang
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, model_key, evidence, compute, evidence_key=None):
+        """
+        Ambil posterior dari cache, atau hitung dan simpan jika belum ada
+
+        Args:
+            model_key (tuple): Kunci model (lihat DiagnosisModel.cache_key)
+            evidence (dict): Mapping gejala -> 1/0
+            compute (callable): Fungsi evidence -> posterior, dipanggil saat miss
+            evidence_key (hashable): Kunci evidence kanonik, mis. Vocabulary.encode(evidence);
+                                     default canonical_key(evidence)
+
+        Returns:
+            Posterior hasil compute (dibagikan antar pemanggil, jangan diubah)
+        """
+        if evidence_key is None:
+            evidence_key = canonical_key(evidence)
+        key = (model_key, evidence_key)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Hitung di luar lock agar query lain tidak menunggu
+        value = compute(evidence)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, content_hash=None):
+        """
+        Buang entri milik satu versi file rule, atau semua entri
+
+        Args:
+            content_hash (str): Hash isi rule_list.json; None untuk mengosongkan cache
+        """
+        with self._lock:
+            if content_hash is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0][0] == content_hash]:
+                del self._entries[key]
+
+    def nbytes(self, content_hash=None):
+        """
+        Perkiraan memori nilai yang di-cache (byte)
+
+        Args:
+            content_hash (str): Hanya entri milik versi file rule ini; None untuk semua entri
+
+        Returns:
+            int: Jumlah byte perkiraan
+        """
+        with self._lock:
+            return sum(_sizeof(value) for key, value in self._entries.items()
+                       if content_hash is None or key[0][0] == content_hash)
+
+    def stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: 'hits', 'misses', 'hit_ratio', 'size', 'maxsize'
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+# Cache bersama untuk seluruh proses
+posterior_cache = PosteriorCache()
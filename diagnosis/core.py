@@ -0,0 +1,715 @@
+"""
+Inti model diagnosis tanpa ketergantungan Streamlit.
+
+Memuat rule_list.json dan individuals_list.json, membangun model noisy-OR,
+mesin inferensi, dan (secara lazy) Bayesian Network pgmpy. Hasilnya disimpan
+di cache dalam proses dengan kunci hash isi file rule.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from functools import cached_property
+
+from diagnosis.cache import posterior_cache
+from diagnosis.evidence import observed_evidence
+from diagnosis.explain import DEFAULT_EXPLAINED_DISEASES, explain_symptoms
+from diagnosis.junction_tree import DEFAULT_HEURISTIC, JunctionTreeInference
+from diagnosis.noisy_or import NoisyOrModel
+from diagnosis.priors import PENYAKIT_PRIORS
+from diagnosis.quickscore import DEFAULT_MAX_TERMS, QuickscoreInference
+from diagnosis.sampling import DEFAULT_SAMPLES, LikelihoodWeighting
+from diagnosis.search import SymptomSearchIndex
+from diagnosis.telemetry import telemetry
+from diagnosis.subnetwork import PrunedInference
+from diagnosis.topk import DEFAULT_TOP_K, top_k
+from diagnosis.vectorized import VectorizedInference
+from diagnosis.voi import DEFAULT_TOP_DISEASES, recommend_symptoms
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULE_PATH = 'rule_list.json'
+DEFAULT_INDIVIDUALS_PATH = 'individuals_list.json'
+
+# Di atas proporsi rule berubah ini, model dibangun ulang penuh
+MAX_INCREMENTAL_FRACTION = 0.25
+
+# Backend inferensi eksak untuk DiagnosisModel.posteriors
+BACKENDS = ('quickscore', 'junction_tree', 'likelihood_weighting')
+DEFAULT_BACKEND = 'quickscore'
+
+# Di atas biaya ini (suku Quickscore x penyakit) pakai inferensi perkiraan; evidence yang
+# melampaui batas suku mesin Quickscore (DEFAULT_MAX_TERMS) juga selalu diperkirakan
+MAX_EXACT_COST = 4 * DEFAULT_MAX_TERMS
+
+_model_cache = {}
+_cache_lock = threading.Lock()
+# Kunci per model yang sedang dikompilasi (kunci cache -> threading.Lock)
+_loading = {}
+
+# Hash isi file rule per path, berlaku selama (inode, mtime, ukuran) file tidak berubah
+_hash_cache = {}
+
+
+def file_hash(path):
+    """
+    Hash SHA-256 dari isi file
+
+    Args:
+        path (str): Path file
+
+    Returns:
+        str: Hexdigest hash isi file
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_file_hash(path):
+    """
+    file_hash yang hanya dihitung ulang bila stat file (inode, mtime, ukuran) berubah
+
+    Args:
+        path (str): Path file
+
+    Returns:
+        str: Hexdigest hash isi file
+    """
+    stat = os.stat(path)
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    path = os.path.abspath(path)
+    cached = _hash_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    content_hash = file_hash(path)
+    _hash_cache[path] = (signature, content_hash)
+    return content_hash
+
+
+def load_json_data(rule_path=DEFAULT_RULE_PATH, individuals_path=DEFAULT_INDIVIDUALS_PATH):
+    """
+    Load rule_list dan individuals_list dari file JSON
+
+    Raises:
+        FileNotFoundError: Jika file tidak ditemukan
+        json.JSONDecodeError: Jika isi file bukan JSON valid
+
+    Returns:
+        tuple: (rule_list, individuals_list)
+    """
+    with telemetry.stage('load_json'):
+        with open(rule_path, 'r', encoding='utf-8') as f:
+            rule_list = json.load(f)
+
+        with open(individuals_path, 'r', encoding='utf-8') as f:
+            individuals_list = json.load(f)
+
+    return rule_list, individuals_list
+
+
+def get_gejala_from_rules(rule_list):
+    """Ekstrak dan urutkan gejala dari rule_list"""
+    return sorted(set(item['gejala'] for item in rule_list))
+
+
+def build_bayesian_model(noisy_or_model):
+    """
+    Bangun Bayesian Network pgmpy dari model noisy-OR
+
+    Args:
+        noisy_or_model (NoisyOrModel): Parameter jaringan
+
+    Raises:
+        ValueError: Jika ekspansi CPT ditolak atau model tidak valid
+
+    Returns:
+        tuple: (DiscreteBayesianNetwork, VariableElimination)
+    """
+    from pgmpy.models import DiscreteBayesianNetwork
+    from pgmpy.factors.discrete import TabularCPD
+    from pgmpy.inference import VariableElimination
+
+    edges = [(parent, factor.variable)
+             for factor in noisy_or_model.factors for parent in factor.parents]
+    model = DiscreteBayesianNetwork(edges)
+    # Penyakit tanpa gejala (variabel query di subnetwork) tetap menjadi node
+    model.add_nodes_from(noisy_or_model.diseases)
+
+    # Masukkan CPT untuk node penyakit/hama (prior)
+    for p, prior_prob in zip(noisy_or_model.diseases, noisy_or_model.prior):
+        model.add_cpds(TabularCPD(variable=p, variable_card=2,
+                                  values=[[1 - prior_prob], [prior_prob]]))
+
+    # Masukkan CPT untuk gejala (ekspansi ditolak di atas MAX_EXPANDED_PARENTS)
+    for factor in noisy_or_model.factors:
+        model.add_cpds(factor.to_tabular_cpd())
+
+    model.check_model()
+    return model, VariableElimination(model)
+
+
+def diff_rules(old_rules, new_rules):
+    """
+    Cari pasangan (gejala, penyakit) yang terdampak perubahan rule
+
+    Rule dicocokkan berdasarkan id 'rule'; rule yang ditambah, dihapus, atau
+    diubah (gejala/nama/skor) menandai pasangan lama dan barunya.
+
+    Args:
+        old_rules (list): Isi rule_list.json lama
+        new_rules (list): Isi rule_list.json baru
+
+    Returns:
+        set: Pasangan (gejala, penyakit), atau None jika id rule tidak unik
+    """
+    old_by_id = {item['rule']: item for item in old_rules}
+    new_by_id = {item['rule']: item for item in new_rules}
+    if len(old_by_id) != len(old_rules) or len(new_by_id) != len(new_rules):
+        return None
+
+    affected = set()
+    for rule_id in old_by_id.keys() | new_by_id.keys():
+        old_item = old_by_id.get(rule_id)
+        new_item = new_by_id.get(rule_id)
+        if old_item == new_item:
+            continue
+        for item in (old_item, new_item):
+            if item is not None:
+                affected.add((item['gejala'], item['nama']))
+    return affected
+
+
+class DiagnosisModel:
+    """
+    Model diagnosis yang sudah dikompilasi dari satu file rule
+
+    Attributes:
+        content_hash (str): Hash isi rule_list.json
+        rule_list (list): Isi rule_list.json
+        individuals_list (list): Isi individuals_list.json
+        penyakit_priors (dict): Prior per penyakit/hama
+        noisy_or (NoisyOrModel): Parameter jaringan noisy-OR
+        engine (QuickscoreInference): Mesin inferensi atas jaringan lengkap
+        pruned (PrunedInference): Inferensi lewat subnetwork evidence (jalur utama)
+        vectorized (VectorizedInference): Inferensi untuk matriks evidence
+        vocabulary (Vocabulary): Indeks gejala/penyakit dan evidence bitset
+        search_index (SymptomSearchIndex): Pencarian nama gejala untuk UI
+        gejala_list (list): Vocabulary gejala (urut alfabetis)
+        hama_penyakit_list (list): Vocabulary penyakit/hama
+    """
+
+    def __init__(self, noisy_or, content_hash, rule_list, individuals_list):
+        self.content_hash = content_hash
+        self.rule_list = rule_list
+        self.individuals_list = individuals_list
+        self.penyakit_priors = dict(zip(noisy_or.diseases, noisy_or.prior.tolist()))
+
+        self.noisy_or = noisy_or
+        self.engine = QuickscoreInference(self.noisy_or)
+        self.vocabulary = self.noisy_or.vocabulary
+
+        self.gejala_list = list(self.noisy_or.symptoms)
+        self.hama_penyakit_list = list(self.noisy_or.diseases)
+
+        # Laporan ukuran tabel per node saat build
+        size_report = self.noisy_or.size_report()
+        for row in size_report:
+            logger.info("CPT %s: %d parent, faktor %d angka, tabel penuh %d entri",
+                        row['symptom'], row['parents'], row['compact_size'], row['table_size'])
+        telemetry.gauge('model_diseases', self.noisy_or.n_diseases)
+        telemetry.gauge('model_symptoms', self.noisy_or.n_symptoms)
+        telemetry.gauge('model_factor_parameters', sum(row['compact_size'] for row in size_report))
+        telemetry.gauge('model_factor_table_entries', sum(row['table_size'] for row in size_report))
+
+        # Subnetwork terkompilasi per bitset gejala teramati (LRU per model)
+        self.pruned = PrunedInference(self.noisy_or, self.vocabulary)
+
+        self._junction_trees = {}
+        self._bayesian_model = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rules(cls, rule_list, individuals_list, content_hash, priors=None):
+        """
+        Kompilasi model dari isi rule_list.json
+
+        Args:
+            rule_list (list): Isi rule_list.json
+            individuals_list (list): Isi individuals_list.json
+            content_hash (str): Hash isi rule_list.json
+            priors (dict): Prior per penyakit, default PENYAKIT_PRIORS
+
+        Returns:
+            DiagnosisModel: Model yang sudah dikompilasi
+        """
+        priors = PENYAKIT_PRIORS if priors is None else priors
+        with telemetry.stage('build_model'):
+            noisy_or = NoisyOrModel.from_rules(rule_list, priors)
+            noisy_or.validate()
+            return cls(noisy_or, content_hash, rule_list, individuals_list)
+
+    def with_rules(self, rule_list, individuals_list, content_hash, priors=None):
+        """
+        Model baru untuk rule_list yang sudah diedit, dibangun secara inkremental
+
+        Hanya faktor gejala yang rulenya berubah yang dihitung ulang. Model
+        ini sendiri tidak diubah, sehingga diagnosis yang sedang berjalan
+        selesai dengan versi lama.
+
+        Args:
+            rule_list (list): Isi rule_list.json baru
+            individuals_list (list): Isi individuals_list.json
+            content_hash (str): Hash isi rule_list.json baru
+            priors (dict): Prior untuk penyakit baru, default PENYAKIT_PRIORS
+
+        Returns:
+            DiagnosisModel: Model baru, atau None jika perubahan terlalu besar
+        """
+        # Prior/leak hasil pembelajaran di dalam rule: bangun ulang penuh
+        if any('prior' in item or 'leak' in item for item in self.rule_list + rule_list):
+            return None
+
+        affected = diff_rules(self.rule_list, rule_list)
+        if affected is None or len(affected) > MAX_INCREMENTAL_FRACTION * max(len(rule_list), 1):
+            return None
+
+        scores = {(item['gejala'], item['nama']): item['skor'] for item in rule_list}
+        changes = [(symptom, disease, scores.get((symptom, disease)))
+                   for symptom, disease in sorted(affected)]
+
+        # Urutan penyakit sama dengan bangun ulang penuh untuk hash yang sama
+        disease_order = list(dict.fromkeys(item['nama'] for item in rule_list))
+        priors = PENYAKIT_PRIORS if priors is None else priors
+        noisy_or = self.noisy_or.with_edges(changes, priors, disease_order=disease_order)
+        noisy_or.validate()
+        logger.info("Model diperbarui inkremental: %d edge berubah", len(changes))
+        return DiagnosisModel(noisy_or, content_hash, rule_list, individuals_list)
+
+    @property
+    def nbytes(self):
+        """
+        Perkiraan memori model beserta mesin inferensi dan cache yang sedang terisi (byte)
+
+        Termasuk subnetwork di LRU PrunedInference, CPT pgmpy bila jaringannya sudah
+        dibangun, dan entri posterior_cache milik hash isi rule model ini.
+        """
+        noisy_or = self.noisy_or
+        total = noisy_or.nbytes
+        if 'vectorized' in self.__dict__:
+            # Bobot log dan indikator nol untuk empat matriks (S, D)
+            total += 8 * noisy_or.link.nbytes
+        for tree in self._junction_trees.values():
+            total += sum(8 * size for size in tree.table_sizes())
+        total += self.pruned.nbytes
+        if self._bayesian_model is not None:
+            total += sum(cpd.values.nbytes for cpd in self._bayesian_model[0].get_cpds())
+        total += posterior_cache.nbytes(self.content_hash)
+        return total
+
+    @cached_property
+    def search_index(self):
+        """Indeks pencarian prefix/substring nama gejala untuk UI"""
+        return SymptomSearchIndex(self.gejala_list)
+
+    @cached_property
+    def vectorized(self):
+        """VectorizedInference, dibangun saat pertama dipakai"""
+        return VectorizedInference(self.noisy_or)
+
+    @property
+    def cache_key(self):
+        """Kunci model untuk cache posterior: hash isi file rule dan prior"""
+        return (self.content_hash, tuple(self.noisy_or.prior.tolist()))
+
+    def subnetwork(self, evidence):
+        """
+        Subnetwork relevan evidence (gejala teramati dan parent-nya), di-cache per bitset
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+
+        Raises:
+            ValueError: Jika evidence memuat gejala yang tidak ada di model
+
+        Returns:
+            Subnetwork: Jaringan terpangkas beserta mesin inferensinya
+        """
+        evidence = observed_evidence(evidence)
+        return self.pruned.subnetwork(evidence)
+
+    def _sampled_posterior(self, evidence):
+        return self._approximate(evidence, DEFAULT_SAMPLES, None, 0)[0]
+
+    def junction_tree(self, heuristic=DEFAULT_HEURISTIC):
+        """
+        Junction tree terkompilasi, dibangun sekali per heuristik
+
+        Args:
+            heuristic (str): Heuristik urutan eliminasi, 'min-fill' atau 'min-weight'
+
+        Raises:
+            ValueError: Jika heuristik tidak dikenal atau klik terlalu besar
+
+        Returns:
+            JunctionTreeInference: Junction tree siap dikalibrasi
+        """
+        with self._lock:
+            tree = self._junction_trees.get(heuristic)
+            if tree is None:
+                with telemetry.stage('compile_junction_tree'):
+                    tree = JunctionTreeInference(self.noisy_or, heuristic)
+                telemetry.gauge('junction_tree_treewidth', tree.treewidth)
+                logger.info("Junction tree (%s): treewidth %d, %d klik, tabel terbesar %d entri",
+                            heuristic, tree.treewidth, len(tree.cliques), max(tree.table_sizes()))
+                self._junction_trees[heuristic] = tree
+            return tree
+
+    def posteriors(self, evidence, cache=None, backend=DEFAULT_BACKEND):
+        """
+        Posterior semua penyakit/hama, memakai cache posterior bersama
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada) / -1 (tidak dicek)
+            cache (PosteriorCache): Cache yang dipakai, default posterior_cache
+            backend (str): 'quickscore' (subnetwork terpangkas), 'junction_tree', atau
+                           'likelihood_weighting' (perkiraan, DEFAULT_SAMPLES sampel)
+
+        Raises:
+            ValueError: Jika backend atau keadaan gejala tidak dikenal, atau posterior
+                        tidak dapat dihitung (tidak disimpan di cache)
+
+        Returns:
+            dict: Mapping nama penyakit -> P(penyakit=1 | evidence)
+        """
+        # Gejala tidak dicek dibuang sebelum kunci cache dan mesin inferensi, sehingga
+        # evidence yang setara selalu berbagi satu hasil
+        evidence = observed_evidence(evidence)
+        if backend == 'quickscore':
+            model_key = self.cache_key
+            compute = self.pruned.posterior_vector
+        elif backend == 'junction_tree':
+            model_key = self.cache_key + (('backend', backend),)
+            compute = self.junction_tree().posterior_vector
+        elif backend == 'likelihood_weighting':
+            # Seed tetap agar hasil deterministik dan aman di-cache
+            model_key = self.cache_key + (('backend', backend),)
+            compute = self._sampled_posterior
+        else:
+            raise ValueError(f"Backend tidak dikenal: {backend} (pilih {', '.join(BACKENDS)})")
+
+        cache = posterior_cache if cache is None else cache
+        telemetry.count('queries')
+        with telemetry.stage(f'posteriors.{backend}'):
+            posterior = cache.get_or_compute(model_key, evidence, compute,
+                                             self.vocabulary.encode(evidence))
+        return dict(zip(self.hama_penyakit_list, posterior.tolist()))
+
+    def exact_cost(self, evidence):
+        """
+        Perkiraan biaya inferensi eksak: jumlah suku Quickscore x penyakit di subnetwork
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+
+        Returns:
+            int: Perkiraan jumlah operasi
+        """
+        evidence = observed_evidence(evidence)
+        subnetwork = self.subnetwork(evidence)
+        return subnetwork.engine.term_count(evidence) * max(subnetwork.model.n_diseases, 1)
+
+    def exact_feasible(self, evidence, max_cost=MAX_EXACT_COST):
+        """
+        Apakah evidence dapat dihitung eksak: suku Quickscore dalam batas mesin dan biaya kecil
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            max_cost (int): Batas exact_cost
+
+        Raises:
+            ValueError: Jika evidence memuat gejala yang tidak ada di model
+
+        Returns:
+            bool: False jika sebaiknya memakai approximate()
+        """
+        evidence = observed_evidence(evidence)
+        subnetwork = self.subnetwork(evidence)
+        n_terms = subnetwork.engine.term_count(evidence)
+        return (n_terms <= subnetwork.engine.max_terms
+                and n_terms * max(subnetwork.model.n_diseases, 1) <= max_cost)
+
+    def _approximate(self, evidence, n_samples, time_budget, seed):
+        subnetwork = self.subnetwork(evidence)
+        posterior = self.noisy_or.prior.copy()
+        lower = posterior.copy()
+        upper = posterior.copy()
+        samples, ess = 0, float('inf')
+
+        index = subnetwork.disease_index
+        if len(index):
+            result = LikelihoodWeighting(subnetwork.model, seed).estimate(
+                evidence, n_samples, time_budget)
+            posterior[index] = result['posterior']
+            lower[index] = result['lower']
+            upper[index] = result['upper']
+            samples, ess = result['samples'], result['ess']
+        return posterior, lower, upper, samples, ess
+
+    def approximate(self, evidence, n_samples=DEFAULT_SAMPLES, time_budget=None, seed=None):
+        """
+        Posterior perkiraan (likelihood weighting) dengan interval kepercayaan 95%
+
+        Penyakit di luar subnetwork evidence memakai prior (eksak).
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            n_samples (int): Anggaran jumlah sampel (None jika hanya time_budget)
+            time_budget (float): Anggaran waktu dalam detik (opsional)
+            seed (int): Seed generator acak (opsional)
+
+        Raises:
+            ValueError: Jika gejala tidak ada di model atau semua sampel berbobot nol
+
+        Returns:
+            dict: 'posterior' (nama -> probabilitas), 'interval' (nama -> (lower, upper)),
+                  'samples' dan 'ess'
+        """
+        evidence = observed_evidence(evidence)
+        telemetry.count('queries')
+        with telemetry.stage('approximate'):
+            posterior, lower, upper, samples, ess = self._approximate(
+                evidence, n_samples, time_budget, seed)
+        return {
+            'posterior': dict(zip(self.hama_penyakit_list, posterior.tolist())),
+            'interval': {d: (float(lo), float(hi))
+                         for d, lo, hi in zip(self.hama_penyakit_list, lower, upper)},
+            'samples': samples,
+            'ess': ess,
+        }
+
+    def top_k(self, evidence, k=DEFAULT_TOP_K, cache=None):
+        """
+        k penyakit/hama teratas; penyakit yang batasnya tidak mungkin masuk dilewati
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            k (int): Jumlah penyakit teratas
+            cache (PosteriorCache): Cache yang dipakai, default posterior_cache
+
+        Raises:
+            ValueError: Jika posterior tidak dapat dihitung (tidak disimpan di cache)
+
+        Returns:
+            dict: Hasil diagnosis.topk.top_k ('ranking', 'bounds', 'gap', 'computed')
+        """
+        evidence = observed_evidence(evidence)
+        cache = posterior_cache if cache is None else cache
+        telemetry.count('queries')
+        with telemetry.stage('top_k'):
+            return cache.get_or_compute(self.cache_key + (('top_k', k),), evidence,
+                                        lambda e: top_k(self.pruned, e, k),
+                                        self.vocabulary.encode(evidence))
+
+    def recommend(self, evidence, top_diseases=DEFAULT_TOP_DISEASES, limit=None, cache=None):
+        """
+        Gejala belum dicek, diurutkan dari expected information gain terbesar
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            top_diseases (int): Jumlah penyakit teratas yang menjadi target
+            limit (int): Jumlah rekomendasi maksimum (None untuk semua)
+            cache (PosteriorCache): Cache yang dipakai, default posterior_cache
+
+        Raises:
+            ValueError: Jika rekomendasi tidak dapat dihitung
+
+        Returns:
+            list: Dict 'gejala', 'gain', 'p_ada' (lihat diagnosis.voi.recommend_symptoms)
+        """
+        evidence = observed_evidence(evidence)
+        cache = posterior_cache if cache is None else cache
+        telemetry.count('queries')
+        with telemetry.stage('recommend'):
+            return cache.get_or_compute(
+                self.cache_key + (('recommend', top_diseases, limit),), evidence,
+                lambda e: recommend_symptoms(self.vectorized, e, top_diseases, limit),
+                self.vocabulary.encode(evidence))
+
+    def explain(self, evidence, top_diseases=DEFAULT_EXPLAINED_DISEASES, cache=None):
+        """
+        Kontribusi tiap gejala teramati terhadap posterior penyakit teratas
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            top_diseases (int): Jumlah penyakit teratas yang dijelaskan
+            cache (PosteriorCache): Cache yang dipakai, default posterior_cache
+
+        Raises:
+            ValueError: Jika penjelasan tidak dapat dihitung
+
+        Returns:
+            list: Dict 'penyakit', 'posterior', 'kontribusi'
+                  (lihat diagnosis.explain.explain_symptoms)
+        """
+        evidence = observed_evidence(evidence)
+        cache = posterior_cache if cache is None else cache
+        telemetry.count('queries')
+        with telemetry.stage('explain'):
+            return cache.get_or_compute(
+                self.cache_key + (('explain', top_diseases),), evidence,
+                lambda e: explain_symptoms(self.vectorized, e, top_diseases),
+                self.vocabulary.encode(evidence))
+
+    def sensitivity(self, evidence, disease=None, limit=10):
+        """
+        Skor rule, prior, dan leak yang paling menentukan posterior satu diagnosis
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            disease (str): Penyakit target, default diagnosis teratas
+            limit (int): Jumlah parameter (None untuk semua)
+
+        Raises:
+            ValueError: Jika gejala tidak ada di model
+
+        Returns:
+            list: Dict 'parameter', 'gejala', 'penyakit', 'turunan'
+                  (lihat diagnosis.sensitivity.SensitivityAnalysis.ranked)
+        """
+        from diagnosis.sensitivity import SensitivityAnalysis
+
+        evidence = observed_evidence(evidence)
+        analysis = SensitivityAnalysis(self.noisy_or)
+        with telemetry.stage('sensitivity'):
+            result = analysis.derivatives(self.vocabulary.state_matrix([evidence]))
+        return analysis.ranked(result, 0, disease, limit)
+
+    @property
+    def bayesian_model(self):
+        """(DiscreteBayesianNetwork, VariableElimination), dibangun saat pertama diakses"""
+        with self._lock:
+            if self._bayesian_model is None:
+                with telemetry.stage('build_bayesian_model'):
+                    self._bayesian_model = build_bayesian_model(self.noisy_or)
+            return self._bayesian_model
+
+    @property
+    def model(self):
+        return self.bayesian_model[0]
+
+    @property
+    def infer(self):
+        return self.bayesian_model[1]
+
+
+def load_model(rule_path=DEFAULT_RULE_PATH, individuals_path=None, priors=None,
+               artifact_path=None):
+    """
+    Muat model diagnosis, memakai cache dalam proses berdasarkan hash isi file rule
+
+    Jika artifact_path diberikan dan artefaknya masih sesuai hash isi file
+    rule, model dimuat dari artefak tanpa parsing JSON. Selain itu model
+    dikompilasi dari rule_list.json. Hash isi file hanya dihitung ulang bila
+    stat file berubah, sehingga pemanggilan per request cukup murah.
+    Kompilasi berjalan di luar kunci cache global: lookup model lain tidak
+    menunggu, sedangkan pemanggil untuk model yang sama memakai satu hasil.
+
+    Args:
+        rule_path (str): Path rule_list.json
+        individuals_path (str): Path individuals_list.json, default di folder yang sama
+        priors (dict): Prior per penyakit, default PENYAKIT_PRIORS
+        artifact_path (str): Path artefak .npz hasil diagnosis.artifact (opsional)
+
+    Returns:
+        DiagnosisModel: Model yang sudah dikompilasi
+    """
+    if individuals_path is None:
+        individuals_path = os.path.join(os.path.dirname(rule_path), DEFAULT_INDIVIDUALS_PATH)
+
+    content_hash = cached_file_hash(rule_path)
+    priors_key = None if priors is None else tuple(sorted(priors.items()))
+    key = (os.path.abspath(rule_path), content_hash, priors_key)
+
+    with _cache_lock:
+        cached = _model_cache.get(key)
+        if cached is not None:
+            telemetry.count('model_cache_hits')
+            return cached
+        key_lock = _loading.setdefault(key, threading.Lock())
+
+    # Kompilasi di luar _cache_lock: lookup model lain tidak ikut menunggu; thread yang
+    # meminta kunci yang sama menunggu di key_lock lalu memakai hasilnya
+    with key_lock:
+        with _cache_lock:
+            cached = _model_cache.get(key)
+            if cached is not None:
+                telemetry.count('model_cache_hits')
+                return cached
+            telemetry.count('model_cache_misses')
+            previous = next((model for k, model in _model_cache.items()
+                             if k[0] == key[0] and k[1] != content_hash and k[2] == priors_key),
+                            None)
+
+        try:
+            diagnosis_model = _compile_model(rule_path, individuals_path, priors, artifact_path,
+                                             content_hash, previous)
+        except BaseException:
+            with _cache_lock:
+                _loading.pop(key, None)
+            raise
+
+        with _cache_lock:
+            _loading.pop(key, None)
+            # File diedit lagi selama kompilasi: versi ini sudah usang, jangan dipasang
+            if cached_file_hash(rule_path) != content_hash:
+                return diagnosis_model
+            # Tukar versi secara atomik; pemegang referensi lama tetap memakai model lama
+            for old_key in [k for k in _model_cache if k[0] == key[0] and k[1] != content_hash]:
+                del _model_cache[old_key]
+                posterior_cache.invalidate(old_key[1])
+            _model_cache[key] = diagnosis_model
+        return diagnosis_model
+
+
+def _compile_model(rule_path, individuals_path, priors, artifact_path, content_hash, previous):
+    """Bangun model: inkremental dari versi sebelumnya, dari artefak, atau penuh dari JSON"""
+    diagnosis_model = None
+    if previous is not None:
+        # File rule diedit: perbarui hanya bagian yang berubah
+        rule_list, individuals_list = load_json_data(rule_path, individuals_path)
+        with telemetry.stage('update_model'):
+            diagnosis_model = previous.with_rules(rule_list, individuals_list,
+                                                  content_hash, priors)
+
+    if diagnosis_model is None and artifact_path and os.path.exists(artifact_path):
+        from diagnosis.artifact import load_artifact
+        with telemetry.stage('load_artifact'):
+            diagnosis_model = load_artifact(artifact_path, content_hash, priors,
+                                            cached_file_hash(individuals_path))
+
+    if diagnosis_model is None:
+        rule_list, individuals_list = load_json_data(rule_path, individuals_path)
+        diagnosis_model = DiagnosisModel.from_rules(rule_list, individuals_list,
+                                                    content_hash, priors)
+    return diagnosis_model
+
+
+def clear_cache(rule_path=None):
+    """
+    Kosongkan cache model dalam proses
+
+    Args:
+        rule_path (str): Hanya buang model dari file rule ini (opsional)
+    """
+    with _cache_lock:
+        if rule_path is None:
+            _model_cache.clear()
+            return
+        path = os.path.abspath(rule_path)
+        for key in [k for k in _model_cache if k[0] == path]:
+            del _model_cache[key]
+            posterior_cache.invalidate(key[1])
@@ -0,0 +1,57 @@
+"""
+Evidence tiga keadaan: gejala ada, tidak ada, atau tidak dicek.
+"""
+PRESENT = 1
+ABSENT = 0
+UNOBSERVED = -1
+
+
+def build_evidence(present=(), absent=()):
+    """
+    Bangun dict evidence dari gejala yang ada dan yang dipastikan tidak ada
+
+    Gejala yang tidak disebut dianggap tidak dicek dan tidak masuk evidence.
+
+    Args:
+        present (iterable): Gejala yang terlihat
+        absent (iterable): Gejala yang dipastikan tidak ada
+
+    Raises:
+        ValueError: Jika satu gejala ditandai ada sekaligus tidak ada
+
+    Returns:
+        dict: Mapping gejala -> PRESENT/ABSENT
+    """
+    evidence = {symptom: PRESENT for symptom in present}
+    conflict = [symptom for symptom in absent if symptom in evidence]
+    if conflict:
+        raise ValueError(f"Gejala ditandai ada dan tidak ada sekaligus: {', '.join(conflict)}")
+    evidence.update({symptom: ABSENT for symptom in absent})
+    return evidence
+
+
+def observed_evidence(evidence):
+    """
+    Evidence tanpa gejala yang tidak dicek (UNOBSERVED)
+
+    Dipakai setiap mesin inferensi sebelum membaca keadaan gejala, sehingga
+    -1 tidak pernah terbaca sebagai gejala ada.
+
+    Args:
+        evidence (dict): Mapping gejala -> PRESENT/ABSENT/UNOBSERVED
+
+    Raises:
+        ValueError: Jika ada keadaan gejala selain 1/0/-1
+
+    Returns:
+        dict: Mapping gejala -> PRESENT/ABSENT
+    """
+    observed = {}
+    for symptom, state in evidence.items():
+        if state == PRESENT:
+            observed[symptom] = PRESENT
+        elif state == ABSENT:
+            observed[symptom] = ABSENT
+        elif state != UNOBSERVED:
+            raise ValueError(f"Keadaan gejala {symptom} tidak dikenal: {state!r}")
+    return observed
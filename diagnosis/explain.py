@@ -0,0 +1,88 @@
+"""
+Penjelasan kontribusi tiap gejala teramati terhadap posterior penyakit teratas.
+
+Untuk setiap gejala teramati dihitung posterior leave-one-out: posterior
+bila gejala itu dianggap tidak dicek. Semua skenario (baris dasar + satu
+baris per gejala teramati) disusun sebagai satu matriks evidence dan
+dihitung dalam satu kali jalan VectorizedInference, sehingga bobot penyakit
+dan suku Quickscore pola gejala ber-parent banyak dipakai bersama, bukan
+diulang per gejala.
+
+Kontribusi gejala f terhadap penyakit d dinyatakan sebagai rasio likelihood
+P(f | d=1, sisa evidence) / P(f | d=0, sisa evidence), yaitu rasio odds
+posterior dengan dan tanpa f. Rasio > 1 menaikkan, < 1 menurunkan posterior.
+"""
+import numpy as np
+
+from diagnosis.evidence import PRESENT, UNOBSERVED, observed_evidence
+
+DEFAULT_EXPLAINED_DISEASES = 3
+
+
+def _log_odds(p):
+    """log(p / (1 - p)) elemen demi elemen; +-inf untuk p = 1 / 0"""
+    with np.errstate(divide='ignore'):
+        return np.log(p) - np.log1p(-p)
+
+
+def explain_symptoms(vectorized, evidence, top_diseases=DEFAULT_EXPLAINED_DISEASES):
+    """
+    Kontribusi setiap gejala teramati terhadap posterior penyakit teratas
+
+    Args:
+        vectorized (VectorizedInference): Mesin inferensi tervektorisasi
+        evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+        top_diseases (int): Jumlah penyakit teratas yang dijelaskan
+
+    Raises:
+        ValueError: Jika gejala tidak ada di model atau probabilitas evidence nol
+
+    Returns:
+        list: Dict 'penyakit', 'posterior', 'kontribusi' per penyakit teratas;
+              'kontribusi' berisi dict 'gejala', 'ada', 'posterior_tanpa',
+              'selisih' (posterior - posterior_tanpa), 'rasio' (rasio likelihood),
+              terurut dari pengaruh terbesar
+    """
+    model = vectorized.model
+    evidence = observed_evidence(evidence)
+    unknown = [s for s in evidence if s not in model.symptom_index]
+    if unknown:
+        raise ValueError(f"Gejala tidak ada di model: {', '.join(unknown)}")
+
+    observed = np.array([model.symptom_index[s] for s in evidence], dtype=int)
+    base = np.full(model.n_symptoms, UNOBSERVED, dtype=np.int8)
+    base[observed] = list(evidence.values())
+
+    # Baris 0: evidence lengkap, baris k + 1: gejala teramati ke-k tidak dicek
+    scenarios = np.repeat(base[None, :], len(observed) + 1, axis=0)
+    scenarios[np.arange(1, len(observed) + 1), observed] = UNOBSERVED
+
+    posterior, log_likelihood = vectorized.posterior_matrix(scenarios, with_likelihood=True)
+    if not np.isfinite(log_likelihood[0]):
+        raise ValueError("Probabilitas evidence bernilai nol")
+
+    targets = np.argsort(-posterior[0], kind='stable')[:top_diseases]
+    base_posterior = posterior[0, targets]
+    without = posterior[1:, targets]
+
+    # Rasio odds dengan / tanpa gejala = rasio likelihood gejala itu dalam konteks sisanya
+    with np.errstate(invalid='ignore'):
+        log_ratio = _log_odds(base_posterior)[None, :] - _log_odds(without)
+    log_ratio = np.nan_to_num(log_ratio, nan=0.0)
+
+    explanations = []
+    for j, d in enumerate(targets):
+        order = np.argsort(-np.abs(log_ratio[:, j]), kind='stable')
+        explanations.append({
+            'penyakit': model.diseases[d],
+            'posterior': float(base_posterior[j]),
+            'kontribusi': [
+                {'gejala': model.symptoms[observed[k]],
+                 'ada': bool(base[observed[k]] == PRESENT),
+                 'posterior_tanpa': float(without[k, j]),
+                 'selisih': float(base_posterior[j] - without[k, j]),
+                 'rasio': float(np.exp(log_ratio[k, j]))}
+                for k in order
+            ],
+        })
+    return explanations
@@ -0,0 +1,99 @@
+"""
+Faktor noisy-OR ringkas untuk node gejala.
+
+Faktor hanya menyimpan probabilitas link per parent dan leak (n + 1 angka),
+bukan tabel CPT penuh berukuran 2^(n+1). Ekspansi ke TabularCPD pgmpy hanya
+dilakukan bila diminta dan ditolak di atas batas jumlah parent.
+"""
+import numpy as np
+
+MAX_EXPANDED_PARENTS = 16
+
+
+class NoisyOrFactor:
+    """
+    Faktor noisy-OR untuk satu gejala
+
+    Args:
+        variable (str): Nama gejala
+        parents (list): Nama penyakit/hama parent
+        links (array-like): Probabilitas link (skor) per parent
+        leak (float): P(gejala=1) bila semua parent tidak aktif
+        parent_index (array-like): Indeks kolom parent di NoisyOrModel (opsional)
+    """
+
+    def __init__(self, variable, parents, links, leak, parent_index=None):
+        self.variable = variable
+        self.parents = list(parents)
+        self.links = np.asarray(links, dtype=float)
+        self.leak = float(leak)
+        self.parent_index = None if parent_index is None else np.asarray(parent_index, dtype=int)
+
+    def __repr__(self):
+        return f"NoisyOrFactor({self.variable!r}, parents={self.parents!r}, leak={self.leak})"
+
+    @property
+    def n_parents(self):
+        return len(self.parents)
+
+    @property
+    def compact_size(self):
+        """Jumlah parameter yang disimpan (link + leak)"""
+        return self.n_parents + 1
+
+    @property
+    def table_size(self):
+        """Jumlah entri TabularCPD jika faktor diekspansi"""
+        return 2 ** (self.n_parents + 1)
+
+    def prob_absent(self, parent_states):
+        """
+        Hitung P(gejala=0 | parent) tanpa membentuk tabel
+
+        Args:
+            parent_states (array-like): State parent 0/1, bentuk (..., n_parents)
+
+        Returns:
+            np.ndarray: P(gejala=0) untuk setiap baris state
+        """
+        states = np.asarray(parent_states, dtype=bool)
+        prob = np.prod(np.where(states, 1.0 - self.links, 1.0), axis=-1)
+        return np.where(states.any(axis=-1), prob, 1.0 - self.leak)
+
+    def to_values(self, max_parents=MAX_EXPANDED_PARENTS):
+        """
+        Ekspansi faktor ke nilai CPT dengan urutan kolom pgmpy
+
+        Args:
+            max_parents (int): Batas jumlah parent yang boleh diekspansi
+
+        Returns:
+            np.ndarray: Nilai CPT bentuk (2, 2^n_parents)
+        """
+        if self.n_parents > max_parents:
+            raise ValueError(
+                f"Ekspansi CPT {self.variable} ditolak: {self.n_parents} parent "
+                f"({self.table_size} entri) melebihi batas {max_parents} parent"
+            )
+
+        # Parent pertama adalah bit paling signifikan (sama seperti itertools.product)
+        shifts = np.arange(self.n_parents - 1, -1, -1)
+        states = (np.arange(2 ** self.n_parents)[:, None] >> shifts) & 1
+        prob_absent = self.prob_absent(states)
+        return np.vstack([prob_absent, 1.0 - prob_absent])
+
+    def to_tabular_cpd(self, max_parents=MAX_EXPANDED_PARENTS):
+        """
+        Ekspansi faktor menjadi TabularCPD pgmpy
+
+        Args:
+            max_parents (int): Batas jumlah parent yang boleh diekspansi
+
+        Returns:
+            TabularCPD: CPT penuh untuk gejala ini
+        """
+        from pgmpy.factors.discrete import TabularCPD
+
+        return TabularCPD(variable=self.variable, variable_card=2,
+                          values=self.to_values(max_parents),
+                          evidence=self.parents, evidence_card=[2] * self.n_parents)
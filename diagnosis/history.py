@@ -0,0 +1,554 @@
+"""
+Log diagnosis append-only dalam format kolom (Parquet) dan agregasi prevalensi.
+
+Setiap diagnosis dicatat sebagai satu baris: waktu, tanaman, kunci versi
+model, bitset evidence (gejala ada / tidak ada, lihat Vocabulary), vektor
+posterior, dan penanda apakah posterior itu eksak. Prevalensi dan prior
+empiris hanya memakai baris eksak kecuali diminta lain.
+
+Baris ditampung di memori lalu ditulis per batch sebagai file
+part-*.parquet baru (file lama tidak pernah diubah), paling lambat
+flush_seconds setelah baris tertua masuk walaupun tidak ada append lagi
+(timer latar). Baris yang masih di tampungan hilang bila proses dimatikan
+paksa. Bila jumlah file part dan file compacted kecil melewati ambang,
+file-file tersebut digabung di thread latar (bukan di jalur request)
+menjadi satu file compacted-*.parquet secara streaming. Setiap kompaksi
+lebih dulu mengklaim sumbernya dengan rename atomik ke nama tersembunyi,
+sehingga beberapa proses (aplikasi, CLI, replika lain) yang berbagi folder
+tidak pernah menggabungkan file yang sama dua kali. Pembaca memakai
+snapshot daftar file dan melewati file yang hilang di tengah query.
+
+Urutan penyakit dan gejala per versi model disimpan sekali di
+_models/<kunci>.json. Kunci = hash isi rule_list.json plus digest urutan
+tersebut, sehingga dua proses yang menyusun kolom berbeda untuk hash yang
+sama (mis. pembaruan inkremental versi lama vs bangun ulang penuh) tidak
+pernah berbagi satu urutan. Prevalensi digabung per nama penyakit lintas
+versi rule. Query prevalensi membaca per batch (hanya kolom yang
+diperlukan dan hanya rentang waktu yang diminta), tanpa memuat seluruh
+riwayat.
+
+pyarrow hanya diimpor saat log ditulis atau dibaca. Log bersama
+(diagnosis_log) nonaktif secara default; aktifkan dengan environment
+variable DIAGNOSIS_LOG=1. Foldernya diatur lewat DIAGNOSIS_LOG_DIR, default
+diagnosis_log di root repo (bukan relatif terhadap working directory).
+
+Contoh:
+    python -m diagnosis.history prevalensi --window bulan --start 2026-01-01
+    python -m diagnosis.history prior -o priors.json
+"""
+import argparse
+import atexit
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from diagnosis.noisy_or import DEFAULT_PRIOR
+from diagnosis.priors import PENYAKIT_PRIORS
+
+logger = logging.getLogger(__name__)
+
+LOG_ENV = 'DIAGNOSIS_LOG'
+LOG_DIR_ENV = 'DIAGNOSIS_LOG_DIR'
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'diagnosis_log')
+DEFAULT_BUFFER_SIZE = 256
+DEFAULT_FLUSH_SECONDS = 60.0
+DEFAULT_COMPACT_FILES = 32
+# File compacted di bawah ukuran ini ikut digabung ulang saat kompaksi otomatis
+DEFAULT_COMPACT_BYTES = 64 * 2 ** 20
+# Klaim kompaksi yang lebih tua dari ini dianggap milik proses yang mati
+STALE_CLAIM_SECONDS = 3600
+CLAIM_PREFIX = '.claim-'
+DEFAULT_PSEUDO_COUNT = 1.0
+MODEL_DIR = '_models'
+
+# Nama jendela waktu -> unit datetime64 numpy ('W' diawali hari Senin, lihat _periods)
+WINDOWS = {'hari': 'D', 'minggu': 'W', 'bulan': 'M', 'tahun': 'Y'}
+
+
+def _schema(pa):
+    return pa.schema([
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('tanaman', pa.string()),
+        ('model', pa.string()),
+        ('gejala_ada', pa.binary()),
+        ('gejala_tidak_ada', pa.binary()),
+        ('posterior', pa.list_(pa.float64())),
+        ('exact', pa.bool_()),
+    ])
+
+
+def _to_bytes(bits, n_bits):
+    return bits.to_bytes((n_bits + 7) // 8, 'little')
+
+
+def model_key(diagnosis_model):
+    """Kunci versi model di log: hash isi rule_list.json dan digest urutan penyakit/gejala"""
+    layout = json.dumps([diagnosis_model.hama_penyakit_list, diagnosis_model.gejala_list])
+    return f"{diagnosis_model.content_hash}-{hashlib.sha256(layout.encode()).hexdigest()[:16]}"
+
+
+def _claim_parts(claimed):
+    """(waktu mulai ns, pid, nama file asli) dari nama file klaim kompaksi"""
+    started, pid, original = os.path.basename(claimed)[len(CLAIM_PREFIX):].split('-', 2)
+    return started, pid, original
+
+
+def _periods(timestamps, unit):
+    """Awal periode tiap timestamp; minggu diawali Senin (epoch numpy jatuh pada Kamis)"""
+    if unit != 'W':
+        return timestamps.astype(f'datetime64[{unit}]')
+    days = timestamps.astype('datetime64[D]')
+    # 1970-01-01 adalah Kamis: indeks hari (Senin = 0) = (hari sejak epoch + 3) mod 7
+    return days - (days.astype(np.int64) + 3) % 7
+
+
+class DiagnosisLog:
+    """
+    Log diagnosis append-only berbasis file Parquet
+
+    Args:
+        directory (str): Folder log
+        buffer_size (int): Jumlah baris yang ditampung sebelum ditulis
+        flush_seconds (float): Tulis tampungan paling lambat selama ini setelah baris
+                               tertua masuk (lewat timer, tanpa menunggu append berikutnya)
+        compact_files (int): Gabungkan file bila jumlah file part dan compacted kecil
+                             mencapai ini
+        compact_bytes (int): File compacted di bawah ukuran ini ikut digabung ulang
+        enabled (bool): Nonaktifkan untuk membuat append() tidak melakukan apa-apa
+    """
+
+    def __init__(self, directory=DEFAULT_LOG_DIR, buffer_size=DEFAULT_BUFFER_SIZE,
+                 flush_seconds=DEFAULT_FLUSH_SECONDS, compact_files=DEFAULT_COMPACT_FILES,
+                 compact_bytes=DEFAULT_COMPACT_BYTES, enabled=True):
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self.flush_seconds = flush_seconds
+        self.compact_files = compact_files
+        self.compact_bytes = compact_bytes
+        self.enabled = enabled
+
+        self._rows = []
+        self._oldest = None
+        self._timer = None
+        self._compactor = None
+        self._known_models = {}
+        self._lock = threading.RLock()
+        # Satu kompaksi sekaligus per instance; antarproses dijaga oleh klaim rename
+        self._compact_lock = threading.Lock()
+
+    def _write_model(self, diagnosis_model):
+        """Simpan urutan penyakit/gejala satu versi model; mengembalikan kuncinya"""
+        layout = (diagnosis_model.content_hash, tuple(diagnosis_model.hama_penyakit_list),
+                  tuple(diagnosis_model.gejala_list))
+        key = self._known_models.get(layout)
+        if key is not None:
+            return key
+
+        key = model_key(diagnosis_model)
+        folder = os.path.join(self.directory, MODEL_DIR)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{key}.json")
+        if not os.path.exists(path):
+            # Isi file ditentukan kuncinya; tulis lewat rename agar pembaca tidak melihat
+            # file setengah jadi
+            tmp_path = os.path.join(folder, f".{key}-{os.getpid()}-{threading.get_ident()}.json")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'penyakit': diagnosis_model.hama_penyakit_list,
+                           'gejala': diagnosis_model.gejala_list}, f)
+            os.replace(tmp_path, path)
+        self._known_models[layout] = key
+        return key
+
+    def append(self, diagnosis_model, evidence, posterior, crop=None, timestamp=None, exact=True):
+        """
+        Catat satu diagnosis
+
+        Args:
+            diagnosis_model (DiagnosisModel): Model yang dipakai
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            posterior (dict or array-like): Posterior lengkap per penyakit (dict nama -> nilai
+                                            atau vektor urutan hama_penyakit_list), bukan
+                                            batas top-k
+            crop (str): Nama tanaman (opsional)
+            timestamp (float): Detik epoch, default sekarang
+            exact (bool): False untuk posterior perkiraan (likelihood weighting)
+
+        Raises:
+            ValueError: Jika evidence memuat gejala yang tidak ada di model
+        """
+        if not self.enabled:
+            return
+        present, absent = diagnosis_model.vocabulary.encode(evidence)
+        if isinstance(posterior, dict):
+            posterior = [posterior.get(d, 0.0) for d in diagnosis_model.hama_penyakit_list]
+        n_symptoms = len(diagnosis_model.gejala_list)
+
+        with self._lock:
+            key = self._write_model(diagnosis_model)
+            now = time.time()
+            self._rows.append({
+                'timestamp': int((now if timestamp is None else timestamp) * 1e6),
+                'tanaman': crop,
+                'model': key,
+                'gejala_ada': _to_bytes(present, n_symptoms),
+                'gejala_tidak_ada': _to_bytes(absent, n_symptoms),
+                'posterior': [float(p) for p in posterior],
+                'exact': bool(exact),
+            })
+            if self._oldest is None:
+                self._oldest = now
+                self._schedule_flush()
+            if len(self._rows) >= self.buffer_size or now - self._oldest >= self.flush_seconds:
+                self.flush()
+
+    def _schedule_flush(self):
+        """Timer daemon yang menulis tampungan setelah flush_seconds"""
+        self._timer = threading.Timer(self.flush_seconds, self._timed_flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _timed_flush(self):
+        # Timer tidak punya pemanggil yang bisa menangani error (pyarrow juga bisa gagal)
+        try:
+            self.flush()
+        except Exception:  # noqa: BLE001
+            logger.exception("Log diagnosis gagal ditulis")
+
+    def flush(self):
+        """Tulis baris yang ditampung sebagai satu file part baru"""
+        with self._lock:
+            if not self._rows:
+                return
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            os.makedirs(self.directory, exist_ok=True)
+            columns = {name: [row[name] for row in self._rows] for name in _schema(pa).names}
+            table = pa.table(columns, schema=_schema(pa))
+
+            name = f"part-{time.time_ns()}-{os.getpid()}.parquet"
+            # Tulis ke file tersembunyi lalu rename agar pembaca tidak melihat file setengah jadi
+            tmp_path = os.path.join(self.directory, f".{name}")
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+
+            self._rows = []
+            self._oldest = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if len(self._compaction_sources()) >= self.compact_files:
+                self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        """Jalankan kompaksi otomatis di thread daemon, paling banyak satu sekaligus"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._background_compact, daemon=True)
+        self._compactor.start()
+
+    def _background_compact(self):
+        # Ulangi selama file yang ditulis selama kompaksi masih melewati ambang
+        try:
+            while len(self._compaction_sources()) >= self.compact_files:
+                if self.compact() is None:
+                    break
+        except Exception:  # noqa: BLE001
+            logger.exception("Kompaksi log diagnosis gagal")
+
+    def wait_for_compaction(self, timeout=None):
+        """Tunggu kompaksi latar yang sedang berjalan (jika ada) selesai"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+
+    def close(self):
+        """Tulis sisa tampungan dan tunggu kompaksi latar, mis. saat proses berhenti"""
+        self.flush()
+        self.wait_for_compaction()
+
+    def files(self, prefix=''):
+        """File Parquet log, urut nama (= urut waktu tulis)"""
+        return sorted(glob.glob(os.path.join(self.directory, f"{prefix}*.parquet")))
+
+    def _compaction_sources(self, include_compacted=False):
+        """File compacted kecil (atau semua, jika include_compacted) lalu file part"""
+        sources = []
+        for path in self.files('compacted-'):
+            try:
+                if include_compacted or os.path.getsize(path) < self.compact_bytes:
+                    sources.append(path)
+            except FileNotFoundError:
+                continue
+        return sources + self.files('part-')
+
+    def _claim(self, path, token):
+        """Rename atomik ke nama klaim tersembunyi; None jika sudah diklaim proses lain"""
+        claimed = os.path.join(self.directory, f"{CLAIM_PREFIX}{token}-{os.path.basename(path)}")
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    def _recover_claims(self):
+        """Selesaikan klaim basi dari kompaksi yang berhenti di tengah jalan"""
+        now = time.time_ns()
+        for claimed in glob.glob(os.path.join(self.directory, f"{CLAIM_PREFIX}*.parquet")):
+            started, pid, original = _claim_parts(claimed)
+            if now - int(started) < STALE_CLAIM_SECONDS * 1e9:
+                continue
+            try:
+                if os.path.exists(os.path.join(self.directory,
+                                               f"compacted-{started}-{pid}.parquet")):
+                    # Hasil kompaksi sudah terlihat: sumbernya tinggal dihapus
+                    os.remove(claimed)
+                else:
+                    os.rename(claimed, os.path.join(self.directory, original))
+            except FileNotFoundError:
+                continue
+
+    def compact(self, include_compacted=False):
+        """
+        Gabungkan file part (dan file compacted kecil) menjadi satu file secara streaming
+
+        Sumber diklaim dulu dengan rename atomik, sehingga kompaksi yang berjalan
+        bersamaan di proses lain tidak pernah menggabungkan file yang sama.
+
+        Args:
+            include_compacted (bool): Ikut gabungkan semua file compacted, berapa pun ukurannya
+
+        Returns:
+            str: Path file hasil kompaksi, None jika tidak ada yang digabung
+        """
+        with self._compact_lock:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if not os.path.isdir(self.directory):
+                return None
+            self._recover_claims()
+            sources = self._compaction_sources(include_compacted)
+            if len(sources) < 2:
+                return None
+
+            token = f"{time.time_ns()}-{os.getpid()}"
+            claimed = [c for c in (self._claim(path, token) for path in sources) if c is not None]
+            if len(claimed) < 2:
+                # Sumber lain sudah diklaim kompaksi lain; satu file tidak perlu digabung
+                for path in claimed:
+                    os.rename(path, os.path.join(self.directory, _claim_parts(path)[2]))
+                return None
+
+            name = f"compacted-{token}.parquet"
+            tmp_path = os.path.join(self.directory, f".{name}")
+            with pq.ParquetWriter(tmp_path, _schema(pa)) as writer:
+                for path in claimed:
+                    parquet_file = pq.ParquetFile(path)
+                    for group in range(parquet_file.num_row_groups):
+                        writer.write_table(parquet_file.read_row_group(group))
+            path = os.path.join(self.directory, name)
+            os.replace(tmp_path, path)
+            for source in claimed:
+                os.remove(source)
+            return path
+
+    def _diseases(self, key):
+        with open(os.path.join(self.directory, MODEL_DIR, f"{key}.json"),
+                  'r', encoding='utf-8') as f:
+            return json.load(f)['penyakit']
+
+    def _batches(self, columns, start=None, end=None, crop=None, exact_only=True):
+        """Record batch log (hanya kolom yang diminta) dalam rentang waktu"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        self.flush()
+        files = self.files()
+        if not files:
+            return
+
+        def timestamp(value):
+            # Waktu ISO tanpa zona dianggap UTC
+            micros = int(np.datetime64(value, 'us').astype(np.int64))
+            return pa.scalar(micros, type=_schema(pa).field('timestamp').type)
+
+        condition = None
+        field = ds.field('timestamp')
+        for clause in (None if start is None else field >= timestamp(start),
+                       None if end is None else field < timestamp(end),
+                       None if crop is None else ds.field('tanaman') == crop,
+                       ds.field('exact') if exact_only else None):
+            if clause is not None:
+                condition = clause if condition is None else condition & clause
+
+        # Snapshot daftar file; file yang diklaim kompaksi lain sebelum sempat dibuka
+        # dilewati (barisnya pindah ke file compacted baru di luar snapshot)
+        for path in files:
+            try:
+                dataset = ds.dataset(path, format='parquet', schema=_schema(pa))
+                yield from dataset.to_batches(columns=columns, filter=condition)
+            except FileNotFoundError:
+                continue
+
+    def prevalence(self, window='bulan', start=None, end=None, crop=None, threshold=None,
+                   include_approximate=False):
+        """
+        Prevalensi penyakit per jendela waktu, dihitung per batch
+
+        Args:
+            window (str): 'hari', 'minggu', 'bulan', atau 'tahun'
+            start (str): Batas bawah waktu (ISO, inklusif), opsional
+            end (str): Batas atas waktu (ISO, eksklusif), opsional
+            crop (str): Hanya diagnosis tanaman ini, opsional
+            threshold (float): Jika diberikan, prevalensi = proporsi diagnosis dengan
+                               posterior >= threshold; default rata-rata posterior
+            include_approximate (bool): Ikut hitung diagnosis dengan posterior perkiraan
+
+        Raises:
+            ValueError: Jika jendela waktu tidak dikenal
+
+        Returns:
+            list: Dict 'periode' (str), 'jumlah' (int), 'prevalensi' (nama -> nilai),
+                  urut periode
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"Jendela waktu tidak dikenal: {window} (pilih {', '.join(WINDOWS)})")
+        unit = WINDOWS[window]
+
+        # (periode, kunci model) -> [jumlah baris, jumlah posterior per penyakit]
+        totals = {}
+        for batch in self._batches(['timestamp', 'model', 'posterior'], start, end, crop,
+                                   exact_only=not include_approximate):
+            periods = _periods(batch.column('timestamp').to_numpy(), unit)
+            models = batch.column('model').to_numpy(zero_copy_only=False)
+            posterior = batch.column('posterior')
+
+            # Satu matriks (baris, penyakit) per versi model, dijumlah per periode sekaligus
+            for model in np.unique(models):
+                rows = np.flatnonzero(models == model)
+                values = posterior.take(rows).flatten().to_numpy().reshape(len(rows), -1)
+                if threshold is not None:
+                    values = (values >= threshold).astype(float)
+                keys, inverse = np.unique(periods[rows], return_inverse=True)
+                sums = np.zeros((len(keys), values.shape[1]))
+                np.add.at(sums, inverse.reshape(-1), values)
+                counts = np.bincount(inverse.reshape(-1), minlength=len(keys))
+
+                for period, count, total in zip(keys, counts, sums):
+                    entry = totals.get((period, model))
+                    if entry is None:
+                        totals[(period, model)] = [int(count), total]
+                    else:
+                        entry[0] += int(count)
+                        entry[1] = entry[1] + total
+
+        # Gabungkan versi model per nama penyakit
+        periods = {}
+        for (period, model), (count, sums) in totals.items():
+            summary = periods.setdefault(period, {'jumlah': 0, 'total': {}, 'n': {}})
+            summary['jumlah'] += count
+            for disease, value in zip(self._diseases(model), sums):
+                summary['total'][disease] = summary['total'].get(disease, 0.0) + float(value)
+                summary['n'][disease] = summary['n'].get(disease, 0) + count
+
+        return [
+            {'periode': str(period), 'jumlah': summary['jumlah'],
+             'prevalensi': {d: summary['total'][d] / summary['n'][d] for d in summary['total']}}
+            for period, summary in sorted(periods.items())
+        ]
+
+    def empirical_priors(self, start=None, end=None, crop=None, base_priors=None,
+                         pseudo_count=DEFAULT_PSEUDO_COUNT):
+        """
+        Prior empiris: rata-rata posterior eksak yang dihaluskan ke prior dasar
+
+        Catatan: diagnosis dicatat hanya untuk tanaman yang diperiksa karena
+        bergejala, sehingga nilainya cenderung lebih tinggi dari prevalensi
+        populasi. pseudo_count mengatur seberapa kuat prior dasar dipertahankan.
+
+        Args:
+            start (str): Batas bawah waktu (ISO), opsional
+            end (str): Batas atas waktu (ISO), opsional
+            crop (str): Hanya diagnosis tanaman ini, opsional
+            base_priors (dict): Prior dasar per penyakit, default PENYAKIT_PRIORS (sama
+                                seperti load_model); penyakit di luarnya memakai DEFAULT_PRIOR
+            pseudo_count (float): Bobot prior dasar dalam jumlah diagnosis
+
+        Returns:
+            dict: Prior per penyakit, siap dipakai sebagai priors di load_model
+        """
+        base_priors = PENYAKIT_PRIORS if base_priors is None else base_priors
+        totals = {}
+        counts = {}
+        for period in self.prevalence('tahun', start, end, crop):
+            for disease, value in period['prevalensi'].items():
+                totals[disease] = totals.get(disease, 0.0) + value * period['jumlah']
+                counts[disease] = counts.get(disease, 0) + period['jumlah']
+        return {
+            disease: (totals[disease] + pseudo_count * base_priors.get(disease, DEFAULT_PRIOR))
+            / (counts[disease] + pseudo_count)
+            for disease in totals
+        }
+
+
+# Log bersama untuk seluruh proses (opt-in); sisa tampungan ditulis saat proses berhenti
+diagnosis_log = DiagnosisLog(os.environ.get(LOG_DIR_ENV, DEFAULT_LOG_DIR),
+                             enabled=os.environ.get(LOG_ENV, '0') == '1')
+atexit.register(diagnosis_log.close)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query log diagnosis")
+    parser.add_argument('--dir', default=os.environ.get(LOG_DIR_ENV, DEFAULT_LOG_DIR),
+                        help="Folder log diagnosis")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    prevalensi = subparsers.add_parser('prevalensi', help="Prevalensi penyakit per jendela waktu")
+    prevalensi.add_argument('--window', choices=list(WINDOWS), default='bulan')
+    prevalensi.add_argument('--start', default=None, help="Waktu awal (ISO)")
+    prevalensi.add_argument('--end', default=None, help="Waktu akhir (ISO, eksklusif)")
+    prevalensi.add_argument('--tanaman', default=None)
+    prevalensi.add_argument('--threshold', type=float, default=None,
+                            help="Hitung proporsi posterior >= threshold")
+    prevalensi.add_argument('--termasuk-perkiraan', action='store_true',
+                            help="Ikut hitung diagnosis dengan posterior perkiraan")
+
+    prior = subparsers.add_parser('prior', help="Prior empiris dari log")
+    prior.add_argument('--start', default=None, help="Waktu awal (ISO)")
+    prior.add_argument('--end', default=None, help="Waktu akhir (ISO, eksklusif)")
+    prior.add_argument('--tanaman', default=None)
+    prior.add_argument('--pseudo-count', type=float, default=DEFAULT_PSEUDO_COUNT)
+    prior.add_argument('-o', '--output', default='-', help="File JSON prior")
+
+    subparsers.add_parser('kompaksi', help="Gabungkan semua file log menjadi satu")
+    args = parser.parse_args(argv)
+
+    log = DiagnosisLog(args.dir)
+    if args.command == 'prevalensi':
+        for period in log.prevalence(args.window, args.start, args.end, args.tanaman,
+                                     args.threshold, args.termasuk_perkiraan):
+            print(json.dumps(period))
+    elif args.command == 'prior':
+        priors = log.empirical_priors(args.start, args.end, args.tanaman,
+                                      pseudo_count=args.pseudo_count)
+        text = json.dumps(priors, indent=2)
+        if args.output == '-':
+            print(text)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+    else:
+        path = log.compact(include_compacted=True)
+        print(path or "Tidak ada file yang perlu digabung")
+
+
+if __name__ == '__main__':
+    main()
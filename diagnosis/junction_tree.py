@@ -0,0 +1,272 @@
+"""
+Inferensi eksak junction tree untuk jaringan noisy-OR.
+
+Junction tree dikompilasi sekali per model: graf moral (parent satu gejala
+saling terhubung) ditriangulasi dengan heuristik urutan eliminasi, klik
+maksimal dihubungkan dengan maximum spanning tree atas ukuran separator,
+dan setiap CPT dimasukkan ke satu klik. Untuk setiap evidence, tree
+dikalibrasi sekali (message passing Shafer-Shenoy dua arah) lalu marginal
+semua penyakit dibaca dari klik yang sudah terkalibrasi.
+
+Ukuran klik terbesar (treewidth + 1) menentukan biaya: setiap klik adalah
+tabel 2^ukuran, sehingga treewidth menunjukkan kapan penambahan rule
+membuat inferensi eksak mahal.
+"""
+import numpy as np
+
+from diagnosis.evidence import PRESENT, observed_evidence
+
+HEURISTICS = ('min-fill', 'min-weight')
+DEFAULT_HEURISTIC = 'min-fill'
+
+# Klik dengan lebih dari ini variabel ditolak (tabel 2^20 angka)
+MAX_CLIQUE_VARS = 20
+
+
+def _elimination_order(neighbors, heuristic):
+    """Urutan eliminasi greedy dan klik yang terbentuk di setiap langkah"""
+    neighbors = {v: set(n) for v, n in neighbors.items()}
+    order = []
+    cliques = []
+
+    def fill_in(v):
+        nbrs = list(neighbors[v])
+        return sum(1 for a in range(len(nbrs)) for b in range(a + 1, len(nbrs))
+                   if nbrs[b] not in neighbors[nbrs[a]])
+
+    def weight(v):
+        # Semua variabel biner: bobot klik = 2^(jumlah tetangga + 1)
+        return len(neighbors[v])
+
+    while neighbors:
+        if heuristic == 'min-fill':
+            v = min(neighbors, key=lambda u: (fill_in(u), weight(u), u))
+        else:
+            v = min(neighbors, key=lambda u: (weight(u), fill_in(u), u))
+
+        nbrs = neighbors.pop(v)
+        for a in nbrs:
+            neighbors[a].discard(v)
+            neighbors[a].update(nbrs - {a})
+        order.append(v)
+        cliques.append(frozenset(nbrs | {v}))
+
+    return order, cliques
+
+
+def _maximal(cliques):
+    """Buang klik yang merupakan subset klik lain"""
+    unique = sorted(set(cliques), key=len, reverse=True)
+    maximal = []
+    for clique in unique:
+        if not any(clique <= other for other in maximal):
+            maximal.append(clique)
+    return maximal
+
+
+def _spanning_tree(cliques):
+    """Maximum spanning tree (Kruskal) atas ukuran separator; separator kosong diizinkan"""
+    candidates = sorted(
+        ((len(cliques[a] & cliques[b]), a, b)
+         for a in range(len(cliques)) for b in range(a + 1, len(cliques))),
+        reverse=True,
+    )
+    root = list(range(len(cliques)))
+
+    def find(a):
+        while root[a] != a:
+            root[a] = root[root[a]]
+            a = root[a]
+        return a
+
+    edges = []
+    for _, a, b in candidates:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            root[ra] = rb
+            edges.append((a, b))
+    return edges
+
+
+def _marginalize(table, variables, keep):
+    """Jumlahkan tabel atas variabel di luar keep; sumbu hasil berurutan seperti keep"""
+    axes = tuple(k for k, v in enumerate(variables) if v not in keep)
+    summed = table.sum(axis=axes) if axes else table
+    remaining = [v for v in variables if v in keep]
+    return np.transpose(summed, [remaining.index(v) for v in keep])
+
+
+def _expand(table, variables, target):
+    """Bentuk ulang tabel atas variables agar dapat di-broadcast ke sumbu target"""
+    ordered = sorted(variables, key=target.index)
+    table = np.transpose(table, [variables.index(v) for v in ordered])
+    shape = [2 if v in variables else 1 for v in target]
+    return table.reshape(shape)
+
+
+class JunctionTreeInference:
+    """
+    Junction tree terkompilasi di atas NoisyOrModel
+
+    Variabel penyakit bernomor 0..D-1 dan gejala D..D+S-1.
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        heuristic (str): Heuristik urutan eliminasi, 'min-fill' atau 'min-weight'
+        max_clique_vars (int): Batas jumlah variabel per klik
+
+    Raises:
+        ValueError: Jika heuristik tidak dikenal atau klik melebihi batas
+    """
+
+    def __init__(self, model, heuristic=DEFAULT_HEURISTIC, max_clique_vars=MAX_CLIQUE_VARS):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Heuristik tidak dikenal: {heuristic} (pilih {', '.join(HEURISTICS)})")
+
+        self.model = model
+        self.heuristic = heuristic
+        n_diseases = model.n_diseases
+
+        # Graf moral: gejala terhubung ke parent-nya, parent satu gejala saling terhubung
+        neighbors = {v: set() for v in range(n_diseases + model.n_symptoms)}
+        for i, parents in enumerate(model.parent_index):
+            family = {n_diseases + i, *parents.tolist()}
+            for v in family:
+                neighbors[v].update(family - {v})
+
+        self.elimination_order, eliminated = _elimination_order(neighbors, heuristic)
+        self.cliques = [sorted(clique) for clique in _maximal(eliminated)]
+        self.treewidth = max(len(clique) for clique in self.cliques) - 1
+        if self.treewidth + 1 > max_clique_vars:
+            raise ValueError(
+                f"Junction tree ditolak: klik terbesar {self.treewidth + 1} variabel "
+                f"melebihi batas {max_clique_vars}"
+            )
+
+        clique_sets = [set(clique) for clique in self.cliques]
+        self.edges = _spanning_tree([frozenset(clique) for clique in self.cliques])
+        self.tree = {c: [] for c in range(len(self.cliques))}
+        for a, b in self.edges:
+            self.tree[a].append(b)
+            self.tree[b].append(a)
+
+        # Urutan kunjungan dari root 0 (parent sebelum anak)
+        self._visit = [(0, None)]
+        for c, parent in self._visit:
+            self._visit.extend((n, c) for n in self.tree[c] if n != parent)
+
+        # Potensial awal: perkalian CPT yang dimasukkan ke setiap klik
+        self._potentials = [np.ones([2] * len(clique)) for clique in self.cliques]
+        self.disease_clique = []
+        for j in range(n_diseases):
+            c = next(c for c, clique in enumerate(clique_sets) if j in clique)
+            prior = np.array([1.0 - model.prior[j], model.prior[j]])
+            self._potentials[c] = self._potentials[c] * _expand(prior, [j], self.cliques[c])
+            self.disease_clique.append(c)
+
+        self.symptom_clique = []
+        for i, factor in enumerate(model.factors):
+            variables = factor.parent_index.tolist() + [n_diseases + i]
+            c = next(c for c, clique in enumerate(clique_sets) if clique.issuperset(variables))
+            values = factor.to_values(max_clique_vars)
+            # Sumbu (parent..., gejala) sesuai urutan bit to_values
+            table = values.T.reshape([2] * factor.n_parents + [2])
+            self._potentials[c] = self._potentials[c] * _expand(table, variables, self.cliques[c])
+            self.symptom_clique.append(c)
+
+    def table_sizes(self):
+        """Jumlah entri tabel per klik"""
+        return [2 ** len(clique) for clique in self.cliques]
+
+    def _separator(self, a, b):
+        return [v for v in self.cliques[a] if v in self.cliques[b]]
+
+    def _message(self, potential, incoming, source, target):
+        """Pesan klik source -> target, dinormalisasi agar tidak underflow"""
+        belief = potential
+        for n in self.tree[source]:
+            if n != target:
+                belief = belief * incoming[(n, source)]
+        separator = self._separator(source, target)
+        message = _marginalize(belief, self.cliques[source], separator)
+        total = message.sum()
+        if total > 0:
+            message = message / total
+        return _expand(message, separator, self.cliques[target])
+
+    def calibrate(self, evidence):
+        """
+        Kalibrasi tree untuk satu evidence
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+
+        Raises:
+            ValueError: Jika gejala tidak ada di model
+
+        Returns:
+            list: Belief (tabel tidak ternormalisasi) per klik
+        """
+        model = self.model
+        potentials = list(self._potentials)
+        for symptom, state in observed_evidence(evidence).items():
+            if symptom not in model.symptom_index:
+                raise ValueError(f"Gejala tidak ada di model: {symptom}")
+            i = model.symptom_index[symptom]
+            c = self.symptom_clique[i]
+            indicator = np.array([0.0, 1.0]) if state == PRESENT else np.array([1.0, 0.0])
+            potentials[c] = potentials[c] * _expand(indicator, [model.n_diseases + i], self.cliques[c])
+
+        incoming = {}
+        # Collect: dari daun ke root
+        for c, parent in reversed(self._visit):
+            if parent is not None:
+                incoming[(c, parent)] = self._message(potentials[c], incoming, c, parent)
+        # Distribute: dari root ke daun
+        for c, parent in self._visit:
+            for n in self.tree[c]:
+                if n != parent:
+                    incoming[(c, n)] = self._message(potentials[c], incoming, c, n)
+
+        beliefs = []
+        for c, potential in enumerate(potentials):
+            for n in self.tree[c]:
+                potential = potential * incoming[(n, c)]
+            beliefs.append(potential)
+        return beliefs
+
+    def posterior_vector(self, evidence):
+        """
+        Hitung P(penyakit=1 | evidence) untuk semua penyakit dari satu kalibrasi
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada); gejala yang tidak dicek tidak disertakan
+
+        Raises:
+            ValueError: Jika probabilitas evidence nol
+
+        Returns:
+            np.ndarray: Posterior dengan urutan model.diseases
+        """
+        beliefs = self.calibrate(evidence)
+        posterior = np.empty(self.model.n_diseases)
+        for j, c in enumerate(self.disease_clique):
+            marginal = _marginalize(beliefs[c], self.cliques[c], [j])
+            total = marginal.sum()
+            if total <= 0:
+                raise ValueError("Probabilitas evidence bernilai nol")
+            posterior[j] = marginal[1] / total
+        return np.clip(posterior, 0.0, 1.0)
+
+    def query(self, evidence):
+        """
+        Hitung posterior semua penyakit/hama dari satu kalibrasi
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada); gejala yang tidak dicek tidak disertakan
+
+        Returns:
+            dict: Mapping nama penyakit -> P(penyakit=1 | evidence)
+        """
+        posterior = self.posterior_vector(evidence)
+        return dict(zip(self.model.diseases, posterior.tolist()))
@@ -0,0 +1,368 @@
+"""
+Pembelajaran parameter (prior, skor, leak) dari kasus lapangan terkonfirmasi.
+
+Kasus dibaca secara streaming per blok. Untuk setiap gejala, statistik
+cukup adalah jumlah kasus per (pola parent aktif, status gejala), berukuran
+2^n_parent x 2, sehingga memori tidak bergantung pada jumlah kasus.
+Penghitungan per blok tervektorisasi: pola parent dikodekan sebagai bit
+lalu dihitung dengan bincount.
+
+Skor noisy-OR diestimasi dengan EM atas tabel pola tersebut (variabel
+tersembunyi: parent mana yang menyebabkan gejala). Kasus tanpa label
+penyakit ditangani dengan EM luar: posterior penyakit dihitung dengan
+parameter saat ini (VectorizedInference) dan pola parent diberi bobot
+perkalian posterior marginal (pendekatan mean-field), satu pass file per
+iterasi. Pseudo-count menarik estimasi ke nilai lama bila data sedikit.
+
+Format input (JSONL, satu kasus per baris):
+    {"gejala": [...], "gejala_tidak_ada": [...], "evidence": {gejala: 0/1},
+     "penyakit": [penyakit terkonfirmasi lab]}
+    Tanpa key "penyakit" (atau null) berarti kasus tidak berlabel;
+    "penyakit": [] berarti tanaman terkonfirmasi tidak sakit.
+CSV: kolom gejala seperti diagnosis.batch plus kolom 'penyakit' berisi nama
+dipisah ';' (kosong = tidak berlabel, '-' = tidak sakit).
+Kasus dibaca dengan pembaca diagnosis.batch: baris yang tidak valid dilewati
+dengan warning, tanpa menghentikan pembelajaran.
+
+Contoh:
+    python -m diagnosis.learning kasus.jsonl --rules rule_list.json -o rule_list.learned.json
+"""
+import argparse
+import json
+import logging
+
+import numpy as np
+
+from diagnosis.batch import chunks, read_records
+from diagnosis.core import DEFAULT_RULE_PATH
+from diagnosis.evidence import PRESENT, UNOBSERVED, observed_evidence
+from diagnosis.factors import MAX_EXPANDED_PARENTS
+from diagnosis.noisy_or import NoisyOrModel
+from diagnosis.priors import PENYAKIT_PRIORS
+from diagnosis.vectorized import VectorizedInference
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_EM_ITERATIONS = 20
+DEFAULT_LINK_ITERATIONS = 100
+DEFAULT_PSEUDO_COUNT = 1.0
+DEFAULT_TOLERANCE = 1e-4
+# Batas elemen matriks bobot pola (baris x 2^n_parent) per blok, ~32 MB float64
+MAX_WEIGHT_ELEMENTS = 2 ** 22
+
+LABEL_FIELD = 'penyakit'
+NO_DISEASE = '-'
+
+
+def parse_labels(value):
+    """
+    Label penyakit satu kasus dari nilai mentah kolom/key 'penyakit'
+
+    Args:
+        value: List nama (JSONL) atau string dipisah ';' (CSV); None/'' berarti tidak
+               berlabel, [] atau '-' berarti tanaman tidak sakit
+
+    Raises:
+        ValueError: Jika nilai bukan list nama atau string
+
+    Returns:
+        list: Nama penyakit terkonfirmasi, atau None jika kasus tidak berlabel
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        if value == NO_DISEASE:
+            return []
+        return [name.strip() for name in value.split(';') if name.strip()]
+    if isinstance(value, list) and all(isinstance(name, str) for name in value):
+        return value
+    raise ValueError(f"'{LABEL_FIELD}' harus berupa list nama penyakit atau null")
+
+
+def read_cases(path):
+    """
+    Baca kasus dari CSV atau JSONL secara streaming lewat pembaca diagnosis.batch
+
+    Kasus yang tidak valid (JSON rusak, gejala ada sekaligus tidak ada, label
+    tidak dikenali) dilewati dan dicatat sebagai warning.
+
+    Yields:
+        tuple: (evidence dict, list penyakit atau None jika tidak berlabel)
+    """
+    for record_id, evidence, error, label in read_records(path, LABEL_FIELD):
+        if error is None:
+            try:
+                labels = parse_labels(label)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            logger.warning("Kasus %s dilewati: %s", record_id, error)
+            continue
+        yield evidence, labels
+
+
+class SufficientStatistics:
+    """
+    Statistik cukup untuk prior, skor, dan leak
+
+    Attributes:
+        n_cases (float): Jumlah kasus (termasuk bobot kasus tidak berlabel)
+        disease_counts (np.ndarray): Jumlah (harapan) kasus per penyakit, bentuk (D,)
+        pattern_counts (list): Per gejala, array (2^n_parent, 2) jumlah kasus per
+                               (pola parent aktif, status gejala)
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.n_cases = 0.0
+        self.disease_counts = np.zeros(model.n_diseases)
+        self.pattern_counts = []
+        self._bits = []
+        for factor in model.factors:
+            if factor.n_parents > MAX_EXPANDED_PARENTS:
+                raise ValueError(f"Gejala {factor.variable} memiliki {factor.n_parents} parent "
+                                 f"(batas {MAX_EXPANDED_PARENTS})")
+            self.pattern_counts.append(np.zeros((2 ** factor.n_parents, 2)))
+            # Bit k pola = parent ke-k aktif
+            self._bits.append((np.arange(2 ** factor.n_parents)[:, None]
+                               >> np.arange(factor.n_parents)) & 1)
+
+    def copy(self):
+        stats = SufficientStatistics.__new__(SufficientStatistics)
+        stats.model = self.model
+        stats.n_cases = self.n_cases
+        stats.disease_counts = self.disease_counts.copy()
+        stats.pattern_counts = [counts.copy() for counts in self.pattern_counts]
+        stats._bits = self._bits
+        return stats
+
+    def chunk_rows(self, i):
+        """Jumlah baris per blok agar matriks bobot pola gejala i <= MAX_WEIGHT_ELEMENTS"""
+        return max(1, MAX_WEIGHT_ELEMENTS // len(self._bits[i]))
+
+    def add_labeled(self, diseases, evidence):
+        """
+        Tambah kasus berlabel
+
+        Args:
+            diseases (np.ndarray): Status penyakit 0/1, bentuk (N, D)
+            evidence (np.ndarray): Evidence 1/0/-1, bentuk (N, S)
+        """
+        diseases = np.asarray(diseases, dtype=np.int64)
+        self.n_cases += len(diseases)
+        self.disease_counts += diseases.sum(axis=0)
+
+        for i, parents in enumerate(self.model.parent_index):
+            observed = evidence[:, i] != UNOBSERVED
+            codes = diseases[observed][:, parents] @ (1 << np.arange(len(parents)))
+            states = (evidence[observed, i] == PRESENT).astype(np.int64)
+            counts = np.bincount(codes * 2 + states, minlength=self.pattern_counts[i].size)
+            self.pattern_counts[i] += counts.reshape(-1, 2)
+
+    def add_expected(self, posterior, evidence):
+        """
+        Tambah kasus tidak berlabel dengan bobot dari posterior penyakit
+
+        Args:
+            posterior (np.ndarray): P(penyakit=1 | evidence), bentuk (N, D)
+            evidence (np.ndarray): Evidence 1/0/-1, bentuk (N, S)
+        """
+        self.n_cases += len(posterior)
+        self.disease_counts += posterior.sum(axis=0)
+
+        with np.errstate(divide='ignore'):
+            log_on = np.log(posterior)
+            log_off = np.log1p(-posterior)
+        for i, parents in enumerate(self.model.parent_index):
+            rows = np.flatnonzero(evidence[:, i] != UNOBSERVED)
+            bits = self._bits[i]
+            # Matriks bobot (baris, 2^n_parent) dibangun per blok agar memori terbatas
+            chunk_size = self.chunk_rows(i)
+            for start in range(0, len(rows), chunk_size):
+                block = rows[start:start + chunk_size]
+                # Bobot pola = perkalian posterior marginal parent (mean-field)
+                log_weight = np.nan_to_num(log_on[block][:, parents], neginf=-1e300) @ bits.T \
+                    + np.nan_to_num(log_off[block][:, parents], neginf=-1e300) @ (1 - bits).T
+                weights = np.exp(log_weight)
+                present = evidence[block, i] == PRESENT
+                self.pattern_counts[i][:, 1] += weights[present].sum(axis=0)
+                self.pattern_counts[i][:, 0] += weights[~present].sum(axis=0)
+
+
+def _fit_links(counts, bits, links, pseudo_count, iterations, tolerance):
+    """EM skor noisy-OR untuk satu gejala dari tabel pola (2^n, 2)"""
+    active = bits[1:].astype(float)
+    absent_counts = counts[1:, 0]
+    present_counts = counts[1:, 1]
+    exposure = (absent_counts + present_counts) @ active + pseudo_count
+    prior_links = links.copy()
+
+    for _ in range(iterations):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            prob_present = -np.expm1(active @ np.log1p(-links))
+            # P(parent j penyebab | gejala ada, pola)
+            responsibility = np.where(prob_present[:, None] > 0,
+                                      active * links / prob_present[:, None], 0.0)
+        updated = (present_counts @ responsibility + pseudo_count * prior_links) / exposure
+        updated = np.clip(updated, 0.0, 1.0)
+        if np.max(np.abs(updated - links), initial=0.0) < tolerance:
+            return updated
+        links = updated
+    return links
+
+
+def maximize(stats, model, pseudo_count=DEFAULT_PSEUDO_COUNT,
+             link_iterations=DEFAULT_LINK_ITERATIONS, tolerance=DEFAULT_TOLERANCE):
+    """
+    M-step: parameter baru dari statistik cukup
+
+    Args:
+        stats (SufficientStatistics): Statistik hasil penghitungan
+        model (NoisyOrModel): Parameter saat ini (titik awal dan pusat pseudo-count)
+        pseudo_count (float): Kekuatan tarikan ke parameter saat ini
+        link_iterations (int): Iterasi EM skor per gejala
+        tolerance (float): Batas konvergensi EM skor
+
+    Returns:
+        NoisyOrModel: Model dengan prior, skor, dan leak baru
+    """
+    prior = (stats.disease_counts + pseudo_count * model.prior) / (stats.n_cases + pseudo_count)
+
+    link = model.link.copy()
+    leak = model.leak.copy()
+    for i, parents in enumerate(model.parent_index):
+        counts = stats.pattern_counts[i]
+        # Pola 0 (tidak ada parent aktif) hanya bergantung pada leak
+        leak[i] = (counts[0, 1] + pseudo_count * model.leak[i]) / (counts[0].sum() + pseudo_count)
+        link[i, parents] = _fit_links(counts, stats._bits[i], model.link[i, parents],
+                                      pseudo_count, link_iterations, tolerance)
+
+    return NoisyOrModel(model.diseases, model.symptoms, prior, link, model.mask, leak)
+
+
+def _encode_chunk(model, chunk):
+    """Matriks evidence dan label satu blok; label None untuk kasus tidak berlabel"""
+    evidence = np.full((len(chunk), model.n_symptoms), UNOBSERVED, dtype=np.int8)
+    diseases = np.zeros((len(chunk), model.n_diseases), dtype=np.int8)
+    labeled = np.zeros(len(chunk), dtype=bool)
+
+    for row, (case_evidence, labels) in enumerate(chunk):
+        for symptom, state in observed_evidence(case_evidence).items():
+            i = model.symptom_index.get(symptom)
+            if i is not None:
+                evidence[row, i] = state
+        if labels is not None:
+            labeled[row] = True
+            for name in labels:
+                j = model.disease_index.get(name)
+                if j is not None:
+                    diseases[row, j] = 1
+    return evidence, diseases, labeled
+
+
+def learn_parameters(model, cases, em_iterations=DEFAULT_EM_ITERATIONS,
+                     chunk_size=DEFAULT_CHUNK_SIZE, pseudo_count=DEFAULT_PSEUDO_COUNT,
+                     tolerance=DEFAULT_TOLERANCE):
+    """
+    Estimasi prior, skor, dan leak dari kasus lapangan
+
+    Args:
+        model (NoisyOrModel): Parameter awal (struktur rule tidak berubah)
+        cases (callable): Fungsi tanpa argumen yang mengembalikan iterator kasus
+                          (evidence, labels) baru; dipanggil sekali per pass
+        em_iterations (int): Iterasi EM maksimum untuk kasus tidak berlabel
+        chunk_size (int): Jumlah kasus per blok
+        pseudo_count (float): Kekuatan tarikan ke parameter awal
+        tolerance (float): Batas konvergensi perubahan parameter
+
+    Returns:
+        NoisyOrModel: Model dengan parameter hasil pembelajaran
+    """
+    labeled_stats = SufficientStatistics(model)
+    n_unlabeled = 0
+    for chunk in chunks(cases(), chunk_size):
+        evidence, diseases, labeled = _encode_chunk(model, chunk)
+        labeled_stats.add_labeled(diseases[labeled], evidence[labeled])
+        n_unlabeled += int((~labeled).sum())
+
+    logger.info("Kasus berlabel: %d, tidak berlabel: %d", int(labeled_stats.n_cases), n_unlabeled)
+    current = maximize(labeled_stats, model, pseudo_count)
+    if n_unlabeled == 0:
+        return current
+
+    for iteration in range(em_iterations):
+        stats = labeled_stats.copy()
+        engine = VectorizedInference(current)
+        for chunk in chunks(cases(), chunk_size):
+            evidence, _, labeled = _encode_chunk(model, chunk)
+            evidence = evidence[~labeled]
+            if len(evidence) == 0:
+                continue
+            posterior = engine.posterior_matrix(evidence)
+            possible = ~np.isnan(posterior).any(axis=1)
+            stats.add_expected(posterior[possible], evidence[possible])
+
+        updated = maximize(stats, model, pseudo_count)
+        change = max(np.max(np.abs(updated.prior - current.prior), initial=0.0),
+                     np.max(np.abs(updated.link - current.link), initial=0.0),
+                     np.max(np.abs(updated.leak - current.leak), initial=0.0))
+        current = updated
+        logger.info("EM iterasi %d: perubahan parameter maksimum %.6f", iteration + 1, change)
+        if change < tolerance:
+            break
+
+    return current
+
+
+def updated_rules(rule_list, model, decimals=4):
+    """
+    rule_list dengan skor baru serta key 'prior' dan 'leak' hasil pembelajaran
+
+    Args:
+        rule_list (list): Isi rule_list.json lama
+        model (NoisyOrModel): Model hasil learn_parameters
+        decimals (int): Jumlah desimal yang ditulis
+
+    Returns:
+        list: Rule baru dengan skema rule_list.json
+    """
+    result = []
+    for item in rule_list:
+        i = model.symptom_index[item['gejala']]
+        j = model.disease_index[item['nama']]
+        updated = dict(item)
+        updated['skor'] = str(round(float(model.link[i, j]), decimals))
+        updated['prior'] = round(float(model.prior[j]), decimals)
+        updated['leak'] = round(float(model.leak[i]), decimals)
+        result.append(updated)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pelajari prior, skor, dan leak dari kasus lapangan")
+    parser.add_argument('cases', help="Kasus berlabel (.jsonl atau .csv)")
+    parser.add_argument('--rules', default=DEFAULT_RULE_PATH, help="rule_list.json awal")
+    parser.add_argument('-o', '--output', default='rule_list.learned.json', help="rule_list.json hasil")
+    parser.add_argument('--em-iterations', type=int, default=DEFAULT_EM_ITERATIONS)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--pseudo-count', type=float, default=DEFAULT_PSEUDO_COUNT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.rules, 'r', encoding='utf-8') as f:
+        rule_list = json.load(f)
+    model = NoisyOrModel.from_rules(rule_list, PENYAKIT_PRIORS)
+
+    learned = learn_parameters(model, lambda: read_cases(args.cases), args.em_iterations,
+                               args.chunk_size, args.pseudo_count)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(updated_rules(rule_list, learned), f, indent=4, ensure_ascii=False)
+    print(f"rule_list hasil pembelajaran ditulis ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Parameter jaringan noisy-OR dua lapis (penyakit/hama -> gejala).
+
+Semantik CPT mengikuti build_bayesian_model() di app.py:
+    P(gejala=0 | parent) = prod_j (1 - skor_j)^x_j   jika ada parent aktif
+    P(gejala=0 | parent) = 1 - leak                 jika semua parent tidak aktif
+"""
+import bisect
+from functools import cached_property
+
+import numpy as np
+
+from diagnosis.factors import NoisyOrFactor
+from diagnosis.vocabulary import Vocabulary
+
+DEFAULT_LEAK = 0.1  # 10% leak probability (sesuai pakar)
+DEFAULT_PRIOR = 0.1
+
+
+class NoisyOrModel:
+    """
+    Representasi ringkas jaringan noisy-OR dalam bentuk array.
+
+    Attributes:
+        diseases (list): Nama penyakit/hama (urutan kolom)
+        symptoms (list): Nama gejala, urut alfabetis (urutan baris)
+        prior (np.ndarray): Prior P(penyakit=1), bentuk (D,)
+        link (np.ndarray): Probabilitas link (skor), bentuk (S, D), 0 jika tidak ada edge
+        mask (np.ndarray): Matriks boolean edge penyakit -> gejala, bentuk (S, D)
+        leak (np.ndarray): Leak per gejala, bentuk (S,)
+        factors (list): NoisyOrFactor per gejala (urutan symptoms)
+    """
+
+    def __init__(self, diseases, symptoms, prior, link, mask, leak, factors=None):
+        self.diseases = list(diseases)
+        self.symptoms = list(symptoms)
+        self.prior = np.asarray(prior, dtype=float)
+        self.link = np.asarray(link, dtype=float)
+        self.mask = np.asarray(mask, dtype=bool)
+        self.leak = np.asarray(leak, dtype=float)
+
+        self.disease_index = {d: j for j, d in enumerate(self.diseases)}
+        self.symptom_index = {s: i for i, s in enumerate(self.symptoms)}
+
+        # Faktor yang diberikan dipakai ulang (lihat with_edges), sisanya dibangun
+        factors = list(factors) if factors is not None else [None] * len(self.symptoms)
+        for i, factor in enumerate(factors):
+            if factor is None:
+                factors[i] = self._build_factor(i)
+        self.factors = factors
+        self.parent_index = [factor.parent_index for factor in self.factors]
+
+    def _build_factor(self, i):
+        parents = np.flatnonzero(self.mask[i])
+        return NoisyOrFactor(self.symptoms[i], [self.diseases[j] for j in parents],
+                             self.link[i, parents], self.leak[i], parent_index=parents)
+
+    @classmethod
+    def from_rules(cls, rule_list, priors=None, leak=DEFAULT_LEAK, default_prior=DEFAULT_PRIOR):
+        """
+        Bangun model dari rule_list.json
+
+        Key opsional 'prior' (prior penyakit 'nama') dan 'leak' (leak gejala
+        'gejala') pada rule, hasil diagnosis.learning, diutamakan di atas
+        priors dan leak.
+
+        Args:
+            rule_list (list): List rule dengan key 'rule', 'gejala', 'nama', 'skor'
+            priors (dict): Prior per penyakit/hama; yang tidak ada memakai default_prior
+            leak (float): Leak probability untuk setiap gejala
+            default_prior (float): Prior untuk penyakit yang tidak ada di priors
+
+        Returns:
+            NoisyOrModel: Model noisy-OR
+        """
+        priors = priors or {}
+
+        # Urutan penyakit mengikuti kemunculan pertama di rule_list
+        diseases = list(dict.fromkeys(item['nama'] for item in rule_list))
+        symptoms = sorted(set(item['gejala'] for item in rule_list))
+
+        disease_index = {d: j for j, d in enumerate(diseases)}
+        symptom_index = {s: i for i, s in enumerate(symptoms)}
+
+        link = np.zeros((len(symptoms), len(diseases)))
+        mask = np.zeros((len(symptoms), len(diseases)), dtype=bool)
+        for item in rule_list:
+            i = symptom_index[item['gejala']]
+            j = disease_index[item['nama']]
+            link[i, j] = float(item['skor'])
+            mask[i, j] = True
+
+        rule_priors = {item['nama']: float(item['prior']) for item in rule_list if 'prior' in item}
+        rule_leaks = {item['gejala']: float(item['leak']) for item in rule_list if 'leak' in item}
+
+        prior = [rule_priors.get(d, priors.get(d, default_prior)) for d in diseases]
+        leak = [rule_leaks.get(s, leak) for s in symptoms]
+        return cls(diseases, symptoms, prior, link, mask, leak)
+
+    def with_edges(self, changes, priors=None, leak=DEFAULT_LEAK, default_prior=DEFAULT_PRIOR,
+                   disease_order=None):
+        """
+        Salinan model dengan sejumlah edge ditambah, diubah skornya, atau dihapus
+
+        Hanya faktor gejala yang terdampak yang dibangun ulang; faktor lain
+        dipakai bersama dengan model lama. Model lama tidak diubah sehingga
+        diagnosis yang sedang berjalan tetap konsisten.
+
+        Args:
+            changes (iterable): Tuple (gejala, penyakit, skor); skor None berarti edge dihapus
+            priors (dict): Prior untuk penyakit baru; yang tidak ada memakai default_prior
+            leak (float): Leak untuk gejala baru
+            default_prior (float): Prior untuk penyakit baru yang tidak ada di priors
+            disease_order (list): Urutan kolom penyakit hasil (mis. kemunculan pertama di
+                                  rule_list, sama dengan from_rules); default urutan lama
+                                  dengan penyakit baru di akhir
+
+        Returns:
+            NoisyOrModel: Model baru
+        """
+        priors = priors or {}
+        diseases = list(self.diseases)
+        symptoms = list(self.symptoms)
+        prior = self.prior.copy()
+        link = self.link.copy()
+        mask = self.mask.copy()
+        leak_vec = self.leak.copy()
+        factors = list(self.factors)
+        touched = set()
+
+        for symptom, disease, score in changes:
+            if disease not in diseases:
+                if score is None:
+                    continue
+                diseases.append(disease)
+                prior = np.append(prior, priors.get(disease, default_prior))
+                link = np.hstack([link, np.zeros((len(symptoms), 1))])
+                mask = np.hstack([mask, np.zeros((len(symptoms), 1), dtype=bool)])
+
+            if symptom not in symptoms:
+                if score is None:
+                    continue
+                # Sisipkan baris baru dengan tetap menjaga urutan alfabetis
+                i = bisect.bisect_left(symptoms, symptom)
+                symptoms.insert(i, symptom)
+                link = np.insert(link, i, 0.0, axis=0)
+                mask = np.insert(mask, i, False, axis=0)
+                leak_vec = np.insert(leak_vec, i, leak)
+                factors.insert(i, None)
+
+            i = symptoms.index(symptom)
+            j = diseases.index(disease)
+            link[i, j] = 0.0 if score is None else float(score)
+            mask[i, j] = score is not None
+            touched.add(symptom)
+
+        # Buang gejala tanpa parent dan penyakit tanpa gejala, lalu susun ulang kolom
+        keep_rows = mask.any(axis=1)
+        column = {d: j for j, d in enumerate(diseases)}
+        order = diseases if disease_order is None else disease_order
+        columns = np.array([column[d] for d in order if d in column and mask[:, column[d]].any()],
+                           dtype=int)
+        if len(columns) != int(mask.any(axis=0).sum()):
+            raise ValueError("disease_order tidak memuat semua penyakit yang masih punya gejala")
+
+        # Indeks kolom bergeser: faktor yang merujuk kolom tersebut ikut dibangun ulang
+        shifted = columns[columns != np.arange(len(columns))]
+        if len(shifted):
+            touched.update(s for s, row in zip(symptoms, mask) if row[shifted].any())
+
+        factors = [None if s in touched else f
+                   for s, f, keep in zip(symptoms, factors, keep_rows) if keep]
+        symptoms = [s for s, keep in zip(symptoms, keep_rows) if keep]
+        diseases = [diseases[j] for j in columns]
+
+        return NoisyOrModel(diseases, symptoms, prior[columns], link[keep_rows][:, columns],
+                            mask[keep_rows][:, columns], leak_vec[keep_rows], factors=factors)
+
+    @cached_property
+    def vocabulary(self):
+        """Vocabulary (indeks dan adjacency bitset) model ini, dibangun saat pertama dipakai"""
+        return Vocabulary(self)
+
+    @property
+    def nbytes(self):
+        """Perkiraan memori array parameter, faktor, dan vocabulary yang sudah dibangun (byte)"""
+        total = sum(a.nbytes for a in (self.prior, self.link, self.mask, self.leak))
+        total += sum(factor.links.nbytes for factor in self.factors)
+        if 'vocabulary' in self.__dict__:
+            total += self.vocabulary.nbytes
+        return total
+
+    @property
+    def n_diseases(self):
+        return len(self.diseases)
+
+    @property
+    def n_symptoms(self):
+        return len(self.symptoms)
+
+    def validate(self):
+        """
+        Validasi parameter model (pengganti check_model() pgmpy)
+
+        Raises:
+            ValueError: Jika ada probabilitas di luar [0, 1] atau gejala tanpa parent
+        """
+        for name, values in (('prior', self.prior), ('skor', self.link[self.mask]),
+                             ('leak', self.leak)):
+            if np.any((values < 0) | (values > 1)):
+                raise ValueError(f"Nilai {name} harus berada di rentang [0, 1]")
+
+        orphans = [s for s, parents in zip(self.symptoms, self.parent_index) if len(parents) == 0]
+        if orphans:
+            raise ValueError(f"Gejala tanpa parent: {', '.join(orphans)}")
+
+    def size_report(self):
+        """
+        Laporan ukuran faktor per node gejala
+
+        Returns:
+            list: Dict berisi 'symptom', 'parents', 'compact_size', 'table_size',
+                  urut dari tabel terbesar
+        """
+        report = [
+            {
+                'symptom': factor.variable,
+                'parents': factor.n_parents,
+                'compact_size': factor.compact_size,
+                'table_size': factor.table_size,
+            }
+            for factor in self.factors
+        ]
+        return sorted(report, key=lambda row: row['table_size'], reverse=True)
@@ -0,0 +1,34 @@
+"""
+Prior probability untuk setiap penyakit/hama.
+"""
+
+# Set prior probability untuk setiap penyakit/hama
+PENYAKIT_PRIORS = {
+    'Lanas': 0.5,
+    'Phytium_sp': 0.5,
+    'Ulat_tanah': 0.5,
+    'Jangkrik': 0.5,
+    'Kutu_kebul': 0.5,
+    'Tobacco_mozaic_virus': 0.5,
+    'Phytophthora_daun': 0.5,
+    'Begomovirus': 0.5,
+    'Cucumber_virus': 0.5,
+    'Virus_kerupuk': 0.5,
+    'Thrips_parvispinus': 0.5,
+    'Ulat_grayak': 0.5
+}
+
+# PENYAKIT_PRIORS = {
+#     'Lanas': 0.15,
+#     'Phytium_sp': 0.05,
+#     'Ulat_tanah': 0.06,
+#     'Jangkrik': 0.05,
+#     'Kutu_kebul': 0.08,
+#     'Tobacco_mozaic_virus': 0.07,
+#     'Phytophthora_daun': 0.08,
+#     'Begomovirus': 0.06,
+#     'Cucumber_virus': 0.05,
+#     'Virus_kerupuk': 0.05,
+#     'Thrips_parvispinus': 0.12,
+#     'Ulat_grayak': 0.18
+# }
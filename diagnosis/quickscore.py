@@ -0,0 +1,182 @@
+"""
+Inferensi eksak Quickscore untuk jaringan noisy-OR dua lapis.
+
+Semua marginal P(penyakit=1 | evidence) dihitung dalam satu kali jalan,
+menggantikan loop infer.query() per penyakit dengan VariableElimination.
+
+Gejala dengan satu parent (positif maupun negatif) langsung diserap ke
+bobot prior penyakitnya. Untuk gejala negatif ber-parent banyak, bagian
+noisy-OR juga diserap ke prior dan hanya koreksi leak yang tersisa.
+Gejala dengan banyak parent diekspansi sebagai jumlah suku berbentuk
+perkalian per penyakit (inklusi-eksklusi Quickscore):
+    P(g=1 | x) = 1 - prod_j q_j^x_j + leak * [semua parent = 0]
+    P(g=0 | x) = prod_j q_j^x_j * (1 - leak * [semua parent = 0])
+sehingga biayanya eksponensial hanya pada gejala ber-parent banyak.
+"""
+import numpy as np
+
+from diagnosis.evidence import PRESENT, observed_evidence
+
+DEFAULT_MAX_TERMS = 2 ** 20
+
+
+def _exclusive_products(values):
+    """Perkalian setiap baris kecuali kolom itu sendiri (aman untuk nilai nol)"""
+    n_rows = values.shape[0]
+    ones = np.ones((n_rows, 1))
+    left = np.cumprod(np.hstack([ones, values[:, :-1]]), axis=1)
+    right = np.cumprod(np.hstack([ones, values[:, :0:-1]]), axis=1)[:, ::-1]
+    return left * right
+
+
+def expand_terms(coupled, n_diseases):
+    """
+    Ekspansi suku inklusi-eksklusi untuk gejala ber-parent banyak
+
+    Args:
+        coupled (list): Tuple (parents, q, leak, positive) per gejala
+        n_diseases (int): Jumlah penyakit
+
+    Returns:
+        tuple: Koefisien (C,) dan pengali P(penyakit=1) per suku (C, D)
+    """
+    coefs = np.ones(1)
+    multipliers = np.ones((1, n_diseases))
+
+    for parents, q, leak, positive in coupled:
+        if positive:
+            terms = [(1.0, None), (-1.0, q), (leak, 0.0)]
+        else:
+            terms = [(1.0, None), (-leak, 0.0)]
+
+        new_coefs = []
+        new_multipliers = []
+        for coef, values in terms:
+            expanded = multipliers.copy()
+            if values is not None:
+                expanded[:, parents] *= values
+            new_coefs.append(coefs * coef)
+            new_multipliers.append(expanded)
+
+        coefs = np.concatenate(new_coefs)
+        multipliers = np.vstack(new_multipliers)
+
+    return coefs, multipliers
+
+
+def count_terms(coupled):
+    """Jumlah suku inklusi-eksklusi: 3 per gejala positif, 2 per gejala negatif"""
+    return int(np.prod([3 if positive else 2 for *_, positive in coupled], dtype=object))
+
+
+class QuickscoreInference:
+    """
+    Mesin inferensi Quickscore di atas NoisyOrModel
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        max_terms (int): Batas jumlah suku inklusi-eksklusi per query
+    """
+
+    def __init__(self, model, max_terms=DEFAULT_MAX_TERMS):
+        self.model = model
+        self.max_terms = max_terms
+
+    def _split_evidence(self, evidence):
+        """Pisahkan evidence menjadi bobot per penyakit dan gejala ber-parent banyak"""
+        model = self.model
+        weight_absent = 1.0 - model.prior
+        weight_present = model.prior.copy()
+        coupled = []
+
+        for symptom, state in observed_evidence(evidence).items():
+            if symptom not in model.symptom_index:
+                raise ValueError(f"Gejala tidak ada di model: {symptom}")
+            factor = model.factors[model.symptom_index[symptom]]
+            parents = factor.parent_index
+            q = 1.0 - factor.links
+            leak = factor.leak
+
+            if len(parents) == 1:
+                j = parents[0]
+                if state == PRESENT:
+                    weight_absent[j] *= leak
+                    weight_present[j] *= 1.0 - q[0]
+                else:
+                    weight_absent[j] *= 1.0 - leak
+                    weight_present[j] *= q[0]
+            elif state == PRESENT:
+                coupled.append((parents, q, leak, True))
+            else:
+                # Bagian noisy-OR diserap ke prior, tinggal koreksi leak
+                weight_present[parents] *= q
+                coupled.append((parents, q, leak, False))
+
+        return weight_absent, weight_present, coupled
+
+    def term_count(self, evidence):
+        """
+        Jumlah suku inklusi-eksklusi untuk evidence ini
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada); gejala yang tidak dicek tidak disertakan
+
+        Returns:
+            int: Jumlah suku yang akan dievaluasi
+        """
+        _, _, coupled = self._split_evidence(evidence)
+        return count_terms(coupled)
+
+    def posterior_vector(self, evidence, index=None):
+        """
+        Hitung P(penyakit=1 | evidence) untuk semua penyakit sekaligus
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada); gejala yang tidak dicek tidak disertakan
+            index (array-like): Indeks penyakit yang dihitung saja (opsional, lihat diagnosis.topk)
+
+        Returns:
+            np.ndarray: Posterior dengan urutan model.diseases, atau urutan index jika diberikan
+        """
+        weight_absent, weight_present, coupled = self._split_evidence(evidence)
+
+        n_terms = count_terms(coupled)
+        if n_terms > self.max_terms:
+            raise ValueError(
+                f"Evidence membutuhkan {n_terms} suku Quickscore (batas {self.max_terms})"
+            )
+
+        coefs, multipliers = expand_terms(coupled, self.model.n_diseases)
+        present = weight_present * multipliers
+        factors = weight_absent + present
+
+        likelihood = coefs @ np.prod(factors, axis=1)
+        if likelihood <= 0:
+            raise ValueError("Probabilitas evidence bernilai nol")
+
+        if index is None:
+            exclusive = _exclusive_products(factors)
+        else:
+            # Perkalian penyakit di luar index cukup dihitung sekali per suku
+            index = np.asarray(index, dtype=int)
+            others = np.ones(self.model.n_diseases, dtype=bool)
+            others[index] = False
+            exclusive = (_exclusive_products(factors[:, index])
+                         * np.prod(factors[:, others], axis=1)[:, None])
+            present = present[:, index]
+
+        joint = coefs @ (exclusive * present)
+        return np.clip(joint / likelihood, 0.0, 1.0)
+
+    def query(self, evidence):
+        """
+        Hitung posterior semua penyakit/hama dalam satu kali jalan
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada); gejala yang tidak dicek tidak disertakan
+
+        Returns:
+            dict: Mapping nama penyakit -> P(penyakit=1 | evidence)
+        """
+        posterior = self.posterior_vector(evidence)
+        return dict(zip(self.model.diseases, posterior.tolist()))
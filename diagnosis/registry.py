@@ -0,0 +1,173 @@
+"""
+Registry model untuk banyak tanaman (satu ontologi per tanaman).
+
+Setiap bundle adalah folder berisi rule_list.json dan individuals_list.json,
+misalnya hasil:
+    python graph_parsing/parse.py ontologi_cabai.rdf -o models/cabai
+Folder models/<tanaman>/ ditemukan otomatis; bundle.json opsional berisi
+{"label": "Cabai"} untuk nama tampilan. rule_list.json di root repo
+terdaftar sebagai tanaman 'tembakau'.
+
+Model dikompilasi saat pertama dipakai (lewat load_model, sehingga hot-swap
+edit rule tetap berlaku). Bila perkiraan memori model yang dimuat melebihi
+batas, model yang paling lama tidak dipakai dikeluarkan.
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from diagnosis.artifact import DEFAULT_ARTIFACT_PATH
+from diagnosis.core import (DEFAULT_INDIVIDUALS_PATH, DEFAULT_RULE_PATH, clear_cache,
+                            load_model)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUNDLE_DIR = 'models'
+DEFAULT_CROP = 'tembakau'
+DEFAULT_MEMORY_CAP = 256 * 2 ** 20
+BUNDLE_META_FILE = 'bundle.json'
+
+
+class ModelRegistry:
+    """
+    Daftar bundle rule per tanaman dengan kompilasi lazy dan eviksi LRU
+
+    Args:
+        bundles (dict): Nama tanaman -> dict 'rule_path', 'individuals_path', 'label',
+                        'artifact_path' (opsional)
+        memory_cap (int): Batas perkiraan memori model yang dimuat (byte)
+    """
+
+    def __init__(self, bundles=None, memory_cap=DEFAULT_MEMORY_CAP):
+        self.bundles = dict(bundles or {})
+        self.memory_cap = memory_cap
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, name, rule_path, individuals_path=None, label=None, artifact_path=None):
+        """
+        Daftarkan satu bundle
+
+        Args:
+            name (str): Nama tanaman (kunci di UI/API)
+            rule_path (str): Path rule_list.json
+            individuals_path (str): Path individuals_list.json, default di folder yang sama
+            label (str): Nama tampilan, default nama tanaman
+            artifact_path (str): Path artefak .npz (opsional)
+        """
+        if individuals_path is None:
+            individuals_path = os.path.join(os.path.dirname(rule_path), DEFAULT_INDIVIDUALS_PATH)
+        self.bundles[name] = {
+            'rule_path': rule_path,
+            'individuals_path': individuals_path,
+            'label': label or name.replace('_', ' ').title(),
+            'artifact_path': artifact_path,
+        }
+
+    def discover(self, bundle_dir=DEFAULT_BUNDLE_DIR):
+        """
+        Daftarkan setiap subfolder bundle_dir yang berisi rule_list.json
+
+        Args:
+            bundle_dir (str): Folder induk bundle
+
+        Returns:
+            list: Nama tanaman yang ditemukan
+        """
+        found = []
+        if not os.path.isdir(bundle_dir):
+            return found
+
+        for name in sorted(os.listdir(bundle_dir)):
+            folder = os.path.join(bundle_dir, name)
+            rule_path = os.path.join(folder, DEFAULT_RULE_PATH)
+            if not os.path.isfile(rule_path):
+                continue
+
+            label = None
+            meta_path = os.path.join(folder, BUNDLE_META_FILE)
+            if os.path.isfile(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    label = json.load(f).get('label')
+
+            artifact_path = os.path.join(folder, DEFAULT_ARTIFACT_PATH)
+            self.register(name, rule_path, label=label,
+                          artifact_path=artifact_path if os.path.isfile(artifact_path) else None)
+            found.append(name)
+        return found
+
+    def names(self):
+        """Nama tanaman terdaftar, urut alfabetis"""
+        return sorted(self.bundles)
+
+    def label(self, name):
+        """Nama tampilan tanaman"""
+        return self.bundles[name]['label']
+
+    def loaded(self):
+        """Nama tanaman yang modelnya sedang dimuat, dari yang paling lama tidak dipakai"""
+        with self._lock:
+            return list(self._loaded)
+
+    def get(self, name):
+        """
+        Model diagnosis untuk satu tanaman, dikompilasi saat pertama dipakai
+
+        Args:
+            name (str): Nama tanaman
+
+        Raises:
+            KeyError: Jika tanaman tidak terdaftar
+            FileNotFoundError, json.JSONDecodeError, ValueError: Lihat load_model
+
+        Returns:
+            DiagnosisModel: Model yang sudah dikompilasi
+        """
+        if name not in self.bundles:
+            raise KeyError(f"Tanaman tidak terdaftar: {name}")
+        bundle = self.bundles[name]
+
+        diagnosis_model = load_model(bundle['rule_path'], bundle['individuals_path'],
+                                     artifact_path=bundle['artifact_path'])
+        with self._lock:
+            self._loaded[name] = diagnosis_model
+            self._loaded.move_to_end(name)
+            self._evict()
+        return diagnosis_model
+
+    def memory_usage(self):
+        """Perkiraan total memori model yang dimuat (byte)"""
+        with self._lock:
+            return sum(model.nbytes for model in self._loaded.values())
+
+    def _evict(self):
+        # Model yang baru dipakai (terakhir) tidak pernah dikeluarkan
+        while len(self._loaded) > 1 and \
+                sum(model.nbytes for model in self._loaded.values()) > self.memory_cap:
+            name, _ = self._loaded.popitem(last=False)
+            clear_cache(self.bundles[name]['rule_path'])
+            logger.info("Model tanaman %s dikeluarkan dari memori (LRU)", name)
+
+
+@lru_cache(maxsize=None)
+def default_registry(bundle_dir=DEFAULT_BUNDLE_DIR, memory_cap=DEFAULT_MEMORY_CAP):
+    """
+    Registry bersama: rule_list.json di root sebagai 'tembakau' plus bundle di bundle_dir
+
+    Args:
+        bundle_dir (str): Folder induk bundle
+        memory_cap (int): Batas perkiraan memori model yang dimuat (byte)
+
+    Returns:
+        ModelRegistry: Registry yang sama untuk argumen yang sama
+    """
+    registry = ModelRegistry(memory_cap=memory_cap)
+    if os.path.isfile(DEFAULT_RULE_PATH):
+        artifact_path = DEFAULT_ARTIFACT_PATH if os.path.isfile(DEFAULT_ARTIFACT_PATH) else None
+        registry.register(DEFAULT_CROP, DEFAULT_RULE_PATH, label='Tembakau',
+                          artifact_path=artifact_path)
+    registry.discover(bundle_dir)
+    return registry
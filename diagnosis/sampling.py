@@ -0,0 +1,146 @@
+"""
+Inferensi perkiraan dengan likelihood weighting tervektorisasi.
+
+Penyakit disampel dari prior dalam blok (baris = sampel, kolom = penyakit),
+lalu setiap sampel diberi bobot P(evidence | sampel) yang dihitung untuk
+semua gejala teramati sekaligus dengan perkalian matriks di ruang log.
+Biayanya linear terhadap jumlah sampel dan gejala teramati, tidak
+bergantung pada jumlah suku Quickscore, sehingga cocok sebagai cadangan
+ketika inferensi eksak terlalu mahal.
+
+Interval kepercayaan memakai pendekatan normal dengan effective sample
+size (ESS) dari bobot sampel.
+"""
+import time
+
+import numpy as np
+
+from diagnosis.evidence import PRESENT, observed_evidence
+
+DEFAULT_SAMPLES = 20_000
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_Z = 1.96  # interval kepercayaan 95%
+
+
+class LikelihoodWeighting:
+    """
+    Likelihood weighting di atas NoisyOrModel
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        seed (int): Seed generator acak (None untuk acak)
+    """
+
+    def __init__(self, model, seed=None):
+        self.model = model
+        self.seed = seed
+
+        with np.errstate(divide='ignore'):
+            # log(1 - skor) per edge; -inf untuk skor 1
+            self._log_q = np.where(model.mask, np.log(1.0 - model.link), 0.0)
+        self._mask = model.mask.astype(float)
+
+    def _log_weights(self, samples, rows, states):
+        """log P(evidence | sampel) untuk setiap baris sampel"""
+        model = self.model
+        log_q = self._log_q[rows]
+        active = samples @ self._mask[rows].T > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_absent = np.where(active, samples @ log_q.T, np.log(1.0 - model.leak[rows]))
+            log_present = np.log(-np.expm1(log_absent))
+        return np.where(states, log_present, log_absent).sum(axis=1)
+
+    def estimate(self, evidence, n_samples=DEFAULT_SAMPLES, time_budget=None,
+                 batch_size=DEFAULT_BATCH_SIZE, z=DEFAULT_Z):
+        """
+        Perkiraan posterior beserta interval kepercayaan
+
+        Sampling berhenti ketika n_samples tercapai atau time_budget habis,
+        mana yang lebih dulu (minimal satu blok).
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            n_samples (int): Anggaran jumlah sampel (None untuk tanpa batas, wajib time_budget)
+            time_budget (float): Anggaran waktu dalam detik (opsional)
+            batch_size (int): Jumlah sampel per blok
+            z (float): Kuantil normal untuk lebar interval
+
+        Raises:
+            ValueError: Jika gejala tidak ada di model, anggaran tidak diberikan,
+                        atau semua sampel berbobot nol
+
+        Returns:
+            dict: 'posterior', 'lower', 'upper' (np.ndarray urutan model.diseases),
+                  'samples' (jumlah sampel) dan 'ess' (effective sample size)
+        """
+        if n_samples is None and time_budget is None:
+            raise ValueError("Tentukan n_samples atau time_budget")
+
+        model = self.model
+        evidence = observed_evidence(evidence)
+        unknown = [s for s in evidence if s not in model.symptom_index]
+        if unknown:
+            raise ValueError(f"Gejala tidak ada di model: {', '.join(unknown)}")
+        rows = np.array([model.symptom_index[s] for s in evidence], dtype=int)
+        states = np.array([evidence[s] == PRESENT for s in evidence], dtype=bool)
+
+        rng = np.random.default_rng(self.seed)
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+        # Akumulasi di ruang log dengan pergeseran agar bobot kecil tidak underflow
+        shift = -np.inf
+        sum_w = 0.0
+        sum_w2 = 0.0
+        sum_wx = np.zeros(model.n_diseases)
+        drawn = 0
+
+        while True:
+            size = batch_size if n_samples is None else min(batch_size, n_samples - drawn)
+            samples = (rng.random((size, model.n_diseases)) < model.prior).astype(float)
+            log_w = self._log_weights(samples, rows, states)
+            drawn += size
+
+            block_max = log_w.max()
+            if np.isfinite(block_max):
+                if block_max > shift:
+                    scale = np.exp(shift - block_max) if np.isfinite(shift) else 0.0
+                    sum_w *= scale
+                    sum_w2 *= scale ** 2
+                    sum_wx *= scale
+                    shift = block_max
+                w = np.exp(log_w - shift)
+                sum_w += w.sum()
+                sum_w2 += (w ** 2).sum()
+                sum_wx += w @ samples
+
+            if n_samples is not None and drawn >= n_samples:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        if sum_w <= 0:
+            raise ValueError("Semua sampel berbobot nol; evidence terlalu jarang untuk sampling")
+
+        posterior = sum_wx / sum_w
+        ess = sum_w ** 2 / sum_w2
+        half_width = z * np.sqrt(posterior * (1.0 - posterior) / ess)
+        return {
+            'posterior': posterior,
+            'lower': np.clip(posterior - half_width, 0.0, 1.0),
+            'upper': np.clip(posterior + half_width, 0.0, 1.0),
+            'samples': drawn,
+            'ess': float(ess),
+        }
+
+    def posterior_vector(self, evidence, n_samples=DEFAULT_SAMPLES):
+        """
+        Perkiraan P(penyakit=1 | evidence) untuk semua penyakit
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            n_samples (int): Jumlah sampel
+
+        Returns:
+            np.ndarray: Posterior dengan urutan model.diseases
+        """
+        return self.estimate(evidence, n_samples)['posterior']
@@ -0,0 +1,85 @@
+"""
+Indeks pencarian gejala (prefix kata dan substring) untuk menyaring grid gejala.
+
+Nama gejala diformat seperti di UI ("bercak_daun" -> "bercak daun") lalu
+diindeks dua cara:
+    - daftar kata terurut untuk pencarian prefix dengan bisect
+    - posting list trigram untuk pencarian substring (kata >= 3 huruf)
+
+Setiap kata pada query harus cocok (AND). Biaya query mengikuti jumlah
+gejala yang cocok, bukan jumlah seluruh gejala, sehingga tetap ringan
+ketika daftar gejala bertambah sampai ratusan.
+"""
+from bisect import bisect_left
+
+NGRAM = 3
+
+
+def format_label(name):
+    """Nama gejala/penyakit untuk ditampilkan (app.py) dan dicari: garis bawah -> spasi"""
+    return name.replace('_', ' ').title()
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class SymptomSearchIndex:
+    """
+    Indeks pencarian prefix/substring atas nama gejala
+
+    Args:
+        names (list): Nama gejala (urutan hasil pencarian mengikuti daftar ini)
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.labels = [format_label(name).lower() for name in self.names]
+
+        # (kata, indeks gejala) terurut untuk prefix
+        self._words = sorted({(word, i) for i, label in enumerate(self.labels)
+                              for word in label.split()})
+        self._ngrams = {}
+        for i, label in enumerate(self.labels):
+            for gram in _ngrams(label):
+                self._ngrams.setdefault(gram, set()).add(i)
+
+    def _prefix(self, term):
+        matches = set()
+        start = bisect_left(self._words, (term, -1))
+        for word, i in self._words[start:]:
+            if not word.startswith(term):
+                break
+            matches.add(i)
+        return matches
+
+    def _substring(self, term):
+        postings = [self._ngrams.get(gram, set()) for gram in _ngrams(term)]
+        candidates = set.intersection(*sorted(postings, key=len))
+        return {i for i in candidates if term in self.labels[i]}
+
+    def search(self, query):
+        """
+        Gejala yang cocok dengan query
+
+        Kata pendek (< 3 huruf) dicocokkan sebagai prefix kata, kata lain
+        sebagai substring nama.
+
+        Args:
+            query (str): Teks pencarian; kosong berarti semua gejala
+
+        Returns:
+            list: Nama gejala yang cocok, urutan sama dengan names
+        """
+        terms = query.lower().replace('_', ' ').split()
+        if not terms:
+            return list(self.names)
+
+        matches = None
+        for term in terms:
+            # Prefix kata sudah tercakup oleh substring untuk kata >= 3 huruf
+            found = self._prefix(term) if len(term) < NGRAM else self._substring(term)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [self.names[i] for i in sorted(matches)]
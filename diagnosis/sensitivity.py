@@ -0,0 +1,347 @@
+"""
+Analisis sensitivitas posterior terhadap skor rule, prior, dan leak.
+
+Turunan setiap posterior penyakit terhadap setiap skor (edge gejala ->
+penyakit), setiap prior, dan leak dihitung sekaligus dengan autodiff
+(torch) di atas formulasi Quickscore tervektorisasi yang sama dengan
+VectorizedInference: bobot per penyakit di ruang log, suku inklusi-eksklusi
+per pola gejala ber-parent banyak. Parameter direplikasi per baris evidence
+sehingga satu backward pass terbatch menghasilkan Jacobian per baris untuk
+seluruh batch, tanpa perturbasi parameter satu per satu. Skor disimpan per
+edge (bukan matriks gejala x penyakit penuh), dan ukuran blok baris dibatasi
+oleh ukuran Jacobian (penyakit x parameter), sehingga memori tetap terbatas
+untuk ratusan hama/penyakit.
+
+Leak default (0.1) dipakai bersama oleh semua gejala, sehingga turunan
+terhadap leak tersebut adalah jumlah turunan terhadap leak per gejala.
+
+torch hanya diimpor saat analisis dijalankan (dependensi opsional).
+
+Contoh:
+    python -m diagnosis.sensitivity observasi.jsonl --limit 10 -o sensitivitas.jsonl
+"""
+import argparse
+import json
+import logging
+import sys
+
+import numpy as np
+
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED
+from diagnosis.quickscore import DEFAULT_MAX_TERMS
+from diagnosis.vectorized import _normalize_evidence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024
+# Batas elemen Jacobian per blok (penyakit x baris x parameter), ~128 MB float64
+MAX_JACOBIAN_ELEMENTS = 2 ** 24
+DEFAULT_LIMIT = 10
+# Pengganti nol di dalam log agar gradien tetap terdefinisi; exp(log(TINY)) setara nol
+TINY = 1e-300
+
+
+def _exclusive_prod(torch, factors):
+    """Perkalian semua elemen sumbu terakhir kecuali elemen itu sendiri (aman untuk nol)"""
+    ones = torch.ones_like(factors[..., :1])
+    left = torch.cumprod(torch.cat([ones, factors[..., :-1]], dim=-1), dim=-1)
+    right = torch.cat([factors[..., 1:], ones], dim=-1).flip(-1).cumprod(-1).flip(-1)
+    return left * right
+
+
+class SensitivityAnalysis:
+    """
+    Turunan posterior terhadap parameter noisy-OR untuk matriks evidence
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        max_terms (int): Batas jumlah suku inklusi-eksklusi per pola evidence
+
+    Attributes:
+        edges (np.ndarray): Indeks (gejala, penyakit) setiap skor, bentuk (E, 2)
+    """
+
+    def __init__(self, model, max_terms=DEFAULT_MAX_TERMS):
+        self.model = model
+        self.max_terms = max_terms
+        self.edges = np.argwhere(model.mask)
+
+        n_parents = model.mask.sum(axis=1)
+        self._single = model.mask & (n_parents == 1)[:, None]
+        self._single_edge = self._single[self.edges[:, 0], self.edges[:, 1]]
+        self.coupled_symptoms = np.flatnonzero(n_parents > 1)
+        # Indeks edge per gejala (urut penyakit, sama dengan parent_index)
+        self._symptom_edges = np.split(np.arange(len(self.edges)),
+                                       np.cumsum(n_parents)[:-1])
+
+    def chunk_rows(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Jumlah baris per backward pass agar Jacobian blok <= MAX_JACOBIAN_ELEMENTS"""
+        model = self.model
+        n_parameters = len(self.edges) + model.n_diseases + model.n_symptoms
+        return max(1, min(chunk_size, MAX_JACOBIAN_ELEMENTS // (model.n_diseases * n_parameters)))
+
+    def _pattern_terms(self, torch, pattern, skor, leak):
+        """Koefisien (n, C) dan pengali (n, C, D) suku Quickscore, diferensiabel terhadap parameter"""
+        model = self.model
+        n = skor.shape[0]
+        coefs = torch.ones((n, 1), dtype=torch.float64)
+        multipliers = torch.ones((n, 1, model.n_diseases), dtype=torch.float64)
+
+        for i, state in zip(self.coupled_symptoms, pattern):
+            if state == UNOBSERVED:
+                continue
+            edges = self._symptom_edges[i]
+            parents = torch.as_tensor(self.edges[edges, 1])
+            q = torch.ones((n, model.n_diseases), dtype=torch.float64).index_copy(
+                1, parents, 1.0 - skor[:, edges])[:, None, :]
+            cleared = torch.as_tensor(np.where(model.mask[i], 0.0, 1.0))
+            leak_i = leak[:, i, None]
+            if state == PRESENT:
+                coefs = torch.cat([coefs, -coefs, coefs * leak_i], dim=1)
+                multipliers = torch.cat([multipliers, multipliers * q, multipliers * cleared], dim=1)
+            else:
+                coefs = torch.cat([coefs, -coefs * leak_i], dim=1)
+                multipliers = torch.cat([multipliers, multipliers * cleared], dim=1)
+
+            if coefs.shape[1] > self.max_terms:
+                raise ValueError(f"Pola evidence membutuhkan lebih dari {self.max_terms} suku")
+        return coefs, multipliers
+
+    def _group_posterior(self, torch, pattern, present, absent):
+        """Parameter (leaf per baris) dan posterior untuk baris-baris dengan pola yang sama"""
+        model = self.model
+        n = present.shape[0]
+        symptom, disease = self.edges[:, 0], self.edges[:, 1]
+
+        def as_tensor(values):
+            return torch.as_tensor(np.asarray(values, dtype=float))
+
+        def log(values):
+            return torch.log(torch.clamp(values, min=TINY))
+
+        # Parameter direplikasi per baris: gradien baris n hanya dari posterior baris n.
+        # Skor hanya untuk edge yang ada, bentuk (n, E)
+        prior = as_tensor(model.prior).expand(n, -1).clone().requires_grad_()
+        skor = as_tensor(model.link[symptom, disease]).expand(n, -1).clone().requires_grad_()
+        leak = as_tensor(model.leak).expand(n, -1).clone().requires_grad_()
+
+        pos = as_tensor(present)
+        neg = as_tensor(absent)
+        single = as_tensor(self._single)
+
+        log_a = log(1.0 - prior) + (pos * log(leak)) @ single + (neg * log(1.0 - leak)) @ single
+        # Suku per edge lalu dijumlahkan ke penyakitnya
+        edge_terms = (pos[:, symptom] * as_tensor(self._single_edge) * log(skor)
+                      + neg[:, symptom] * log(1.0 - skor))
+        log_b = log(prior).index_add(1, torch.as_tensor(disease), edge_terms)
+
+        # Pergeseran konstan per baris tidak mengubah posterior
+        shift = torch.maximum(log_a, log_b).detach()
+        a = torch.exp(log_a - shift)
+        b = torch.exp(log_b - shift)
+
+        coefs, multipliers = self._pattern_terms(torch, pattern, skor, leak)
+        present_part = b[:, None, :] * multipliers
+        factors = a[:, None, :] + present_part
+        likelihood = (coefs * factors.prod(dim=2)).sum(dim=1)
+        joint = torch.einsum('nc,ncd->nd', coefs, present_part * _exclusive_prod(torch, factors))
+        return (prior, skor, leak), joint / likelihood[:, None]
+
+    def _chunk(self, torch, present, absent, patterns, inverse):
+        """Posterior dan Jacobian untuk satu blok baris"""
+        model = self.model
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(inverse, minlength=len(patterns)))[:-1])
+
+        leaves = []
+        posteriors = []
+        for pattern, rows in zip(patterns, groups):
+            params, posterior = self._group_posterior(torch, pattern, present[rows], absent[rows])
+            leaves.extend(params)
+            posteriors.append(posterior)
+        posterior = torch.cat(posteriors)
+
+        # Satu backward pass terbatch: satu vektor basis per penyakit output
+        basis = torch.eye(model.n_diseases, dtype=torch.float64)[:, None, :]
+        grads = torch.autograd.grad(posterior, leaves, is_grads_batched=True,
+                                    grad_outputs=basis.expand(-1, len(order), -1))
+        d_prior = torch.cat(grads[0::3], dim=1)
+        d_skor = torch.cat(grads[1::3], dim=1)
+        d_leak = torch.cat(grads[2::3], dim=1)
+
+        # Kembalikan ke urutan baris semula; (output, baris, ...) -> (baris, output, ...)
+        restore = torch.as_tensor(np.argsort(order))
+        return (posterior.detach()[restore].numpy(),
+                d_skor.transpose(0, 1)[restore].numpy(),
+                d_prior.transpose(0, 1)[restore].numpy(),
+                d_leak.transpose(0, 1)[restore].numpy())
+
+    def derivatives(self, evidence, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Posterior dan turunannya untuk setiap baris evidence
+
+        Args:
+            evidence (array-like): Bentuk (N, S) dengan nilai 1 / 0 / -1 (atau NaN)
+            chunk_size (int): Jumlah baris maksimum per backward pass (diperkecil oleh
+                              chunk_rows bila Jacobian blok terlalu besar)
+
+        Raises:
+            ImportError: Jika torch tidak terpasang
+            ValueError: Jika bentuk evidence salah atau suku Quickscore terlalu banyak
+
+        Returns:
+            dict: 'posterior' (N, D), 'skor' (N, D, E) turunan terhadap skor self.edges,
+                  'prior' (N, D, D), 'leak' (N, D, S) per gejala, dan 'leak_total' (N, D)
+                  terhadap leak bersama; NaN untuk evidence berprobabilitas nol
+        """
+        import torch
+
+        model = self.model
+        present, absent = _normalize_evidence(evidence, model.n_symptoms)
+
+        coupled = np.where(present, PRESENT, np.where(absent, ABSENT, UNOBSERVED))
+        coupled = coupled[:, self.coupled_symptoms]
+
+        chunk_size = self.chunk_rows(chunk_size)
+        parts = []
+        for start in range(0, len(present), chunk_size):
+            block = slice(start, start + chunk_size)
+            patterns, inverse = np.unique(coupled[block], axis=0, return_inverse=True)
+            parts.append(self._chunk(torch, present[block], absent[block],
+                                     patterns, inverse.reshape(-1)))
+
+        posterior, d_skor, d_prior, d_leak = (np.concatenate(arrays) for arrays in zip(*parts))
+        return {
+            'posterior': posterior,
+            'skor': d_skor,
+            'prior': d_prior,
+            'leak': d_leak,
+            'leak_total': d_leak.sum(axis=2),
+        }
+
+    def parameters(self):
+        """
+        Deskripsi parameter sesuai urutan kolom parameter_matrix()
+
+        Returns:
+            list: Dict 'parameter' ('skor' / 'prior' / 'leak'), 'gejala', 'penyakit'
+        """
+        model = self.model
+        names = [{'parameter': 'skor', 'gejala': model.symptoms[i], 'penyakit': model.diseases[j]}
+                 for i, j in self.edges]
+        names += [{'parameter': 'prior', 'gejala': None, 'penyakit': d} for d in model.diseases]
+        names.append({'parameter': 'leak', 'gejala': None, 'penyakit': None})
+        return names
+
+    @staticmethod
+    def parameter_matrix(result):
+        """Gabungan turunan skor, prior, dan leak bersama, bentuk (N, D, E + D + 1)"""
+        return np.concatenate([result['skor'], result['prior'], result['leak_total'][:, :, None]],
+                              axis=2)
+
+    def ranked(self, result, row=0, disease=None, limit=DEFAULT_LIMIT):
+        """
+        Parameter yang paling menentukan posterior satu diagnosis
+
+        Args:
+            result (dict): Hasil derivatives()
+            row (int): Baris evidence
+            disease (str): Penyakit target, default diagnosis teratas baris tersebut
+            limit (int): Jumlah parameter (None untuk semua)
+
+        Returns:
+            list: Dict 'parameter', 'gejala', 'penyakit', 'turunan', urut |turunan| menurun
+        """
+        model = self.model
+        j = (int(np.nanargmax(result['posterior'][row])) if disease is None
+             else model.disease_index[disease])
+        values = self.parameter_matrix(result)[row, j]
+        order = np.argsort(-np.abs(np.nan_to_num(values)), kind='stable')[:limit]
+        names = self.parameters()
+        return [dict(names[k], turunan=float(values[k])) for k in order]
+
+    def aggregate(self, result, limit=DEFAULT_LIMIT):
+        """
+        Ringkasan batch: rata-rata |turunan| posterior diagnosis teratas tiap baris
+
+        Args:
+            result (dict): Hasil derivatives()
+            limit (int): Jumlah parameter (None untuk semua)
+
+        Returns:
+            list: Dict 'parameter', 'gejala', 'penyakit', 'rata_rata_mutlak',
+                  'maks_mutlak', urut rata-rata menurun
+        """
+        valid = ~np.isnan(result['posterior']).any(axis=1)
+        if not valid.any():
+            return []
+        top = np.nanargmax(result['posterior'][valid], axis=1)
+        values = np.abs(self.parameter_matrix(result)[valid][np.arange(len(top)), top])
+
+        mean = values.mean(axis=0)
+        peak = values.max(axis=0)
+        order = np.argsort(-mean, kind='stable')[:limit]
+        names = self.parameters()
+        return [dict(names[k], rata_rata_mutlak=float(mean[k]), maks_mutlak=float(peak[k]))
+                for k in order]
+
+
+def _describe(item):
+    if item['parameter'] == 'skor':
+        return f"skor {item['gejala']} -> {item['penyakit']}"
+    if item['parameter'] == 'prior':
+        return f"prior {item['penyakit']}"
+    return "leak"
+
+
+def main(argv=None):
+    from diagnosis.batch import read_records
+    from diagnosis.core import DEFAULT_RULE_PATH, load_model
+
+    parser = argparse.ArgumentParser(
+        description="Sensitivitas posterior terhadap skor rule, prior, dan leak")
+    parser.add_argument('input', help="File observasi (.csv atau .jsonl, format diagnosis.batch)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="File JSONL tabel per record (opsional)")
+    parser.add_argument('--rules', default=DEFAULT_RULE_PATH, help="Path rule_list.json")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT,
+                        help="Jumlah parameter per tabel")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    model = load_model(args.rules).noisy_or
+    vocabulary = model.vocabulary
+    records = []
+    for record_id, evidence, error in read_records(args.input):
+        if error:
+            logger.warning("Record %s dilewati: %s", record_id, error)
+        else:
+            records.append((record_id, evidence))
+    # Gejala di luar model diabaikan, seperti diagnosis.batch
+    states = vocabulary.state_matrix(
+        {s: v for s, v in evidence.items() if s in model.symptom_index} for _, evidence in records)
+
+    analysis = SensitivityAnalysis(model)
+    result = analysis.derivatives(states, args.chunk_size)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for row, (record_id, _) in enumerate(records):
+                if np.isnan(result['posterior'][row]).any():
+                    continue
+                ranking = analysis.ranked(result, row, limit=args.limit)
+                top = int(np.argmax(result['posterior'][row]))
+                f.write(json.dumps({'id': record_id, 'diagnosis': model.diseases[top],
+                                    'posterior': float(result['posterior'][row, top]),
+                                    'parameter': ranking}) + '\n')
+
+    writer = sys.stdout
+    writer.write(f"Sensitivitas diagnosis teratas atas {len(records)} record\n")
+    writer.write(f"{'parameter':<60} {'rata-rata |d|':>14} {'maks |d|':>10}\n")
+    for item in analysis.aggregate(result, args.limit):
+        writer.write(f"{_describe(item):<60} {item['rata_rata_mutlak']:>14.6f} "
+                     f"{item['maks_mutlak']:>10.6f}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""
+Layanan HTTP JSON (asyncio/tornado) untuk diagnosis tanpa Streamlit.
+
+Route:
+    POST /diagnosis  {"gejala": [...], "gejala_tidak_ada": [...], "top": 5, "tanaman": "tembakau"}
+                     (top 0 atau tidak diisi = semua penyakit)
+    GET  /tanaman    daftar tanaman (bundle model) yang tersedia
+    GET  /health     selalu 200 selama proses hidup
+    GET  /ready      200 hanya setelah model selesai dikompilasi di proses induk dan di
+                     setiap worker, selain itu 503
+    GET  /metrics    metrik telemetri format Prometheus (DIAGNOSIS_TELEMETRY=1): proses
+                     induk plus tahap dan counter yang dikirim balik worker; tanpa
+                     gauge posterior cache karena jalur layanan tidak memakainya
+
+Request dengan evidence identik yang datang bersamaan digabung menjadi satu
+perhitungan. Inferensi dijalankan di process pool yang ukurannya terbatas;
+setiap worker punya registry sendiri. Model tanaman default dimuat di semua
+worker saat start; tanaman lain dimuat lazy saat pertama diminta.
+
+Contoh:
+    python -m diagnosis.service --port 8000 --workers 2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import tornado.web
+
+from diagnosis.artifact import DEFAULT_ARTIFACT_PATH
+from diagnosis.core import DEFAULT_RULE_PATH
+from diagnosis.evidence import build_evidence
+from diagnosis.registry import DEFAULT_BUNDLE_DIR, DEFAULT_CROP, ModelRegistry
+from diagnosis.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8000
+DEFAULT_MAX_PENDING = 64
+
+# Batas waktu menunggu semua worker selesai memuat model saat start (detik)
+WARM_UP_TIMEOUT = 600
+
+# Registry model dan barrier pemanasan per proses worker (diisi oleh _init_worker)
+_worker_registry = None
+_worker_barrier = None
+
+
+def _init_worker(bundles, memory_cap, barrier=None):
+    global _worker_registry, _worker_barrier
+    _worker_registry = ModelRegistry(bundles, memory_cap)
+    _worker_barrier = barrier
+
+
+def _warm_up(crop):
+    # Setiap tugas menunggu di barrier sampai semua worker memuat model, sehingga
+    # tugas pemanasan pasti tersebar satu per worker
+    try:
+        content_hash = _worker_registry.get(crop).content_hash
+    finally:
+        _worker_barrier.wait(WARM_UP_TIMEOUT)
+    return os.getpid(), content_hash, telemetry.drain()
+
+
+def _worker_posterior(crop, evidence_items):
+    # Nama penyakit ikut dikembalikan agar tetap cocok bila worker memakai versi rule lain;
+    # inferensi lewat subnetwork evidence (penyakit tak terkait = prior). Metrik worker
+    # ikut dikirim untuk digabung ke /metrics proses induk
+    diagnosis_model = _worker_registry.get(crop)
+    with telemetry.stage('worker.posterior'):
+        posterior = diagnosis_model.pruned.posterior_vector(dict(evidence_items))
+    return diagnosis_model.content_hash, list(zip(diagnosis_model.hama_penyakit_list,
+                                                  posterior.tolist())), telemetry.drain()
+
+
+class DiagnosisService:
+    """
+    Registry model, process pool, dan penggabungan request untuk layanan HTTP
+
+    Args:
+        rule_path (str): Path rule_list.json tanaman default
+        workers (int): Ukuran process pool
+        max_pending (int): Jumlah perhitungan maksimum yang berjalan bersamaan
+        bundle_dir (str): Folder bundle model tanaman lain (models/<tanaman>/)
+    """
+
+    def __init__(self, rule_path=DEFAULT_RULE_PATH, workers=None, max_pending=DEFAULT_MAX_PENDING,
+                 bundle_dir=DEFAULT_BUNDLE_DIR):
+        self.registry = ModelRegistry()
+        if os.path.isfile(rule_path):
+            # Artefak dicari di folder yang sama dengan rule, seperti bundle di discover
+            artifact_path = os.path.join(os.path.dirname(rule_path), DEFAULT_ARTIFACT_PATH)
+            self.registry.register(DEFAULT_CROP, rule_path, label='Tembakau',
+                                   artifact_path=artifact_path if os.path.isfile(artifact_path)
+                                   else None)
+        self.registry.discover(bundle_dir)
+        self.default_crop = DEFAULT_CROP if DEFAULT_CROP in self.registry.bundles \
+            else next(iter(self.registry.names()), None)
+        self.workers = workers or os.cpu_count() or 1
+        self.diagnosis_model = None
+        self._executor = None
+        self._inflight = {}
+        self._semaphore = asyncio.Semaphore(max_pending)
+
+    @property
+    def ready(self):
+        return self.diagnosis_model is not None
+
+    async def start(self):
+        """
+        Kompilasi model tanaman default di thread terpisah, lalu di setiap worker
+
+        Layanan baru ready setelah semua worker memuat model, sehingga request
+        pertama ke worker mana pun tidak membayar kompilasi.
+
+        Raises:
+            FileNotFoundError: Jika tidak ada bundle model tanaman
+            threading.BrokenBarrierError: Jika worker gagal memuat model dalam WARM_UP_TIMEOUT
+        """
+        if self.default_crop is None:
+            raise FileNotFoundError("Tidak ada bundle model tanaman yang ditemukan")
+        diagnosis_model = await self.model(self.default_crop)
+        barrier = multiprocessing.Barrier(self.workers)
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.registry.bundles,
+                                                       self.registry.memory_cap, barrier))
+        pids = await self._warm_workers(self.default_crop)
+        self.diagnosis_model = diagnosis_model
+        logger.info("Model %s siap (hash %s), %d worker", self.default_crop,
+                    diagnosis_model.content_hash[:12], len(pids))
+
+    async def _warm_workers(self, crop):
+        """Muat model crop di setiap worker; mengembalikan pid worker yang sudah siap"""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[loop.run_in_executor(self._executor, _warm_up, crop)
+                                         for _ in range(self.workers)])
+        for _, _, metrics in results:
+            telemetry.merge(metrics)
+        return sorted({pid for pid, _, _ in results})
+
+    async def model(self, crop):
+        """Model satu tanaman, dikompilasi di thread terpisah saat pertama dipakai"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.registry.get, crop)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    async def _compute(self, crop, evidence):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            content_hash, posterior, metrics = await loop.run_in_executor(
+                self._executor, _worker_posterior, crop, tuple(sorted(evidence.items())))
+        # Sekali per perhitungan, bukan per request yang digabung
+        telemetry.merge(metrics)
+        return content_hash, posterior
+
+    async def diagnose(self, evidence, crop=None, diagnosis_model=None):
+        """
+        Posterior semua penyakit; request identik yang bersamaan berbagi satu perhitungan
+
+        Args:
+            evidence (dict): Mapping gejala -> 1/0
+            crop (str): Nama tanaman, default tanaman default layanan
+            diagnosis_model (DiagnosisModel): Model tanaman yang sudah dimuat (opsional)
+
+        Raises:
+            ValueError: Jika evidence memuat gejala yang tidak ada di model
+
+        Returns:
+            tuple: (hash isi rule_list.json, dict nama penyakit -> posterior)
+        """
+        crop = crop or self.default_crop
+        if diagnosis_model is None:
+            diagnosis_model = await self.model(crop)
+        key = (crop, diagnosis_model.content_hash, diagnosis_model.vocabulary.encode(evidence))
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(crop, evidence))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            telemetry.count('service_coalesced')
+
+        content_hash, posterior = await asyncio.shield(future)
+        return content_hash, dict(posterior)
+
+
+def _symptom_list(body, key):
+    """Daftar nama gejala dari body request; ValueError bila bukan list string"""
+    symptoms = body.get(key, [])
+    if not isinstance(symptoms, list) or not all(isinstance(s, str) for s in symptoms):
+        raise ValueError(f"'{key}' harus berupa list nama gejala")
+    return symptoms
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def write_json(self, status, payload):
+        self.set_status(status)
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.finish(json.dumps(payload))
+
+
+class DiagnosisHandler(BaseHandler):
+    async def post(self):
+        if not self.service.ready:
+            return self.write_json(503, {'error': "Model belum siap"})
+
+        try:
+            body = json.loads(self.request.body or b'{}')
+            evidence = build_evidence(_symptom_list(body, 'gejala'),
+                                      _symptom_list(body, 'gejala_tidak_ada'))
+            top = int(body.get('top', 0))
+            if top < 0:
+                raise ValueError("'top' harus bilangan bulat >= 0")
+            crop = body.get('tanaman')
+            if crop is not None and not isinstance(crop, str):
+                raise ValueError("'tanaman' harus berupa nama tanaman")
+            crop = crop or self.service.default_crop
+        except (ValueError, TypeError, AttributeError) as e:
+            return self.write_json(400, {'error': str(e)})
+
+        if crop not in self.service.registry.bundles:
+            return self.write_json(404, {'error': "Tanaman tidak ditemukan", 'tanaman': crop,
+                                         'tersedia': self.service.registry.names()})
+        try:
+            diagnosis_model = await self.service.model(crop)
+        except (OSError, ValueError) as e:
+            return self.write_json(500, {'error': f"Gagal memuat model {crop}: {e}"})
+
+        known = diagnosis_model.noisy_or.symptom_index
+        unknown = [symptom for symptom in evidence if symptom not in known]
+        if unknown:
+            return self.write_json(400, {'error': "Gejala tidak ditemukan di model",
+                                         'gejala': unknown})
+        if not evidence:
+            return self.write_json(400, {'error': "Minimal satu gejala harus ditandai"})
+
+        telemetry.count('service_requests')
+        try:
+            with telemetry.stage('service.diagnosis'):
+                content_hash, posterior = await self.service.diagnose(evidence, crop, diagnosis_model)
+        except ValueError as e:
+            return self.write_json(422, {'error': str(e)})
+
+        ranked = sorted(posterior.items(), key=lambda x: x[1], reverse=True)[:top or None]
+        self.write_json(200, {
+            'tanaman': crop,
+            'model': content_hash,
+            'posterior': [{'nama': nama, 'probabilitas': prob} for nama, prob in ranked],
+        })
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write_json(200, {'status': 'ok'})
+
+
+class ReadyHandler(BaseHandler):
+    def get(self):
+        if self.service.ready:
+            self.write_json(200, {'status': 'ready',
+                                  'model': self.service.diagnosis_model.content_hash})
+        else:
+            self.write_json(503, {'status': 'starting'})
+
+
+class CropsHandler(BaseHandler):
+    def get(self):
+        registry = self.service.registry
+        loaded = set(registry.loaded())
+        self.write_json(200, {
+            'default': self.service.default_crop,
+            'tanaman': [{'nama': name, 'label': registry.label(name), 'dimuat': name in loaded}
+                        for name in registry.names()],
+        })
+
+
+class MetricsHandler(BaseHandler):
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.finish(telemetry.to_prometheus(include_cache=False))
+
+
+def make_app(service):
+    """Aplikasi tornado dengan semua route layanan"""
+    return tornado.web.Application([
+        (r'/diagnosis', DiagnosisHandler, {'service': service}),
+        (r'/health', HealthHandler, {'service': service}),
+        (r'/ready', ReadyHandler, {'service': service}),
+        (r'/tanaman', CropsHandler, {'service': service}),
+        (r'/metrics', MetricsHandler, {'service': service}),
+    ])
+
+
+async def serve(port=DEFAULT_PORT, rule_path=DEFAULT_RULE_PATH, workers=None,
+                max_pending=DEFAULT_MAX_PENDING, bundle_dir=DEFAULT_BUNDLE_DIR):
+    service = DiagnosisService(rule_path, workers, max_pending, bundle_dir)
+    server = make_app(service).listen(port)
+    logger.info("Layanan diagnosis berjalan di port %d", port)
+    try:
+        # Server sudah menerima request (/health, /ready = 503) selama model dikompilasi
+        await service.start()
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        service.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP diagnosis hama & penyakit tanaman")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--rules', default=DEFAULT_RULE_PATH,
+                        help="Path rule_list.json tanaman default (tembakau)")
+    parser.add_argument('--bundles', default=DEFAULT_BUNDLE_DIR,
+                        help="Folder bundle model tanaman lain (models/<tanaman>/)")
+    parser.add_argument('--workers', type=int, default=None, help="Ukuran process pool")
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help="Perhitungan maksimum yang berjalan bersamaan")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.port, args.rules, args.workers, args.max_pending, args.bundles))
+
+
+if __name__ == '__main__':
+    main()
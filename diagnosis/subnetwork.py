@@ -0,0 +1,182 @@
+"""
+Subnetwork yang relevan untuk satu evidence.
+
+Gejala yang tidak dicek adalah daun barren: tidak mempengaruhi posterior
+dan dapat dibuang. Penyakit yang bukan parent gejala teramati juga tidak
+terpengaruh evidence (posteriornya sama dengan prior). Subnetwork hanya
+memuat gejala teramati, parent-nya, dan variabel query, sehingga biaya
+inferensi mengikuti jumlah gejala yang ditandai, bukan ukuran ontologi.
+
+Subnetwork hanya bergantung pada gejala mana yang teramati (bukan
+statusnya), sehingga dapat di-cache dengan kunci bitset gejala teramati
+dari Vocabulary. PrunedInference membungkus cache
+itu dengan antarmuka yang sama seperti QuickscoreInference (model lengkap,
+posterior_vector dengan indeks penyakit jaringan lengkap).
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from diagnosis.evidence import observed_evidence
+from diagnosis.noisy_or import NoisyOrModel
+from diagnosis.quickscore import DEFAULT_MAX_TERMS, QuickscoreInference
+
+DEFAULT_SUBNETWORK_CACHE_SIZE = 256
+
+
+class Subnetwork:
+    """
+    Jaringan noisy-OR terpangkas untuk satu himpunan gejala teramati
+
+    Args:
+        model (NoisyOrModel): Jaringan lengkap
+        symptoms (iterable): Gejala teramati
+        query (iterable): Penyakit yang tetap disertakan walau tidak terkait evidence
+        max_terms (int): Batas jumlah suku inklusi-eksklusi per query
+
+    Raises:
+        ValueError: Jika ada gejala yang tidak ada di model
+    """
+
+    def __init__(self, model, symptoms, query=(), max_terms=DEFAULT_MAX_TERMS):
+        unknown = [s for s in symptoms if s not in model.symptom_index]
+        if unknown:
+            raise ValueError(f"Gejala tidak ada di model: {', '.join(unknown)}")
+
+        self.parent = model
+        rows = sorted(model.symptom_index[s] for s in symptoms)
+        observed, _ = model.vocabulary.encode(dict.fromkeys(symptoms, 1))
+        keep = model.vocabulary.related_mask(observed)
+        keep[[model.disease_index[d] for d in query]] = True
+        # Indeks penyakit subnetwork di jaringan lengkap
+        self.disease_index = np.flatnonzero(keep)
+
+        cols = self.disease_index
+        self.model = NoisyOrModel(
+            [model.diseases[j] for j in cols],
+            [model.symptoms[i] for i in rows],
+            model.prior[cols],
+            model.link[np.ix_(rows, cols)],
+            model.mask[np.ix_(rows, cols)],
+            model.leak[rows],
+        )
+        self.engine = QuickscoreInference(self.model, max_terms)
+
+    @property
+    def nbytes(self):
+        """Perkiraan memori jaringan terpangkas (byte)"""
+        return self.model.nbytes + self.disease_index.nbytes
+
+    def posterior_vector(self, evidence, index=None):
+        """
+        Posterior penyakit jaringan lengkap; yang di luar subnetwork = prior
+
+        Args:
+            evidence (dict): Mapping gejala -> 1/0, gejalanya sesuai subnetwork ini
+            index (array-like): Indeks penyakit jaringan lengkap yang dihitung saja (opsional)
+
+        Returns:
+            np.ndarray: Posterior dengan urutan diseases jaringan lengkap, atau urutan index
+        """
+        if index is None:
+            posterior = self.parent.prior.copy()
+            if len(self.disease_index):
+                posterior[self.disease_index] = self.engine.posterior_vector(evidence)
+            return posterior
+
+        index = np.asarray(index, dtype=int)
+        posterior = self.parent.prior[index].copy()
+        # Posisi tiap indeks di subnetwork (disease_index terurut naik)
+        position = np.searchsorted(self.disease_index, index)
+        inside = position < len(self.disease_index)
+        inside[inside] = self.disease_index[position[inside]] == index[inside]
+        if inside.any():
+            posterior[inside] = self.engine.posterior_vector(evidence, index=position[inside])
+        return posterior
+
+
+class PrunedInference:
+    """
+    Inferensi Quickscore yang memangkas ke subnetwork evidence di setiap query
+
+    Antarmukanya sama dengan QuickscoreInference di atas jaringan lengkap
+    (model, posterior_vector, query), sehingga dapat dipakai oleh top_k,
+    layanan HTTP, dan diagnosis massal. Subnetwork di-cache per bitset
+    gejala teramati.
+
+    Args:
+        model (NoisyOrModel): Jaringan lengkap
+        vocabulary (Vocabulary): Vocabulary model, default model.vocabulary
+        max_terms (int): Batas jumlah suku inklusi-eksklusi per query
+        cache_size (int): Jumlah subnetwork terkompilasi yang disimpan (LRU)
+    """
+
+    def __init__(self, model, vocabulary=None, max_terms=DEFAULT_MAX_TERMS,
+                 cache_size=DEFAULT_SUBNETWORK_CACHE_SIZE):
+        self.model = model
+        self.vocabulary = vocabulary or model.vocabulary
+        self.max_terms = max_terms
+        self.cache_size = cache_size
+        self._subnetworks = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Perkiraan memori subnetwork yang sedang di-cache (byte)"""
+        with self._lock:
+            return sum(subnetwork.nbytes for subnetwork in self._subnetworks.values())
+
+    def subnetwork(self, evidence):
+        """
+        Subnetwork relevan evidence, di-cache per bitset gejala teramati
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+
+        Raises:
+            ValueError: Jika evidence memuat gejala yang tidak ada di model
+
+        Returns:
+            Subnetwork: Jaringan terpangkas beserta mesin inferensinya
+        """
+        present, absent = self.vocabulary.encode(evidence)
+        observed = present | absent
+
+        with self._lock:
+            if observed in self._subnetworks:
+                self._subnetworks.move_to_end(observed)
+                return self._subnetworks[observed]
+
+        # Kompilasi di luar lock agar query lain tidak menunggu
+        subnetwork = Subnetwork(self.model, self.vocabulary.symptom_names(observed),
+                                max_terms=self.max_terms)
+
+        with self._lock:
+            self._subnetworks[observed] = subnetwork
+            self._subnetworks.move_to_end(observed)
+            while len(self._subnetworks) > self.cache_size:
+                self._subnetworks.popitem(last=False)
+        return subnetwork
+
+    def posterior_vector(self, evidence, index=None):
+        """
+        Posterior penyakit jaringan lengkap lewat subnetwork evidence
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+            index (array-like): Indeks penyakit yang dihitung saja (opsional)
+
+        Raises:
+            ValueError: Jika gejala tidak ada di model atau posterior tidak dapat dihitung
+
+        Returns:
+            np.ndarray: Posterior dengan urutan model.diseases, atau urutan index jika diberikan
+        """
+        # Gejala tidak dicek tidak ada di subnetwork: buang sebelum diteruskan
+        evidence = observed_evidence(evidence)
+        return self.subnetwork(evidence).posterior_vector(evidence, index)
+
+    def query(self, evidence):
+        """Mapping nama penyakit -> P(penyakit=1 | evidence)"""
+        return dict(zip(self.model.diseases, self.posterior_vector(evidence).tolist()))
@@ -0,0 +1,244 @@
+"""
+Telemetri ringan: durasi per tahap, counter, ukuran model, dan statistik cache.
+
+Nonaktif secara default. Saat nonaktif, stage() mengembalikan context
+manager kosong yang sama setiap kali dan count()/gauge() langsung kembali,
+sehingga overhead-nya dapat diabaikan. Aktifkan dengan environment
+variable DIAGNOSIS_TELEMETRY=1 atau telemetry.enable().
+
+Ekspor dalam format teks Prometheus (to_prometheus) atau satu baris JSON
+per snapshot (write_jsonl). Proses worker mengirim metriknya ke proses
+induk lewat drain() bersama setiap hasil, lalu digabung dengan merge(). Mode profiling opsional menulis data cProfile
+(.prof, dapat dibuka dengan snakeviz atau diubah ke flame graph dengan
+flameprof) untuk satu diagnosis.
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from diagnosis.cache import posterior_cache
+
+TELEMETRY_ENV = 'DIAGNOSIS_TELEMETRY'
+TELEMETRY_FILE_ENV = 'DIAGNOSIS_TELEMETRY_FILE'
+PROFILE_ENV = 'DIAGNOSIS_PROFILE'
+DEFAULT_TELEMETRY_FILE = 'telemetry.jsonl'
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    """Context manager yang mencatat durasi satu tahap"""
+
+    __slots__ = ('telemetry', 'name', 'start')
+
+    def __init__(self, telemetry, name):
+        self.telemetry = telemetry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.telemetry.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Telemetry:
+    """
+    Pengumpul metrik dalam proses
+
+    Args:
+        enabled (bool): Aktifkan pencatatan sejak awal
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Hapus semua metrik yang sudah tercatat"""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def stage(self, name):
+        """
+        Context manager pencatat durasi tahap
+
+        Args:
+            name (str): Nama tahap, mis. 'load_json' atau 'inference.quickscore'
+
+        Returns:
+            Context manager (kosong jika telemetri nonaktif)
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        """Catat satu durasi tahap dalam detik"""
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def count(self, name, value=1):
+        """Tambah counter, mis. jumlah query"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """Set nilai terakhir sebuah gauge, mis. ukuran faktor model"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = value
+
+    def drain(self):
+        """
+        Ambil lalu kosongkan metrik yang tercatat sejak drain terakhir
+
+        Dipakai proses worker untuk mengirim metriknya bersama hasil ke proses induk.
+
+        Returns:
+            dict: 'stages', 'counters', 'gauges', atau None jika telemetri nonaktif
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            delta = {'stages': self._stages, 'counters': self._counters, 'gauges': self._gauges}
+            self._stages, self._counters, self._gauges = {}, {}, {}
+        return delta
+
+    def merge(self, delta):
+        """Gabungkan hasil drain() dari proses lain (durasi dan counter dijumlah)"""
+        if not self.enabled or not delta:
+            return
+        with self._lock:
+            for name, other in delta['stages'].items():
+                stats = self._stages.get(name)
+                if stats is None:
+                    self._stages[name] = dict(other)
+                    continue
+                stats['count'] += other['count']
+                stats['total_seconds'] += other['total_seconds']
+                stats['max_seconds'] = max(stats['max_seconds'], other['max_seconds'])
+            for name, value in delta['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+            self._gauges.update(delta['gauges'])
+
+    def snapshot(self):
+        """
+        Salinan semua metrik saat ini
+
+        Returns:
+            dict: 'timestamp', 'stages', 'counters', 'gauges', 'cache'
+        """
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'stages': {name: dict(stats) for name, stats in self._stages.items()},
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'cache': posterior_cache.stats(),
+            }
+
+    def to_prometheus(self, prefix='diagnosis', include_cache=True):
+        """
+        Metrik dalam format teks eksposisi Prometheus
+
+        Args:
+            prefix (str): Prefix nama metrik
+            include_cache (bool): Sertakan gauge posterior_cache proses ini
+
+        Returns:
+            str: Teks metrik
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, stats in sorted(snapshot['stages'].items()):
+            label = f'{{stage="{name}"}}'
+            lines.append(f"{prefix}_stage_seconds_count{label} {stats['count']}")
+            lines.append(f"{prefix}_stage_seconds_sum{label} {stats['total_seconds']:.9f}")
+        lines.append(f"# TYPE {prefix}_stage_seconds_max gauge")
+        for name, stats in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_max{{stage="{name}"}} {stats["max_seconds"]:.9f}')
+
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+
+        if not include_cache:
+            return '\n'.join(lines) + '\n'
+        cache = snapshot['cache']
+        lines.append(f"# TYPE {prefix}_posterior_cache_hit_ratio gauge")
+        lines.append(f"{prefix}_posterior_cache_hit_ratio {cache['hit_ratio']:.6f}")
+        lines.append(f"# TYPE {prefix}_posterior_cache_size gauge")
+        lines.append(f"{prefix}_posterior_cache_size {cache['size']}")
+        return '\n'.join(lines) + '\n'
+
+    def write_jsonl(self, path=None):
+        """
+        Tambahkan satu snapshot sebagai baris JSON
+
+        Args:
+            path (str): File tujuan, default DIAGNOSIS_TELEMETRY_FILE atau telemetry.jsonl
+        """
+        path = path or os.environ.get(TELEMETRY_FILE_ENV, DEFAULT_TELEMETRY_FILE)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.snapshot()) + '\n')
+
+
+@contextmanager
+def _profiled(path):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def profile(path=None):
+    """
+    Profil cProfile untuk satu blok kode (mis. satu diagnosis)
+
+    Args:
+        path (str): File .prof tujuan, default dari DIAGNOSIS_PROFILE; tanpa path tidak memprofil
+
+    Returns:
+        Context manager
+    """
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path:
+        return _NULL_STAGE
+    return _profiled(path)
+
+
+# Telemetri bersama untuk seluruh proses
+telemetry = Telemetry(enabled=os.environ.get(TELEMETRY_ENV) == '1')
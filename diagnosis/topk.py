@@ -0,0 +1,172 @@
+"""
+Ranking top-k penyakit dengan batas posterior dan penghentian dini.
+
+Untuk setiap penyakit j, P(e | j=1) / P(e | j=0) adalah rata-rata berbobot
+dari perkalian rasio per gejala r_i(x) atas konfigurasi penyakit lain x.
+Setiap r_i dapat dibatasi dari skor dan leak gejala itu saja, sehingga
+perkalian batasnya memberi batas bawah/atas posterior yang sah tanpa
+ekspansi Quickscore:
+    gejala ada, tidak ada parent lain aktif : (1 - q_j) / leak
+    gejala ada, parent lain aktif (Q)       : (1 - q_j Q) / (1 - Q), naik terhadap Q
+    gejala tidak ada                        : antara q_j dan q_j / (1 - leak)
+
+Penyakit yang tidak berbagi gejala dengan evidence (lewat adjacency
+penyakit -> gejala) tidak terpengaruh evidence: posteriornya sama dengan
+prior. Hanya penyakit yang batasnya masih bisa masuk top-k yang dihitung
+eksak.
+"""
+import numpy as np
+
+from diagnosis.evidence import PRESENT, observed_evidence
+
+DEFAULT_TOP_K = 5
+
+
+def _ratio_bounds(q, leak, positive):
+    """Batas rasio likelihood gejala untuk setiap parent-nya: (lower, upper)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if not positive:
+            lower = q.copy()
+            upper = q / (1.0 - leak)
+            if len(q) == 1:
+                lower = upper
+            return lower, upper
+
+        none_active = (1.0 - q) / leak
+        if len(q) == 1:
+            return none_active, none_active
+
+        # Q untuk parent lain: perkalian semua (paling kecil) dan q terbesar (satu aktif)
+        q_all = np.array([np.prod(np.delete(q, j)) for j in range(len(q))])
+        q_max = np.array([np.max(np.delete(q, j)) for j in range(len(q))])
+        low_active = (1.0 - q * q_all) / (1.0 - q_all)
+        high_active = (1.0 - q * q_max) / (1.0 - q_max)
+        return np.fmin(none_active, low_active), np.fmax(none_active, high_active)
+
+
+def related_diseases(model, evidence):
+    """
+    Mask penyakit yang menjadi parent minimal satu gejala di evidence
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        evidence (dict): Mapping gejala -> 1/0
+
+    Returns:
+        np.ndarray: Mask boolean bentuk (D,)
+    """
+    vocabulary = model.vocabulary
+    present, absent = vocabulary.encode(
+        {symptom: state for symptom, state in evidence.items() if symptom in model.symptom_index})
+    return vocabulary.related_mask(present | absent)
+
+
+def posterior_bounds(model, evidence):
+    """
+    Batas bawah dan atas P(penyakit=1 | evidence) tanpa inferensi eksak
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+
+    Raises:
+        ValueError: Jika evidence memuat gejala yang tidak ada di model
+
+    Returns:
+        tuple: (lower, upper), masing-masing bentuk (D,) dengan urutan model.diseases
+    """
+    evidence = observed_evidence(evidence)
+    log_lower = np.zeros(model.n_diseases)
+    log_upper = np.zeros(model.n_diseases)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for symptom, state in evidence.items():
+            if symptom not in model.symptom_index:
+                raise ValueError(f"Gejala tidak ada di model: {symptom}")
+            factor = model.factors[model.symptom_index[symptom]]
+            lower, upper = _ratio_bounds(1.0 - factor.links, factor.leak, state == PRESENT)
+            log_lower[factor.parent_index] += np.log(lower)
+            log_upper[factor.parent_index] += np.log(upper)
+
+        # Posterior = 1 / (1 + (1 - prior) / (prior * rasio)), monoton naik terhadap rasio
+        log_odds = np.log(1.0 - model.prior) - np.log(model.prior)
+        lower = 1.0 / (1.0 + np.exp(log_odds - log_lower))
+        upper = 1.0 / (1.0 + np.exp(log_odds - log_upper))
+
+    # Kombinasi 0 * inf tidak memberi informasi
+    lower = np.where(np.isnan(lower), 0.0, lower)
+    upper = np.where(np.isnan(upper), 1.0, upper)
+
+    unrelated = ~related_diseases(model, evidence)
+    lower[unrelated] = upper[unrelated] = model.prior[unrelated]
+    return lower, upper
+
+
+def top_k(engine, evidence, k=DEFAULT_TOP_K, exact=True):
+    """
+    Ranking k penyakit teratas, hanya menghitung eksak yang masih mungkin masuk
+
+    Args:
+        engine (QuickscoreInference atau PrunedInference): Mesin inferensi eksak
+        evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+        k (int): Jumlah penyakit teratas
+        exact (bool): False untuk ranking dari batas saja tanpa inferensi eksak
+
+    Raises:
+        ValueError: Jika inferensi eksak gagal (lihat QuickscoreInference.posterior_vector)
+
+    Returns:
+        dict: 'ranking' (list nama top-k terurut), 'bounds' (nama -> (lower, upper)
+              untuk semua penyakit; lower == upper berarti eksak), 'gap' (selisih
+              terbesar upper di peringkat bawah dengan lower di atasnya; 0 berarti
+              ranking tersertifikasi), 'computed' (jumlah penyakit yang dihitung eksak)
+    """
+    model = engine.model
+    lower, upper = posterior_bounds(model, evidence)
+    k = min(k, model.n_diseases)
+
+    computed = 0
+    if exact and k > 0:
+        # Penyakit dengan upper di bawah lower ke-k tidak mungkin masuk top-k
+        threshold = np.sort(lower)[-k]
+        pending = np.flatnonzero((upper >= threshold) & (lower < upper))
+        if len(pending):
+            values = engine.posterior_vector(evidence, index=pending)
+            lower[pending] = upper[pending] = values
+            computed = len(pending)
+
+    order = np.lexsort((-upper, -lower))
+    # Upper terbesar di antara semua penyakit setelah setiap peringkat
+    after = np.append(np.maximum.accumulate(upper[order][::-1])[::-1][1:], -np.inf)
+    gap = float(max(0.0, np.max(after[:k] - lower[order[:k]], initial=0.0)))
+
+    return {
+        'ranking': [model.diseases[j] for j in order[:k]],
+        'bounds': {d: (float(lo), float(hi)) for d, lo, hi in zip(model.diseases, lower, upper)},
+        'gap': gap,
+        'computed': computed,
+    }
+
+
+def complete_posterior(engine, evidence, result):
+    """
+    Posterior eksak semua penyakit dari hasil top_k; hanya yang belum eksak dihitung
+
+    Args:
+        engine (QuickscoreInference atau PrunedInference): Mesin inferensi eksak
+        evidence (dict): Evidence yang sama dengan pemanggilan top_k
+        result (dict): Hasil top_k
+
+    Raises:
+        ValueError: Jika inferensi eksak gagal (lihat QuickscoreInference.posterior_vector)
+
+    Returns:
+        np.ndarray: Posterior dengan urutan model.diseases
+    """
+    diseases = engine.model.diseases
+    lower = np.array([result['bounds'][d][0] for d in diseases])
+    upper = np.array([result['bounds'][d][1] for d in diseases])
+    pending = np.flatnonzero(lower < upper)
+    if len(pending):
+        lower[pending] = engine.posterior_vector(evidence, index=pending)
+    return lower
@@ -0,0 +1,168 @@
+"""
+Inferensi noisy-OR tervektorisasi untuk banyak evidence sekaligus.
+
+Evidence berupa array 2-D: baris = observasi, kolom = gejala (urutan
+gejala_list), nilai PRESENT (1), ABSENT (0) atau UNOBSERVED (-1 / NaN).
+
+Gejala ber-parent tunggal dan bagian noisy-OR dari gejala negatif diserap
+ke bobot per penyakit dengan perkalian matriks di ruang log. Baris lalu
+dikelompokkan berdasarkan pola state gejala ber-parent banyak; setiap
+kelompok berbagi suku inklusi-eksklusi Quickscore yang sama.
+"""
+import numpy as np
+
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED
+from diagnosis.quickscore import DEFAULT_MAX_TERMS, count_terms, expand_terms
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _log_and_zeros(values):
+    """Pisahkan log dari nilai nol: (log dengan nol diganti 0, indikator nol)"""
+    values = np.asarray(values, dtype=float)
+    zeros = values <= 0
+    return np.log(np.where(zeros, 1.0, values)), zeros.astype(float)
+
+
+def _normalize_evidence(evidence, n_symptoms):
+    """Ubah evidence menjadi mask present/absent berbentuk (N, S)"""
+    evidence = np.asarray(evidence, dtype=float)
+    if evidence.ndim == 1:
+        evidence = evidence[None, :]
+    if evidence.shape[1] != n_symptoms:
+        raise ValueError(f"Evidence harus memiliki {n_symptoms} kolom gejala, bukan {evidence.shape[1]}")
+    present = evidence == PRESENT
+    absent = evidence == ABSENT
+    return present, absent
+
+
+class VectorizedInference:
+    """
+    Posterior noisy-OR untuk matriks evidence tanpa loop per baris
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        max_terms (int): Batas jumlah suku inklusi-eksklusi per pola evidence
+    """
+
+    def __init__(self, model, max_terms=DEFAULT_MAX_TERMS):
+        self.model = model
+        self.max_terms = max_terms
+
+        n_parents = model.mask.sum(axis=1)
+        single = model.mask & (n_parents == 1)[:, None]
+        self.coupled_symptoms = np.flatnonzero(n_parents > 1)
+
+        leak = model.leak[:, None]
+        link = model.link
+
+        # Bobot P(penyakit=0): hanya gejala ber-parent tunggal yang menyumbang leak
+        self._absent_pos = _log_and_zeros(np.where(single, leak, 1.0))
+        self._absent_neg = _log_and_zeros(np.where(single, 1.0 - leak, 1.0))
+        # Bobot P(penyakit=1): link untuk positif tunggal, (1 - link) untuk semua negatif
+        self._present_pos = _log_and_zeros(np.where(single, link, 1.0))
+        self._present_neg = _log_and_zeros(np.where(model.mask, 1.0 - link, 1.0))
+
+        self._prior_absent = _log_and_zeros(1.0 - model.prior)
+        self._prior_present = _log_and_zeros(model.prior)
+
+    def _disease_weights(self, present, absent):
+        """Bobot (a, b) per baris dan penyakit, dinormalisasi agar maksimum 1, dan log faktor skalanya"""
+        present = present.astype(float)
+        absent = absent.astype(float)
+
+        def accumulate(prior, pos, neg):
+            log_w = prior[0] + present @ pos[0] + absent @ neg[0]
+            n_zero = prior[1] + present @ pos[1] + absent @ neg[1]
+            return np.where(n_zero > 0, -np.inf, log_w)
+
+        log_a = accumulate(self._prior_absent, self._absent_pos, self._absent_neg)
+        log_b = accumulate(self._prior_present, self._present_pos, self._present_neg)
+
+        shift = np.maximum(log_a, log_b)
+        shift = np.where(np.isfinite(shift), shift, 0.0)
+        return np.exp(log_a - shift), np.exp(log_b - shift), shift.sum(axis=1)
+
+    def _pattern_terms(self, pattern):
+        """Suku Quickscore untuk satu pola state gejala ber-parent banyak"""
+        model = self.model
+        coupled = []
+        for i, state in zip(self.coupled_symptoms, pattern):
+            if state == UNOBSERVED:
+                continue
+            parents = model.parent_index[i]
+            coupled.append((parents, 1.0 - model.link[i, parents], model.leak[i], state == PRESENT))
+
+        n_terms = count_terms(coupled)
+        if n_terms > self.max_terms:
+            raise ValueError(f"Pola evidence membutuhkan {n_terms} suku (batas {self.max_terms})")
+        return expand_terms(coupled, model.n_diseases)
+
+    @staticmethod
+    def _group_posterior(a, b, coefs, multipliers):
+        """Posterior dan log-likelihood (relatif skala bobot) untuk baris-baris dengan suku yang sama"""
+        present = b[:, None, :] * multipliers[None, :, :]
+        factors = a[:, None, :] + present
+
+        zero = factors <= 0
+        log_factors = np.log(np.where(zero, 1.0, factors))
+        log_total = log_factors.sum(axis=2)
+        zero_total = zero.sum(axis=2)
+
+        shift = np.where(zero_total == 0, log_total, -np.inf).max(axis=1, keepdims=True)
+        shift = np.where(np.isfinite(shift), shift, 0.0)
+
+        scaled = np.where(zero_total == 0, np.exp(log_total - shift), 0.0)
+        likelihood = scaled @ coefs
+
+        # Perkalian semua faktor kecuali penyakit itu sendiri
+        excl_zero = zero_total[:, :, None] - zero
+        excl = np.where(excl_zero == 0,
+                        np.exp(log_total[:, :, None] - log_factors - shift[:, :, None]), 0.0)
+        joint = np.einsum('ncd,c->nd', excl * present, coefs)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            posterior = joint / likelihood[:, None]
+            log_likelihood = np.where(likelihood > 0, np.log(likelihood), -np.inf) + shift[:, 0]
+        posterior[likelihood <= 0] = np.nan
+        return np.clip(posterior, 0.0, 1.0), log_likelihood
+
+    def posterior_matrix(self, evidence, chunk_size=DEFAULT_CHUNK_SIZE, with_likelihood=False):
+        """
+        Hitung posterior semua penyakit untuk setiap baris evidence
+
+        Args:
+            evidence (array-like): Bentuk (N, S) dengan nilai 1 / 0 / -1 (atau NaN)
+            chunk_size (int): Jumlah baris maksimum per blok perhitungan
+            with_likelihood (bool): Ikut kembalikan log P(evidence) per baris
+
+        Returns:
+            np.ndarray: Posterior bentuk (N, D), urutan kolom model.diseases;
+                        NaN untuk evidence yang probabilitasnya nol. Jika
+                        with_likelihood, tuple (posterior, log_likelihood bentuk (N,))
+        """
+        present, absent = _normalize_evidence(evidence, self.model.n_symptoms)
+        a, b, log_scale = self._disease_weights(present, absent)
+
+        states = np.full((present.shape[0], len(self.coupled_symptoms)), UNOBSERVED, dtype=np.int8)
+        states[present[:, self.coupled_symptoms]] = PRESENT
+        states[absent[:, self.coupled_symptoms]] = ABSENT
+
+        posterior = np.empty_like(a)
+        log_likelihood = log_scale.copy()
+        patterns, inverse = np.unique(states, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for p, pattern in enumerate(patterns):
+            coefs, multipliers = self._pattern_terms(pattern)
+            rows = np.flatnonzero(inverse == p)
+            # Batasi ukuran tensor (baris x suku x penyakit) per blok
+            step = max(1, chunk_size // len(coefs))
+            for start in range(0, len(rows), step):
+                block = rows[start:start + step]
+                posterior[block], group_likelihood = self._group_posterior(
+                    a[block], b[block], coefs, multipliers)
+                log_likelihood[block] += group_likelihood
+
+        if with_likelihood:
+            return posterior, log_likelihood
+        return posterior
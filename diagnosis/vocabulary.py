@@ -0,0 +1,160 @@
+"""
+Vocabulary terindeks untuk gejala dan penyakit, dengan evidence sebagai bitset.
+
+Setiap gejala dan penyakit mendapat indeks bilangan bulat yang stabil untuk
+satu versi rule_list.json (urutan NoisyOrModel). Evidence dikodekan sebagai
+pasangan bitset lebar tetap (mask gejala ada, mask gejala tidak ada) berupa
+int Python: hashable, murah dibandingkan, dan langsung dipakai sebagai kunci
+cache atau deduplikasi tanpa membangun frozenset nama.
+
+Adjacency penyakit <-> gejala disimpan sebagai bitset int per gejala
+(parent) dan per penyakit (anak), sehingga "penyakit mana yang tersentuh
+evidence ini" cukup OR bitset parent setiap gejala teramati.
+"""
+import numpy as np
+
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED
+
+
+def _pack_rows(mask):
+    """Baris mask boolean -> int Python per baris (bit j = kolom j)"""
+    packed = np.packbits(mask, axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+
+def bit_indices(bits):
+    """Indeks bit yang menyala, urut naik"""
+    indices = []
+    while bits:
+        low = bits & -bits
+        indices.append(low.bit_length() - 1)
+        bits ^= low
+    return indices
+
+
+class Vocabulary:
+    """
+    Indeks gejala/penyakit dan pengkodean evidence bitset untuk satu NoisyOrModel
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+
+    Attributes:
+        symptoms (list): Nama gejala per indeks
+        diseases (list): Nama penyakit per indeks
+    """
+
+    def __init__(self, model):
+        self.symptoms = model.symptoms
+        self.diseases = model.diseases
+        self.symptom_index = model.symptom_index
+        self.disease_index = model.disease_index
+
+        self._parents = _pack_rows(model.mask)
+        self._children = _pack_rows(model.mask.T)
+
+    @property
+    def nbytes(self):
+        """Perkiraan ukuran bitset adjacency (byte)"""
+        return sum((bits.bit_length() + 7) // 8 for bits in self._parents + self._children)
+
+    def encode(self, evidence):
+        """
+        Kodekan evidence sebagai bitset
+
+        Args:
+            evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada) / -1 (tidak dicek,
+                             dilewati)
+
+        Raises:
+            ValueError: Jika ada gejala yang tidak ada di model atau keadaan yang tidak dikenal
+
+        Returns:
+            tuple: (bitset gejala ada, bitset gejala tidak ada)
+        """
+        present = absent = 0
+        unknown = []
+        for symptom, state in evidence.items():
+            i = self.symptom_index.get(symptom)
+            if i is None:
+                unknown.append(symptom)
+            elif state == PRESENT:
+                present |= 1 << i
+            elif state == ABSENT:
+                absent |= 1 << i
+            elif state != UNOBSERVED:
+                raise ValueError(f"Keadaan gejala {symptom} tidak dikenal: {state!r}")
+        if unknown:
+            raise ValueError(f"Gejala tidak ada di model: {', '.join(unknown)}")
+        return present, absent
+
+    def decode(self, bits):
+        """
+        Kembalikan bitset evidence menjadi dict
+
+        Args:
+            bits (tuple): (bitset gejala ada, bitset gejala tidak ada)
+
+        Returns:
+            dict: Mapping gejala -> PRESENT/ABSENT, urut indeks gejala
+        """
+        present, absent = bits
+        evidence = {self.symptoms[i]: PRESENT for i in bit_indices(present)}
+        evidence.update({self.symptoms[i]: ABSENT for i in bit_indices(absent)})
+        return evidence
+
+    def symptom_names(self, bits):
+        """Nama gejala untuk satu bitset gejala"""
+        return [self.symptoms[i] for i in bit_indices(bits)]
+
+    def related(self, observed):
+        """
+        Bitset penyakit yang menjadi parent minimal satu gejala teramati
+
+        Args:
+            observed (int): Bitset gejala teramati (ada | tidak ada)
+
+        Returns:
+            int: Bitset penyakit
+        """
+        diseases = 0
+        for i in bit_indices(observed):
+            diseases |= self._parents[i]
+        return diseases
+
+    def related_mask(self, observed):
+        """Seperti related(), sebagai mask boolean bentuk (D,)"""
+        n_bytes = (len(self.diseases) + 7) // 8
+        packed = np.frombuffer(self.related(observed).to_bytes(n_bytes, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, count=len(self.diseases), bitorder='little').astype(bool)
+
+    def children(self, disease):
+        """Bitset gejala anak dari satu penyakit (nama atau indeks)"""
+        if isinstance(disease, str):
+            disease = self.disease_index[disease]
+        return self._children[disease]
+
+    def state_matrix(self, evidences):
+        """
+        Matriks evidence tiga keadaan dari beberapa dict evidence
+
+        Args:
+            evidences (iterable): Dict gejala -> 1 (ada) / 0 (tidak ada) / -1 (tidak dicek)
+
+        Raises:
+            ValueError: Jika ada gejala yang tidak ada di model atau keadaan yang tidak dikenal
+
+        Returns:
+            np.ndarray: int8 bentuk (N, S), PRESENT/ABSENT/UNOBSERVED
+        """
+        evidences = list(evidences)
+        states = np.full((len(evidences), len(self.symptoms)), UNOBSERVED, dtype=np.int8)
+        for row, evidence in enumerate(evidences):
+            unknown = [s for s in evidence if s not in self.symptom_index]
+            if unknown:
+                raise ValueError(f"Gejala tidak ada di model: {', '.join(unknown)}")
+            for symptom, state in evidence.items():
+                if state not in (PRESENT, ABSENT, UNOBSERVED):
+                    raise ValueError(f"Keadaan gejala {symptom} tidak dikenal: {state!r}")
+                states[row, self.symptom_index[symptom]] = state
+        return states
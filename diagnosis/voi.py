@@ -0,0 +1,114 @@
+"""
+Rekomendasi gejala yang sebaiknya dicek berikutnya (value of information).
+
+Setiap gejala kandidat yang belum dicek dievaluasi untuk kedua hasilnya
+(ada / tidak ada). Semua skenario disusun sebagai satu matriks evidence
+(baris dasar + 2 baris per kandidat) dan dihitung dalam satu kali jalan
+VectorizedInference: bobot penyakit berbagi perkalian matriks yang sama
+dan kandidat dengan pola gejala ber-parent banyak yang sama berbagi suku
+Quickscore. Probabilitas tiap hasil diambil dari rasio likelihood.
+
+Information gain dihitung atas penyakit teratas, dengan entropi sebagai
+jumlah entropi biner marginal tiap penyakit.
+"""
+import numpy as np
+
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED, observed_evidence
+from diagnosis.vocabulary import bit_indices
+
+DEFAULT_TOP_DISEASES = 5
+
+
+def _binary_entropy(p):
+    """Entropi biner (bit) elemen demi elemen; 0 untuk p = 0 atau 1"""
+    p = np.clip(p, 0.0, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = -(p * np.log2(p) + (1.0 - p) * np.log2(1.0 - p))
+    return np.nan_to_num(h)
+
+
+def candidate_symptoms(model, evidence, diseases):
+    """
+    Gejala belum dicek yang dapat mengubah posterior penyakit target
+
+    Gejala yang semua parent-nya tidak terkait evidence maupun penyakit
+    target memiliki information gain nol dan dilewati.
+
+    Args:
+        model (NoisyOrModel): Parameter jaringan noisy-OR
+        evidence (dict): Mapping gejala -> 1/0
+        diseases (array-like): Indeks penyakit target
+
+    Returns:
+        np.ndarray: Indeks gejala kandidat
+    """
+    vocabulary = model.vocabulary
+    present, absent = vocabulary.encode(evidence)
+    observed = present | absent
+
+    relevant = vocabulary.related(observed)
+    for j in diseases:
+        relevant |= 1 << int(j)
+
+    candidates = 0
+    for j in bit_indices(relevant):
+        candidates |= vocabulary.children(j)
+    return np.array(bit_indices(candidates & ~observed), dtype=int)
+
+
+def recommend_symptoms(vectorized, evidence, top_diseases=DEFAULT_TOP_DISEASES, limit=None):
+    """
+    Urutkan gejala yang belum dicek berdasarkan expected information gain
+
+    Args:
+        vectorized (VectorizedInference): Mesin inferensi tervektorisasi
+        evidence (dict): Mapping gejala -> 1 (ada) / 0 (tidak ada)
+        top_diseases (int): Jumlah penyakit teratas yang menjadi target
+        limit (int): Jumlah rekomendasi maksimum (None untuk semua)
+
+    Raises:
+        ValueError: Jika gejala tidak ada di model atau probabilitas evidence nol
+
+    Returns:
+        list: Dict 'gejala', 'gain' (bit), 'p_ada' (P(gejala ada | evidence)),
+              terurut dari gain terbesar
+    """
+    model = vectorized.model
+    evidence = observed_evidence(evidence)
+    unknown = [s for s in evidence if s not in model.symptom_index]
+    if unknown:
+        raise ValueError(f"Gejala tidak ada di model: {', '.join(unknown)}")
+
+    base = np.full(model.n_symptoms, UNOBSERVED, dtype=np.int8)
+    for symptom, state in evidence.items():
+        base[model.symptom_index[symptom]] = state
+
+    base_posterior, base_likelihood = vectorized.posterior_matrix(base, with_likelihood=True)
+    if not np.isfinite(base_likelihood[0]):
+        raise ValueError("Probabilitas evidence bernilai nol")
+
+    targets = np.argsort(-base_posterior[0], kind='stable')[:top_diseases]
+    candidates = candidate_symptoms(model, evidence, targets)
+    if len(candidates) == 0:
+        return []
+
+    # Baris 2k: kandidat k ada, baris 2k + 1: kandidat k tidak ada
+    scenarios = np.repeat(base[None, :], 2 * len(candidates), axis=0)
+    rows = np.arange(len(candidates))
+    scenarios[2 * rows, candidates] = PRESENT
+    scenarios[2 * rows + 1, candidates] = ABSENT
+
+    posterior, log_likelihood = vectorized.posterior_matrix(scenarios, with_likelihood=True)
+    outcome = np.exp(log_likelihood - base_likelihood[0]).reshape(-1, 2)
+    outcome = outcome / outcome.sum(axis=1, keepdims=True)
+
+    entropy_before = _binary_entropy(base_posterior[0, targets]).sum()
+    entropy_after = _binary_entropy(posterior[:, targets]).sum(axis=1).reshape(-1, 2)
+    gain = entropy_before - (outcome * entropy_after).sum(axis=1)
+
+    order = np.argsort(-gain, kind='stable')[:limit]
+    return [
+        {'gejala': model.symptoms[candidates[k]], 'gain': float(max(gain[k], 0.0)),
+         'p_ada': float(outcome[k, 0])}
+        for k in order
+    ]
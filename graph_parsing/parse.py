@@ -1,8 +1,10 @@
+import argparse
+import json
+import os
+import re
 import xml.etree.ElementTree as ET
 
-#load file .rdf
-tree = ET.parse("tobonto_rev.rdf")
-root = tree.getroot()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 namespaces = {
     "owl": "http://www.w3.org/2002/07/owl#",
@@ -11,95 +13,155 @@ namespaces = {
     "swrl": "http://www.w3.org/2003/11/swrl#"
 }
 
-#namespace tobonto
-ontology_ns = None
-for elem in root.iter():
-    if "terdiagnosis" in elem.tag:
-        ontology_ns = elem.tag.split("}")[0].strip("{")
-        break
+RDF_RESOURCE = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource"
+RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+RDF_TYPE = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}type"
+RDF_DESCRIPTION = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}Description"
+OWL_NAMED_INDIVIDUAL = "{http://www.w3.org/2002/07/owl#}NamedIndividual"
+RDFS_LABEL = "{http://www.w3.org/2000/01/rdf-schema#}label"
+SWRL_IMP = "http://www.w3.org/2003/11/swrl#Imp"
 
-ontology_ns = ontology_ns or "http://www.semanticweb.org/asus/ontologies/2025/11/tobonto"
 
+def extract_value(uri):
+    return uri.split('#')[-1] if uri else "Not found"
 
-#parsing individu
-gejala_relasi = []
 
-individual_elements = root.findall(".//owl:NamedIndividual", namespaces=namespaces)
-if not individual_elements:
-    individual_elements = root.findall(".//rdf:Description", namespaces=namespaces)
+def rule_sort_key(label):
+    # urutkan R001, R002, ..., R010 berdasarkan angka, bukan string
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', label)]
+
 
-for individual in individual_elements:
+#parsing individu
+def parse_individual(individual):
+    """Ambil pasangan (target, gejala) dari satu individu bertipe gejala"""
+    relasi = []
     tipe_tags = individual.findall(".//rdf:type", namespaces=namespaces)
     for t in tipe_tags:
-        tipe_val = t.attrib.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource", "")
+        tipe_val = t.attrib.get(RDF_RESOURCE, "")
         if tipe_val.endswith("gejala"):
-            gejala_nama = individual.attrib.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about", "").split("#")[-1]
-            terdiagnosis_tags = individual.findall(f".//{{{ontology_ns}}}terdiagnosis")
-            for t in terdiagnosis_tags:
-                target = t.attrib.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource", "").split("#")[-1]
-                gejala_relasi.append((target, gejala_nama))
+            gejala_nama = individual.attrib.get(RDF_ABOUT, "").split("#")[-1]
+            # tag terdiagnosis dicocokkan dari nama lokal, tanpa perlu namespace tobonto
+            for elem in individual.iter():
+                if elem.tag.endswith("}terdiagnosis"):
+                    target = elem.attrib.get(RDF_RESOURCE, "").split("#")[-1]
+                    relasi.append((target, gejala_nama))
+    return relasi
 
-# buat dictionary mapping target -> gejala-gejala
-individuals_dict = {}
-for target, gejala in gejala_relasi:
-    if target not in individuals_dict:
-        individuals_dict[target] = []
-    individuals_dict[target].append(gejala)
 
-# ubah ke list of dict
-individuals_list = [{"nama": nama, "gejala": gejala_list} for nama, gejala_list in individuals_dict.items()]
+#parsing SWRL-nya
+def parse_rule(target_rule, r_label):
+    """Ambil gejala, nama penyakit/hama, dan skor dari satu rule SWRL"""
+    individu_dict = {'rule': r_label}
 
+    # ambil gejala (dari argument2)
+    nama_gejala = target_rule.find(
+        ".//swrl:argument2[@rdf:resource]", namespaces=namespaces)
+    individu_dict['gejala'] = extract_value(
+        nama_gejala.get(RDF_RESOURCE)) if nama_gejala is not None else "Not found"
+
+    # ambil nama penyakit/hama (dari head)
+    nama_serangan = target_rule.find(
+        ".//swrl:head/rdf:Description/rdf:first/rdf:Description/swrl:argument1[@rdf:resource]",
+        namespaces=namespaces)
+    individu_dict['nama'] = extract_value(
+        nama_serangan.get(RDF_RESOURCE)) if nama_serangan is not None else "Not found"
 
-#parsing SWRL-nya
-rule_list = []
-r_value = 0
+    # ambil skor (float)
+    risk_value = target_rule.find(
+        ".//swrl:argument2[@rdf:datatype='http://www.w3.org/2001/XMLSchema#float']",
+        namespaces=namespaces)
+    individu_dict['skor'] = risk_value.text if risk_value is not None else "Not found"
 
-while r_value < 40:  #tobonto ada 29 rule
-    r_value += 1
-    r_label = f"R{r_value:03d}"
+    return individu_dict
+
+
+def is_rule(description):
+    """Rule SWRL adalah rdf:Description bertipe swrl:Imp"""
+    return any(child.tag == RDF_TYPE and child.attrib.get(RDF_RESOURCE) == SWRL_IMP
+               for child in description)
+
+
+def parse_ontology(rdf_path):
+    """
+    Parse file .rdf dalam satu kali jalan dengan iterparse
+
+    Setiap elemen tingkat atas diproses saat tag penutupnya dibaca lalu
+    dibuang dari memori, sehingga pemakaian memori tidak tumbuh dengan
+    ukuran ontologi. Rule SWRL diindeks berdasarkan rdfs:label.
+
+    Args:
+        rdf_path (str): Path file ontologi .rdf
+
+    Returns:
+        tuple: (rule_list, individuals_list)
+    """
+    gejala_relasi = []
+    rules_by_label = {}
+
+    root = None
+    depth = 0
+    for event, elem in ET.iterparse(rdf_path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        # elem adalah anak langsung dari root dan sudah lengkap
+        if elem.tag == OWL_NAMED_INDIVIDUAL:
+            gejala_relasi.extend(parse_individual(elem))
+        elif elem.tag == RDF_DESCRIPTION:
+            label_element = elem.find("rdfs:label", namespaces=namespaces)
+            if label_element is not None and label_element.text and is_rule(elem):
+                r_label = label_element.text
+                rules_by_label[r_label] = parse_rule(elem, r_label)
+            elif elem.attrib.get(RDF_ABOUT):
+                gejala_relasi.extend(parse_individual(elem))
+
+        # bebaskan elemen yang sudah diproses
+        root.clear()
+
+    # buat dictionary mapping target -> gejala-gejala
+    individuals_dict = {}
+    for target, gejala in gejala_relasi:
+        if target not in individuals_dict:
+            individuals_dict[target] = []
+        individuals_dict[target].append(gejala)
+
+    # ubah ke list of dict
+    individuals_list = [{"nama": nama, "gejala": gejala_list} for nama, gejala_list in individuals_dict.items()]
+
+    rule_list = [rules_by_label[label] for label in sorted(rules_by_label, key=rule_sort_key)]
+
+    return rule_list, individuals_list
+
+
+def write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekstrak rule dan individu dari ontologi .rdf")
+    parser.add_argument('rdf', nargs='?', default=os.path.join(BASE_DIR, "tobonto_rev.rdf"),
+                        help="Path file ontologi .rdf")
+    parser.add_argument('-o', '--out-dir', default=os.path.dirname(BASE_DIR),
+                        help="Folder output rule_list.json dan individuals_list.json; "
+                             "gunakan models/<tanaman> untuk bundle tanaman tambahan")
+    args = parser.parse_args(argv)
+
+    rule_list, individuals_list = parse_ontology(args.rdf)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    write_json(rule_list, os.path.join(args.out_dir, "rule_list.json"))
+    write_json(individuals_list, os.path.join(args.out_dir, "individuals_list.json"))
+
+    print(f"{len(individuals_list)} individu dan {len(rule_list)} rule ditulis ke {args.out_dir}")
 
-    individu_dict = {'rule': r_label}
 
-    # cari rule berdasarkan rdfs:label
-    target_rule = None
-    for description in root.findall(".//rdf:Description", namespaces=namespaces):
-        label_element = description.find("rdfs:label", namespaces=namespaces)
-        if label_element is not None and label_element.text == r_label:
-            target_rule = description
-            break
-
-    if target_rule is not None:
-        def extract_value(uri):
-            return uri.split('#')[-1] if uri else "Not found"
-
-        # ambil gejala (dari argument2)
-        nama_gejala = target_rule.find(
-            ".//swrl:argument2[@rdf:resource]", namespaces=namespaces)
-        individu_dict['gejala'] = extract_value(
-            nama_gejala.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource')) if nama_gejala is not None else "Not found"
-
-        # ambil nama penyakit/hama (dari head)
-        nama_serangan = target_rule.find(
-            ".//swrl:head/rdf:Description/rdf:first/rdf:Description/swrl:argument1[@rdf:resource]",
-            namespaces=namespaces)
-        individu_dict['nama'] = extract_value(
-            nama_serangan.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource')) if nama_serangan is not None else "Not found"
-
-        # ambil skor (float)
-        risk_value = target_rule.find(
-            ".//swrl:argument2[@rdf:datatype='http://www.w3.org/2001/XMLSchema#float']",
-            namespaces=namespaces)
-        individu_dict['skor'] = risk_value.text if risk_value is not None else "Not found"
-
-        rule_list.append(individu_dict)
-    else:
-        continue
-
-
-print("Individuals List:")
-for i in individuals_list:
-    print(i)
-
-print("\nRule List:")
-for r in rule_list:
-    print(r)
+if __name__ == "__main__":
+    main()
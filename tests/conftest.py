@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from diagnosis.core import load_model  # noqa: E402
+
+RULE_PATH = os.path.join(ROOT, 'rule_list.json')
+INDIVIDUALS_PATH = os.path.join(ROOT, 'individuals_list.json')
+
+
+@pytest.fixture(scope='session')
+def diagnosis_model():
+    return load_model(RULE_PATH, INDIVIDUALS_PATH)
+
+
+def random_evidence(symptoms, n_cases, max_observed=6, seed=0):
+    """Evidence acak (gejala ada / tidak ada) untuk uji kesetaraan antar mesin inferensi"""
+    rng = np.random.default_rng(seed)
+    cases = []
+    for _ in range(n_cases):
+        observed = rng.choice(symptoms, size=rng.integers(1, max_observed + 1), replace=False)
+        cases.append({str(s): int(rng.integers(2)) for s in observed})
+    return cases
@@ -0,0 +1,64 @@
+import json
+import shutil
+
+import numpy as np
+
+from conftest import INDIVIDUALS_PATH
+from diagnosis.artifact import load_artifact, save_artifact
+from diagnosis.core import file_hash
+
+EVIDENCE = {'Akar_busuk': 1, 'Daun_layu': 1, 'Batang_layu': 0}
+
+
+def test_save_load_round_trip(diagnosis_model, tmp_path):
+    path = str(tmp_path / 'model.npz')
+    save_artifact(diagnosis_model, path, INDIVIDUALS_PATH)
+
+    loaded = load_artifact(path, diagnosis_model.content_hash,
+                           individuals_hash=file_hash(INDIVIDUALS_PATH))
+
+    assert loaded is not None
+    assert loaded.hama_penyakit_list == diagnosis_model.hama_penyakit_list
+    assert loaded.gejala_list == diagnosis_model.gejala_list
+    assert loaded.individuals_list == diagnosis_model.individuals_list
+    for name in ('prior', 'link', 'mask', 'leak'):
+        np.testing.assert_array_equal(getattr(loaded.noisy_or, name),
+                                      getattr(diagnosis_model.noisy_or, name))
+    np.testing.assert_allclose(loaded.engine.posterior_vector(EVIDENCE),
+                               diagnosis_model.engine.posterior_vector(EVIDENCE), atol=1e-12)
+
+
+def test_edited_individuals_file_makes_artifact_stale(diagnosis_model, tmp_path):
+    individuals_path = str(tmp_path / 'individuals_list.json')
+    shutil.copy(INDIVIDUALS_PATH, individuals_path)
+    path = str(tmp_path / 'model.npz')
+    save_artifact(diagnosis_model, path, individuals_path)
+
+    with open(individuals_path, 'r', encoding='utf-8') as f:
+        individuals = json.load(f)
+    with open(individuals_path, 'w', encoding='utf-8') as f:
+        json.dump(individuals[:-1], f)
+
+    assert load_artifact(path, diagnosis_model.content_hash,
+                         individuals_hash=file_hash(individuals_path)) is None
+
+
+def test_invalid_arrays_are_rejected(diagnosis_model, tmp_path):
+    path = str(tmp_path / 'model.npz')
+    save_artifact(diagnosis_model, path, INDIVIDUALS_PATH)
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays['leak'] = arrays['leak'] + 2.0
+    np.savez(path, **arrays)
+
+    assert load_artifact(path, diagnosis_model.content_hash,
+                         individuals_hash=file_hash(INDIVIDUALS_PATH)) is None
+
+
+def test_truncated_file_is_rejected(diagnosis_model, tmp_path):
+    path = tmp_path / 'model.npz'
+    save_artifact(diagnosis_model, str(path), INDIVIDUALS_PATH)
+    path.write_bytes(path.read_bytes()[:200])
+
+    assert load_artifact(str(path), diagnosis_model.content_hash,
+                         individuals_hash=file_hash(INDIVIDUALS_PATH)) is None
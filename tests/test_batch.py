@@ -0,0 +1,97 @@
+import csv
+import json
+
+from diagnosis.batch import diagnose_records, read_records, write_results
+from diagnosis.subnetwork import PrunedInference
+
+
+def _run(path, engine, tmp_path):
+    output = str(tmp_path / 'hasil.csv')
+    write_results(diagnose_records(read_records(str(path)), engine=engine, workers=1),
+                  output, engine.model.diseases)
+    with open(output, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_conflicting_jsonl_record_does_not_abort_run(diagnosis_model, tmp_path):
+    path = tmp_path / 'observasi.jsonl'
+    path.write_text('\n'.join(json.dumps(item) for item in [
+        {'id': 'a', 'gejala': ['Akar_busuk']},
+        {'id': 'b', 'gejala': ['Daun_layu'], 'gejala_tidak_ada': ['Daun_layu']},
+        {'id': 'c', 'gejala_tidak_ada': ['Batang_layu']},
+    ]) + '\n', encoding='utf-8')
+
+    rows = _run(path, diagnosis_model.pruned, tmp_path)
+
+    assert [row['id'] for row in rows] == ['a', 'b', 'c']
+    assert 'Daun_layu' in rows[1]['error']
+    assert all(rows[1][d] == '' for d in diagnosis_model.hama_penyakit_list)
+    for row in (rows[0], rows[2]):
+        assert row['error'] == ''
+        assert all(0.0 <= float(row[d]) <= 1.0 for d in diagnosis_model.hama_penyakit_list)
+
+
+def test_invalid_csv_cell_is_reported_per_row(diagnosis_model, tmp_path):
+    path = tmp_path / 'observasi.csv'
+    path.write_text('id,Akar_busuk,Daun_layu\n1,1,\n2,mungkin,0\n3,0,1\n', encoding='utf-8')
+
+    rows = _run(path, diagnosis_model.pruned, tmp_path)
+
+    assert [row['error'] != '' for row in rows] == [False, True, False]
+    assert "'mungkin'" in rows[1]['error']
+
+
+def test_failed_inference_is_not_written_as_zeros(diagnosis_model, tmp_path):
+    path = tmp_path / 'observasi.jsonl'
+    path.write_text(json.dumps({'id': 'x', 'gejala': ['Akar_busuk', 'Daun_layu']}) + '\n',
+                    encoding='utf-8')
+    engine = PrunedInference(diagnosis_model.noisy_or, max_terms=1)
+
+    rows = _run(path, engine, tmp_path)
+
+    assert 'suku' in rows[0]['error']
+    assert all(rows[0][d] == '' for d in diagnosis_model.hama_penyakit_list)
+
+
+def test_unobserved_evidence_value_is_dropped(diagnosis_model, tmp_path):
+    path = tmp_path / 'observasi.jsonl'
+    path.write_text('\n'.join(json.dumps(item) for item in [
+        {'id': 'a', 'gejala': ['Akar_busuk'], 'evidence': {'Daun_layu': -1}},
+        {'id': 'b', 'gejala': ['Akar_busuk']},
+    ]) + '\n', encoding='utf-8')
+
+    records = list(read_records(str(path)))
+    rows = _run(path, diagnosis_model.pruned, tmp_path)
+
+    assert records[0][1] == {'Akar_busuk': 1}
+    assert rows[0]['error'] == ''
+    assert all(rows[0][d] == rows[1][d] for d in diagnosis_model.hama_penyakit_list)
+
+
+def test_evidence_value_outside_states_is_reported_per_row(diagnosis_model, tmp_path):
+    path = tmp_path / 'observasi.jsonl'
+    path.write_text('\n'.join(json.dumps(item) for item in [
+        {'id': 'a', 'evidence': {'Daun_layu': 7}},
+        {'id': 'b', 'evidence': {'Daun_layu': 1, 'Akar_busuk': 0}},
+    ]) + '\n', encoding='utf-8')
+
+    records = list(read_records(str(path)))
+    rows = _run(path, diagnosis_model.pruned, tmp_path)
+
+    assert records[1][1] == {'Daun_layu': 1, 'Akar_busuk': 0}
+    assert 'Daun_layu' in rows[0]['error'] and '7' in rows[0]['error']
+    assert all(rows[0][d] == '' for d in diagnosis_model.hama_penyakit_list)
+    assert rows[1]['error'] == ''
+
+
+def test_evidence_map_conflicting_with_lists_is_reported(diagnosis_model, tmp_path):
+    path = tmp_path / 'observasi.jsonl'
+    path.write_text('\n'.join(json.dumps(item) for item in [
+        {'id': 'a', 'gejala': ['Daun_layu'], 'evidence': {'Daun_layu': 0}},
+        {'id': 'b', 'gejala_tidak_ada': ['Akar_busuk'], 'evidence': {'Akar_busuk': 1}},
+    ]) + '\n', encoding='utf-8')
+
+    rows = _run(path, diagnosis_model.pruned, tmp_path)
+
+    assert 'Daun_layu' in rows[0]['error']
+    assert 'Akar_busuk' in rows[1]['error']
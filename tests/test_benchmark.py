@@ -0,0 +1,11 @@
+from diagnosis.benchmark import HEURISTICS, generate_rules, run_benchmark
+
+
+def test_benchmark_smoke_report():
+    results = run_benchmark(generate_rules(5, 10, 2), n_queries=5, batch_rows=10)
+
+    assert set(results) == {'model', 'build', 'single_query', 'batch'} | \
+        {f'junction_tree_{heuristic}' for heuristic in HEURISTICS}
+    assert results['model']['diseases'] == 5 and results['model']['symptoms'] == 10
+    assert results['single_query']['n'] == 5
+    assert results['batch']['rows'] == 10
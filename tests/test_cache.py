@@ -0,0 +1,71 @@
+from diagnosis.cache import PosteriorCache
+
+MODEL_A = ('hash-a', None)
+MODEL_B = ('hash-b', None)
+
+
+def _compute(calls):
+    def compute(evidence):
+        calls.append(dict(evidence))
+        return sum(evidence.values())
+    return compute
+
+
+def test_repeated_evidence_is_served_from_cache():
+    cache = PosteriorCache()
+    calls = []
+
+    first = cache.get_or_compute(MODEL_A, {'Akar_busuk': 1, 'Daun_layu': 0}, _compute(calls))
+    second = cache.get_or_compute(MODEL_A, {'Daun_layu': 0, 'Akar_busuk': 1}, _compute(calls))
+
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_ratio': 0.5, 'size': 1, 'maxsize': 1024}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PosteriorCache(maxsize=2)
+    calls = []
+    cache.get_or_compute(MODEL_A, {'a': 1}, _compute(calls))
+    cache.get_or_compute(MODEL_A, {'b': 1}, _compute(calls))
+    # Dipakai lagi: 'b' sekarang yang paling lama tidak dipakai
+    cache.get_or_compute(MODEL_A, {'a': 1}, _compute(calls))
+    cache.get_or_compute(MODEL_A, {'c': 1}, _compute(calls))
+
+    assert len(cache) == 2
+    cache.get_or_compute(MODEL_A, {'a': 1}, _compute(calls))
+    cache.get_or_compute(MODEL_A, {'b': 1}, _compute(calls))
+    assert calls == [{'a': 1}, {'b': 1}, {'c': 1}, {'b': 1}]
+
+
+def test_invalidate_drops_only_one_rule_version():
+    cache = PosteriorCache()
+    calls = []
+    cache.get_or_compute(MODEL_A, {'a': 1}, _compute(calls))
+    cache.get_or_compute(MODEL_B, {'a': 1}, _compute(calls))
+
+    cache.invalidate('hash-a')
+
+    assert len(cache) == 1
+    cache.get_or_compute(MODEL_B, {'a': 1}, _compute(calls))
+    cache.get_or_compute(MODEL_A, {'a': 1}, _compute(calls))
+    assert len(calls) == 3
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_stats_start_empty():
+    assert PosteriorCache(maxsize=8).stats() == {'hits': 0, 'misses': 0, 'hit_ratio': 0.0,
+                                                 'size': 0, 'maxsize': 8}
+
+
+def test_nbytes_counts_only_one_rule_version():
+    cache = PosteriorCache()
+    assert cache.nbytes() == 0
+    cache.get_or_compute(MODEL_A, {'a': 1}, lambda evidence: {'x': 0.5, 'y': 0.25})
+    cache.get_or_compute(MODEL_B, {'a': 1}, lambda evidence: [('x', 0.5)])
+
+    assert 0 < cache.nbytes('hash-a') < cache.nbytes()
+    assert cache.nbytes('hash-a') + cache.nbytes('hash-b') == cache.nbytes()
+    assert cache.nbytes('hash-c') == 0
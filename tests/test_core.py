@@ -0,0 +1,208 @@
+import copy
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import INDIVIDUALS_PATH, RULE_PATH
+from diagnosis import core
+from diagnosis.cache import PosteriorCache
+from diagnosis.core import DiagnosisModel
+from diagnosis.evidence import UNOBSERVED
+
+
+@pytest.fixture(scope='module')
+def rules():
+    with open(RULE_PATH, encoding='utf-8') as f:
+        rule_list = json.load(f)
+    with open(INDIVIDUALS_PATH, encoding='utf-8') as f:
+        individuals_list = json.load(f)
+    return rule_list, individuals_list
+
+
+def _add_new_disease_first(rule_list):
+    return [{'rule': 'R999', 'gejala': 'Akar_busuk', 'nama': 'Baru', 'skor': '0.4'}] + rule_list
+
+
+def _remove_first_disease(rule_list):
+    # Penyakit pertama hilang: semua kolom bergeser satu ke kiri
+    first = rule_list[0]['nama']
+    return [item for item in rule_list if item['nama'] != first]
+
+
+def _rescore(rule_list):
+    edited = copy.deepcopy(rule_list)
+    edited[3]['skor'] = '0.9'
+    return edited
+
+
+def _move_first_appearance(rule_list):
+    # Rule pertama penyakit pertama dipindah ke akhir: urutan kemunculan pertama berubah
+    edited = copy.deepcopy(rule_list)
+    first = edited[0]['nama']
+    index = [i for i, item in enumerate(edited) if item['nama'] == first]
+    for i in reversed(index):
+        edited.append(edited.pop(i))
+    return edited
+
+
+def _new_symptom(rule_list):
+    return rule_list + [{'rule': 'R998', 'gejala': 'Aaa_gejala_baru',
+                         'nama': rule_list[-1]['nama'], 'skor': '0.6'}]
+
+
+@pytest.mark.parametrize('edit', [_add_new_disease_first, _remove_first_disease, _rescore,
+                                  _move_first_appearance, _new_symptom])
+def test_incremental_update_equals_full_rebuild(rules, edit):
+    rule_list, individuals_list = rules
+    edited = edit(rule_list)
+    base = DiagnosisModel.from_rules(rule_list, individuals_list, 'lama')
+
+    incremental = base.with_rules(edited, individuals_list, 'baru')
+    full = DiagnosisModel.from_rules(edited, individuals_list, 'baru')
+
+    assert incremental is not None
+    a, b = incremental.noisy_or, full.noisy_or
+    assert a.diseases == b.diseases
+    assert a.symptoms == b.symptoms
+    np.testing.assert_array_equal(a.prior, b.prior)
+    np.testing.assert_array_equal(a.link, b.link)
+    np.testing.assert_array_equal(a.mask, b.mask)
+    np.testing.assert_array_equal(a.leak, b.leak)
+    for fa, fb in zip(a.factors, b.factors):
+        assert (fa.variable, fa.parents) == (fb.variable, fb.parents)
+        np.testing.assert_array_equal(fa.parent_index, fb.parent_index)
+        np.testing.assert_array_equal(fa.links, fb.links)
+
+    evidence = {'Akar_busuk': 1, 'Daun_layu': 0}
+    np.testing.assert_allclose(incremental.engine.posterior_vector(evidence),
+                               full.engine.posterior_vector(evidence), atol=1e-12)
+
+
+def test_rule_file_is_rehashed_only_when_its_stat_changes(rules, tmp_path, monkeypatch):
+    rule_list, individuals_list = rules
+    rule_path = tmp_path / 'rule_list.json'
+    rule_path.write_text(json.dumps(rule_list), encoding='utf-8')
+    (tmp_path / 'individuals_list.json').write_text(json.dumps(individuals_list),
+                                                    encoding='utf-8')
+    hashed = []
+    original = core.file_hash
+
+    def spy(path):
+        hashed.append(path)
+        return original(path)
+
+    monkeypatch.setattr(core, 'file_hash', spy)
+
+    first = core.load_model(str(rule_path))
+    assert core.load_model(str(rule_path)) is first
+    assert len(hashed) == 1
+
+    rule_path.write_text(json.dumps(_add_new_disease_first(rule_list)), encoding='utf-8')
+    assert core.load_model(str(rule_path)).content_hash != first.content_hash
+    assert len(hashed) == 2
+    core.clear_cache(str(rule_path))
+
+
+def test_evidence_over_the_quickscore_term_limit_is_not_exact():
+    # 13 gejala positif yang sama-sama dimiliki 2 penyakit: 3^13 suku > DEFAULT_MAX_TERMS,
+    # padahal exact_cost (suku x penyakit) masih di bawah MAX_EXACT_COST
+    symptoms = [f'G{i:02d}' for i in range(13)]
+    rule_list = [{'rule': f'R{d}{s}', 'gejala': s, 'nama': d, 'skor': '0.5'}
+                 for d in ('A', 'B') for s in symptoms]
+    diagnosis_model = DiagnosisModel.from_rules(rule_list, [], 'sintetis', priors={})
+    evidence = {s: 1 for s in symptoms}
+
+    assert diagnosis_model.exact_cost(evidence) <= core.MAX_EXACT_COST
+    assert not diagnosis_model.exact_feasible(evidence)
+    with pytest.raises(ValueError, match='suku'):
+        diagnosis_model.top_k(evidence, k=1)
+
+    result = diagnosis_model.approximate(evidence, n_samples=2000, seed=0)
+    assert set(result['posterior']) == {'A', 'B'}
+    assert diagnosis_model.exact_feasible(dict(list(evidence.items())[:5]))
+
+
+def test_compiling_one_model_does_not_block_loaded_ones(rules, tmp_path, monkeypatch):
+    rule_list, individuals_list = rules
+    paths = {}
+    for name in ('a', 'b'):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / 'rule_list.json').write_text(json.dumps(rule_list), encoding='utf-8')
+        (folder / 'individuals_list.json').write_text(json.dumps(individuals_list),
+                                                      encoding='utf-8')
+        paths[name] = str(folder / 'rule_list.json')
+    loaded = core.load_model(paths['a'])
+
+    started, release = threading.Event(), threading.Event()
+    compiled = []
+    original = core.DiagnosisModel.from_rules
+
+    def slow_from_rules(*args, **kwargs):
+        compiled.append(args)
+        started.set()
+        release.wait(10)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(core.DiagnosisModel, 'from_rules', slow_from_rules)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(core.load_model(paths['b'])))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(10)
+
+    # Model 'a' tetap dapat diambil selama 'b' dikompilasi
+    lookups = []
+    lookup = threading.Thread(target=lambda: lookups.append(core.load_model(paths['a'])))
+    lookup.start()
+    lookup.join(5)
+    assert lookups == [loaded]
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(compiled) == 1
+    assert results[0] is results[1]
+    for path in paths.values():
+        core.clear_cache(path)
+
+
+@pytest.mark.parametrize('backend', core.BACKENDS)
+def test_unobserved_symptoms_do_not_poison_posterior_cache(diagnosis_model, backend):
+    cache = PosteriorCache()
+    with_unobserved = {'Akar_busuk': 1, 'Bawah_daun_bercak_hitam': UNOBSERVED}
+
+    first = diagnosis_model.posteriors(with_unobserved, cache=cache, backend=backend)
+    second = diagnosis_model.posteriors({'Akar_busuk': 1}, cache=cache, backend=backend)
+
+    assert len(cache) == 1
+    assert first == second
+    if backend != 'likelihood_weighting':
+        expected = diagnosis_model.junction_tree().query({'Akar_busuk': 1})
+        assert second == pytest.approx(expected, abs=1e-10)
+
+
+def test_unobserved_symptoms_are_dropped_at_every_entry_point(diagnosis_model):
+    cache = PosteriorCache()
+    evidence = {'Akar_busuk': 1, 'Batang_layu': 0}
+    with_unobserved = dict(evidence, Bawah_daun_bercak_hitam=UNOBSERVED)
+
+    explained = diagnosis_model.explain(with_unobserved, cache=cache)
+    assert explained == diagnosis_model.explain(evidence, cache=PosteriorCache())
+    assert diagnosis_model.top_k(with_unobserved, cache=cache) == \
+        diagnosis_model.top_k(evidence, cache=PosteriorCache())
+    assert diagnosis_model.recommend(with_unobserved, cache=cache) == \
+        diagnosis_model.recommend(evidence, cache=PosteriorCache())
+    assert diagnosis_model.exact_cost(with_unobserved) == diagnosis_model.exact_cost(evidence)
+    assert diagnosis_model.approximate(with_unobserved, seed=0) == \
+        diagnosis_model.approximate(evidence, seed=0)
+
+
+def test_unknown_evidence_state_is_rejected(diagnosis_model):
+    for method in (diagnosis_model.posteriors, diagnosis_model.top_k, diagnosis_model.explain,
+                   diagnosis_model.recommend, diagnosis_model.approximate):
+        with pytest.raises(ValueError, match='Akar_busuk'):
+            method({'Akar_busuk': 7})
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from diagnosis.evidence import UNOBSERVED, observed_evidence
+from diagnosis.explain import explain_symptoms
+from diagnosis.junction_tree import JunctionTreeInference
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.sampling import LikelihoodWeighting
+from diagnosis.subnetwork import PrunedInference
+from diagnosis.topk import posterior_bounds
+from diagnosis.vectorized import VectorizedInference
+from diagnosis.voi import recommend_symptoms
+
+EVIDENCE = {'Akar_busuk': 1, 'Batang_layu': 0}
+# Gejala tidak dicek harus sama dengan gejala yang tidak disebut sama sekali
+WITH_UNOBSERVED = dict(EVIDENCE, Daun_layu=UNOBSERVED, Bawah_daun_bercak_hitam=UNOBSERVED)
+
+
+def test_observed_evidence_drops_unobserved_and_rejects_other_states():
+    assert observed_evidence(WITH_UNOBSERVED) == EVIDENCE
+    assert observed_evidence({'Akar_busuk': True}) == {'Akar_busuk': 1}
+    with pytest.raises(ValueError, match='Daun_layu'):
+        observed_evidence({'Daun_layu': 7})
+
+
+@pytest.mark.parametrize('engine', ['quickscore', 'junction_tree', 'pruned'])
+def test_exact_engines_ignore_unobserved_symptoms(diagnosis_model, engine):
+    model = diagnosis_model.noisy_or
+    engine = {'quickscore': QuickscoreInference, 'junction_tree': JunctionTreeInference,
+              'pruned': PrunedInference}[engine](model)
+
+    np.testing.assert_allclose(engine.posterior_vector(WITH_UNOBSERVED),
+                               engine.posterior_vector(EVIDENCE), atol=1e-12)
+    # Hanya gejala tidak dicek: posterior = prior
+    np.testing.assert_allclose(engine.posterior_vector({'Akar_busuk': UNOBSERVED}), model.prior,
+                               atol=1e-12)
+
+
+def test_sampling_and_bounds_ignore_unobserved_symptoms(diagnosis_model):
+    model = diagnosis_model.noisy_or
+
+    estimates = [LikelihoodWeighting(model, seed=0).estimate(evidence, n_samples=2000)['posterior']
+                 for evidence in (WITH_UNOBSERVED, EVIDENCE)]
+    np.testing.assert_array_equal(*estimates)
+    for with_unobserved, without in zip(posterior_bounds(model, WITH_UNOBSERVED),
+                                        posterior_bounds(model, EVIDENCE)):
+        np.testing.assert_array_equal(with_unobserved, without)
+
+
+def test_recommend_and_explain_ignore_unobserved_symptoms(diagnosis_model):
+    vectorized = VectorizedInference(diagnosis_model.noisy_or)
+
+    assert recommend_symptoms(vectorized, WITH_UNOBSERVED) == \
+        recommend_symptoms(vectorized, EVIDENCE)
+    assert explain_symptoms(vectorized, WITH_UNOBSERVED) == explain_symptoms(vectorized, EVIDENCE)
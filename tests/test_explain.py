@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from diagnosis.explain import explain_symptoms
+from diagnosis.quickscore import QuickscoreInference
+
+EVIDENCE = {'Akar_busuk': 1, 'Daun_layu': 1, 'Tanaman_kerdil': 0, 'Batang_layu': 0}
+
+
+def test_contributions_match_leave_one_out_quickscore(diagnosis_model):
+    model = diagnosis_model.noisy_or
+    engine = QuickscoreInference(model)
+    base = engine.posterior_vector(EVIDENCE)
+    without = {symptom: engine.posterior_vector({s: v for s, v in EVIDENCE.items() if s != symptom})
+               for symptom in EVIDENCE}
+
+    explanations = explain_symptoms(diagnosis_model.vectorized, EVIDENCE, top_diseases=3)
+
+    assert [e['penyakit'] for e in explanations] == \
+        [model.diseases[j] for j in np.argsort(-base, kind='stable')[:3]]
+    for explanation in explanations:
+        j = model.disease_index[explanation['penyakit']]
+        assert explanation['posterior'] == pytest.approx(base[j], abs=1e-12)
+        assert {c['gejala'] for c in explanation['kontribusi']} == set(EVIDENCE)
+        for item in explanation['kontribusi']:
+            p, q = base[j], without[item['gejala']][j]
+            assert item['ada'] == bool(EVIDENCE[item['gejala']])
+            assert item['posterior_tanpa'] == pytest.approx(q, abs=1e-12)
+            assert item['selisih'] == pytest.approx(p - q, abs=1e-12)
+            assert item['rasio'] == pytest.approx((p / (1 - p)) / (q / (1 - q)), rel=1e-9)
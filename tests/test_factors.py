@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from diagnosis.factors import MAX_EXPANDED_PARENTS, NoisyOrFactor
+
+
+def test_to_values_matches_enumerated_cpt():
+    factor = NoisyOrFactor('Daun_layu', ['A', 'B', 'C'], [0.9, 0.5, 0.2], leak=0.01)
+    values = factor.to_values()
+
+    assert values.shape == (2, 8)
+    for column, states in enumerate(itertools.product([0, 1], repeat=3)):
+        prob_absent = np.prod([1.0 - link for link, on in zip(factor.links, states) if on]) \
+            if any(states) else 1.0 - factor.leak
+        assert values[0, column] == pytest.approx(prob_absent)
+        assert values[1, column] == pytest.approx(1.0 - prob_absent)
+
+
+def test_to_values_refuses_too_many_parents():
+    n_parents = MAX_EXPANDED_PARENTS + 1
+    factor = NoisyOrFactor('Daun_layu', [f'P{i}' for i in range(n_parents)],
+                           np.full(n_parents, 0.5), leak=0.01)
+
+    with pytest.raises(ValueError, match='ditolak'):
+        factor.to_values()
+    with pytest.raises(ValueError, match='ditolak'):
+        factor.to_tabular_cpd()
+    assert factor.to_values(max_parents=n_parents).shape == (2, 2 ** n_parents)
+
+
+def test_size_report_sorted_by_table_size(diagnosis_model):
+    model = diagnosis_model.noisy_or
+    report = model.size_report()
+
+    assert len(report) == len(model.factors)
+    assert {row['symptom'] for row in report} == set(model.symptoms)
+    sizes = [row['table_size'] for row in report]
+    assert sizes == sorted(sizes, reverse=True)
+    for row in report:
+        assert row['compact_size'] == row['parents'] + 1
+        assert row['table_size'] == 2 ** (row['parents'] + 1)
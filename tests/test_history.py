@@ -0,0 +1,253 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import ROOT
+from diagnosis import history
+from diagnosis.core import DiagnosisModel
+from diagnosis.history import CLAIM_PREFIX, DiagnosisLog
+from diagnosis.noisy_or import DEFAULT_PRIOR
+from diagnosis.priors import PENYAKIT_PRIORS
+
+EVIDENCE = {'Akar_busuk': 1, 'Daun_layu': 1}
+
+
+def _rows(log):
+    import pyarrow.dataset as ds
+    log.flush()
+    return ds.dataset(log.files(), format='parquet').to_table().to_pylist()
+
+
+def _fill(log, diagnosis_model, n_rows, timestamp=0):
+    n = len(diagnosis_model.hama_penyakit_list)
+    for _ in range(n_rows):
+        log.append(diagnosis_model, EVIDENCE, np.full(n, 0.5), timestamp=timestamp)
+        log.flush()
+
+
+def _count(log):
+    return sum(period['jumlah'] for period in log.prevalence('tahun'))
+
+
+def test_prevalence_uses_exact_rows_only(diagnosis_model, tmp_path):
+    log = DiagnosisLog(str(tmp_path))
+    n = len(diagnosis_model.hama_penyakit_list)
+    log.append(diagnosis_model, EVIDENCE, np.full(n, 0.2), timestamp=0)
+    log.append(diagnosis_model, EVIDENCE, np.full(n, 0.6), timestamp=0, exact=False)
+
+    [exact] = log.prevalence('tahun')
+    assert exact['jumlah'] == 1
+    assert all(value == pytest.approx(0.2) for value in exact['prevalensi'].values())
+
+    [both] = log.prevalence('tahun', include_approximate=True)
+    assert both['jumlah'] == 2
+    assert all(value == pytest.approx(0.4) for value in both['prevalensi'].values())
+
+
+def test_app_logs_exact_posterior_vector(diagnosis_model, tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(history.diagnosis_log, 'directory', str(tmp_path))
+    monkeypatch.setattr(history.diagnosis_log, 'enabled', True)
+
+    at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+    for symptom in EVIDENCE:
+        at.radio(key=f"symptom_tembakau_{symptom}_0").set_value("Ada").run()
+    at.button(key="submit_tembakau").click().run()
+    assert not at.exception
+
+    [row] = _rows(history.diagnosis_log)
+    assert row['exact'] is True
+    np.testing.assert_allclose(row['posterior'],
+                               diagnosis_model.engine.posterior_vector(EVIDENCE), atol=1e-12)
+
+
+@pytest.mark.parametrize('enabled', [True, False])
+def test_app_ranks_top_k_once_per_submit(tmp_path, monkeypatch, enabled):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(history.diagnosis_log, 'directory', str(tmp_path))
+    monkeypatch.setattr(history.diagnosis_log, 'enabled', enabled)
+    calls = []
+
+    def spy(name):
+        original = getattr(DiagnosisModel, name)
+
+        def method(self, *args, **kwargs):
+            calls.append(name)
+            return original(self, *args, **kwargs)
+        return method
+
+    for name in ('posteriors', 'top_k'):
+        monkeypatch.setattr(DiagnosisModel, name, spy(name))
+
+    at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+    for symptom in EVIDENCE:
+        at.radio(key=f"symptom_tembakau_{symptom}_0").set_value("Ada").run()
+    at.button(key="submit_tembakau").click().run()
+    assert not at.exception
+
+    # Tampilan selalu lewat top-k; log aktif hanya melengkapi penyakit yang belum eksak
+    assert calls == ['top_k']
+    if enabled:
+        [row] = _rows(history.diagnosis_log)
+        assert row['exact'] is True
+
+
+def test_buffered_rows_are_flushed_without_another_append(diagnosis_model, tmp_path):
+    log = DiagnosisLog(str(tmp_path), flush_seconds=0.1)
+    n = len(diagnosis_model.hama_penyakit_list)
+    log.append(diagnosis_model, EVIDENCE, np.full(n, 0.5), timestamp=0)
+    assert log.files() == []
+
+    deadline = time.monotonic() + 5
+    while not log.files() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(log.files()) == 1
+    assert _count(log) == 1
+
+
+def test_flush_does_not_compact_on_the_calling_thread(diagnosis_model, tmp_path, monkeypatch):
+    log = DiagnosisLog(str(tmp_path), compact_files=2)
+    callers = []
+    compact = log.compact
+
+    def record_thread(*args, **kwargs):
+        callers.append(threading.current_thread())
+        return compact(*args, **kwargs)
+
+    monkeypatch.setattr(log, 'compact', record_thread)
+    _fill(log, diagnosis_model, 3)
+    log.wait_for_compaction()
+
+    assert callers and threading.current_thread() not in callers
+    assert _count(log) == 3
+
+
+def test_timer_flush_logs_unexpected_errors(diagnosis_model, tmp_path, monkeypatch, caplog):
+    log = DiagnosisLog(str(tmp_path))
+
+    def broken_flush():
+        raise RuntimeError("pyarrow rusak")
+
+    monkeypatch.setattr(log, 'flush', broken_flush)
+    log._timed_flush()
+
+    assert 'pyarrow rusak' in caplog.text
+
+
+def test_concurrent_compactions_never_merge_a_part_twice(diagnosis_model, tmp_path):
+    writer = DiagnosisLog(str(tmp_path), compact_files=1000)
+    _fill(writer, diagnosis_model, 40)
+    # Satu instance per "proses": kunci dalam proses tidak saling melindungi
+    logs = [DiagnosisLog(str(tmp_path)) for _ in range(4)]
+    barrier = threading.Barrier(len(logs))
+    errors = []
+
+    def run(log):
+        barrier.wait()
+        try:
+            log.compact(include_compacted=True)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(log,)) for log in logs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert _count(writer) == 40
+    assert not [f for f in os.listdir(tmp_path) if f.startswith(CLAIM_PREFIX)]
+
+
+def test_query_survives_files_compacted_after_listing(diagnosis_model, tmp_path, monkeypatch):
+    log = DiagnosisLog(str(tmp_path), compact_files=1000)
+    _fill(log, diagnosis_model, 10)
+    listed = log.files
+
+    def files_then_compact(prefix=''):
+        # Proses lain mengompaksi tepat setelah daftar file diambil
+        files = listed(prefix)
+        DiagnosisLog(str(tmp_path)).compact(include_compacted=True)
+        return files
+
+    monkeypatch.setattr(log, 'files', files_then_compact)
+    assert _count(log) <= 10
+
+    monkeypatch.undo()
+    assert _count(log) == 10
+
+
+def test_auto_compaction_folds_small_compacted_files(diagnosis_model, tmp_path):
+    log = DiagnosisLog(str(tmp_path), compact_files=4)
+    _fill(log, diagnosis_model, 50)
+    log.wait_for_compaction()
+
+    assert len(log.files()) < 4
+    assert _count(log) == 50
+
+
+def test_stale_claims_are_restored(diagnosis_model, tmp_path):
+    log = DiagnosisLog(str(tmp_path), compact_files=1000)
+    _fill(log, diagnosis_model, 3)
+    [orphan, *_] = log.files('part-')
+    os.rename(orphan, os.path.join(tmp_path, f"{CLAIM_PREFIX}1-99-{os.path.basename(orphan)}"))
+
+    log.compact()
+
+    assert _count(log) == 3
+
+
+def test_weeks_start_on_monday(diagnosis_model, tmp_path):
+    log = DiagnosisLog(str(tmp_path))
+    thursday = np.datetime64('2026-10-15T12:00', 's').astype(np.int64)
+    sunday = np.datetime64('2026-10-18T23:00', 's').astype(np.int64)
+    log.append(diagnosis_model, EVIDENCE, np.zeros(len(diagnosis_model.hama_penyakit_list)),
+               timestamp=float(thursday))
+    log.append(diagnosis_model, EVIDENCE, np.zeros(len(diagnosis_model.hama_penyakit_list)),
+               timestamp=float(sunday))
+
+    [week] = log.prevalence('minggu')
+    assert week['periode'] == '2026-10-12'
+    assert week['jumlah'] == 2
+
+
+def test_same_hash_with_different_disease_order_keeps_names(diagnosis_model, tmp_path):
+    rule_list = diagnosis_model.rule_list
+    reordered = [item for item in rule_list if item['nama'] == rule_list[-1]['nama']] + \
+        [item for item in rule_list if item['nama'] != rule_list[-1]['nama']]
+    models = [DiagnosisModel.from_rules(rules, [], 'hash-sama') for rules in (rule_list, reordered)]
+    assert models[0].hama_penyakit_list != models[1].hama_penyakit_list
+    expected = {d: (i + 1) / 100 for i, d in enumerate(models[0].hama_penyakit_list)}
+
+    # Dua "proses" berbagi folder log, masing-masing dengan urutan kolomnya sendiri
+    for model in models:
+        log = DiagnosisLog(str(tmp_path))
+        log.append(model, EVIDENCE, expected, timestamp=0)
+        log.flush()
+
+    [period] = DiagnosisLog(str(tmp_path)).prevalence('tahun')
+    assert period['jumlah'] == 2
+    assert period['prevalensi'] == pytest.approx(expected)
+
+
+def test_empirical_priors_smooth_toward_model_priors(diagnosis_model, tmp_path, capsys):
+    log = DiagnosisLog(str(tmp_path))
+    n = len(diagnosis_model.hama_penyakit_list)
+    log.append(diagnosis_model, EVIDENCE, np.full(n, 0.2), timestamp=0)
+    log.flush()
+
+    priors = log.empirical_priors(pseudo_count=1.0)
+    expected = {disease: (0.2 + PENYAKIT_PRIORS[disease]) / 2
+                for disease in diagnosis_model.hama_penyakit_list}
+    assert priors == pytest.approx(expected)
+    assert log.empirical_priors(base_priors={}, pseudo_count=1.0) == \
+        pytest.approx(dict.fromkeys(expected, (0.2 + DEFAULT_PRIOR) / 2))
+
+    history.main(['--dir', str(tmp_path), 'prior', '--pseudo-count', '1'])
+    assert json.loads(capsys.readouterr().out) == pytest.approx(expected)
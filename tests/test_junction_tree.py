@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from conftest import random_evidence
+from diagnosis.junction_tree import HEURISTICS, JunctionTreeInference
+from diagnosis.quickscore import QuickscoreInference
+
+
+@pytest.mark.parametrize('heuristic', HEURISTICS)
+def test_junction_tree_matches_quickscore(diagnosis_model, heuristic):
+    model = diagnosis_model.noisy_or
+    tree = JunctionTreeInference(model, heuristic)
+    engine = QuickscoreInference(model)
+
+    # Kalibrasi berulang pada tree yang sama tidak boleh membawa evidence sebelumnya
+    for evidence in random_evidence(model.symptoms, 20, seed=1):
+        np.testing.assert_allclose(tree.posterior_vector(evidence),
+                                   engine.posterior_vector(evidence), atol=1e-10)
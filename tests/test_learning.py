@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+
+from diagnosis import learning
+from diagnosis.learning import SufficientStatistics, learn_parameters, read_cases
+
+
+def test_invalid_cases_are_skipped_without_aborting(diagnosis_model, tmp_path, caplog):
+    path = tmp_path / 'kasus.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'gejala': ['Akar_busuk'], 'penyakit': ['Phytium_sp']}),
+        '{"gejala": ["Akar_busuk"',
+        json.dumps({'gejala': ['Daun_layu'], 'gejala_tidak_ada': ['Daun_layu'], 'penyakit': []}),
+        json.dumps({'gejala': ['Daun_layu'], 'penyakit': {'nama': 'Phytium_sp'}}),
+        json.dumps({'gejala_tidak_ada': ['Akar_busuk'], 'penyakit': None}),
+    ]) + '\n', encoding='utf-8')
+
+    cases = list(read_cases(str(path)))
+
+    assert cases == [({'Akar_busuk': 1}, ['Phytium_sp']), ({'Akar_busuk': 0}, None)]
+    skipped = [r.getMessage() for r in caplog.records if 'dilewati' in r.getMessage()]
+    assert len(skipped) == 3
+    learned = learn_parameters(diagnosis_model.noisy_or, lambda: read_cases(str(path)))
+    assert np.all((learned.prior >= 0) & (learned.prior <= 1))
+
+
+def test_csv_labels_and_invalid_cells(tmp_path):
+    path = tmp_path / 'kasus.csv'
+    path.write_text('id,Akar_busuk,Daun_layu,penyakit\n'
+                    '1,1,,Phytium_sp;Lanas\n2,mungkin,0,-\n3,0,1,-\n4,,1,\n', encoding='utf-8')
+
+    assert list(read_cases(str(path))) == [
+        ({'Akar_busuk': 1}, ['Phytium_sp', 'Lanas']),
+        ({'Akar_busuk': 0, 'Daun_layu': 1}, []),
+        ({'Daun_layu': 1}, None),
+    ]
+
+
+def test_labeled_cases_recover_true_parameters(diagnosis_model):
+    start = diagnosis_model.noisy_or
+    rng = np.random.default_rng(0)
+    prior = rng.uniform(0.2, 0.5, start.n_diseases)
+    link = np.where(start.mask, rng.uniform(0.3, 0.9, start.link.shape), 0.0)
+    leak = rng.uniform(0.01, 0.1, start.n_symptoms)
+
+    n_cases = 20_000
+    diseases = rng.random((n_cases, start.n_diseases)) < prior
+    # Noisy-OR: gejala tidak muncul hanya bila leak dan semua parent aktif gagal
+    p_absent = (1 - leak) * np.exp(diseases @ np.log1p(-link).T)
+    symptoms = rng.random(p_absent.shape) >= p_absent
+    cases = [(dict(zip(start.symptoms, row.astype(int).tolist())),
+              [start.diseases[j] for j in np.flatnonzero(labels)])
+             for row, labels in zip(symptoms, diseases)]
+
+    learned = learn_parameters(start, lambda: iter(cases))
+
+    np.testing.assert_allclose(learned.prior, prior, atol=0.02)
+    np.testing.assert_allclose(learned.link[start.mask], link[start.mask], atol=0.05)
+    np.testing.assert_allclose(learned.leak, leak, atol=0.02)
+
+
+def test_expected_counts_do_not_depend_on_chunking(diagnosis_model, monkeypatch):
+    model = diagnosis_model.noisy_or
+    rng = np.random.default_rng(1)
+    posterior = rng.uniform(0.0, 1.0, (500, model.n_diseases))
+    evidence = rng.integers(-1, 2, (500, model.n_symptoms)).astype(np.int8)
+
+    whole = SufficientStatistics(model)
+    whole.add_expected(posterior, evidence)
+    # Blok beberapa baris saja: matriks bobot tidak pernah memuat seluruh batch
+    monkeypatch.setattr(learning, 'MAX_WEIGHT_ELEMENTS', 64)
+    chunked = SufficientStatistics(model)
+    chunked.add_expected(posterior, evidence)
+
+    assert all(chunked.chunk_rows(i) * 2 ** factor.n_parents <= max(64, 2 ** factor.n_parents)
+               for i, factor in enumerate(model.factors))
+    for counts, expected in zip(chunked.pattern_counts, whole.pattern_counts):
+        np.testing.assert_allclose(counts, expected, rtol=1e-10)
@@ -0,0 +1,17 @@
+import json
+import os
+
+from conftest import INDIVIDUALS_PATH, RULE_PATH
+from graph_parsing import parse
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_parser_output_matches_committed_json(tmp_path):
+    parse.main([os.path.join(parse.BASE_DIR, 'tobonto_rev.rdf'), '-o', str(tmp_path)])
+
+    assert _load(tmp_path / 'rule_list.json') == _load(RULE_PATH)
+    assert _load(tmp_path / 'individuals_list.json') == _load(INDIVIDUALS_PATH)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from conftest import random_evidence
+from diagnosis.quickscore import QuickscoreInference
+
+
+@pytest.mark.parametrize('evidence', random_evidence(
+    ['Akar_busuk', 'Daun_layu', 'Tanaman_kerdil', 'Daun_berlubang', 'Daun_mengkerut',
+     'Perlukaan_akar', 'Batang_layu'], 8, max_observed=5))
+def test_quickscore_matches_variable_elimination(diagnosis_model, evidence):
+    model = diagnosis_model.noisy_or
+    posterior = QuickscoreInference(model).posterior_vector(evidence)
+
+    expected = [diagnosis_model.infer.query([disease], evidence=evidence,
+                                            show_progress=False).values[1]
+                for disease in model.diseases]
+    np.testing.assert_allclose(posterior, expected, atol=1e-10)
@@ -0,0 +1,61 @@
+import shutil
+
+from conftest import INDIVIDUALS_PATH, RULE_PATH
+from diagnosis import core
+from diagnosis.cache import PosteriorCache
+from diagnosis.core import load_model
+from diagnosis.registry import ModelRegistry
+
+
+def _bundle(tmp_path, name):
+    folder = tmp_path / name
+    folder.mkdir()
+    shutil.copy(RULE_PATH, folder / 'rule_list.json')
+    shutil.copy(INDIVIDUALS_PATH, folder / 'individuals_list.json')
+    return str(folder / 'rule_list.json')
+
+
+def test_least_recently_used_model_is_evicted_over_memory_cap(tmp_path):
+    registry = ModelRegistry(memory_cap=1)
+    registry.register('tembakau', _bundle(tmp_path, 'tembakau'))
+    registry.register('cabai', _bundle(tmp_path, 'cabai'))
+
+    first = registry.get('tembakau')
+    assert registry.loaded() == ['tembakau']
+    registry.get('cabai')
+
+    assert registry.loaded() == ['cabai']
+    assert registry.memory_usage() == registry.get('cabai').nbytes
+    # clear_cache membuang model yang dikeluarkan, sehingga dimuat ulang saat diminta lagi
+    assert registry.get('tembakau') is not first
+    assert registry.loaded() == ['tembakau']
+
+
+def test_models_within_memory_cap_stay_loaded_in_lru_order(tmp_path):
+    registry = ModelRegistry()
+    registry.register('tembakau', _bundle(tmp_path, 'tembakau'))
+    registry.register('cabai', _bundle(tmp_path, 'cabai'))
+
+    registry.get('tembakau')
+    registry.get('cabai')
+    registry.get('tembakau')
+
+    assert registry.loaded() == ['cabai', 'tembakau']
+
+
+def test_nbytes_includes_caches_and_lazy_engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, 'posterior_cache', PosteriorCache())
+    # Salinan rule di tmp_path agar tidak memakai model bersama dari cache load_model
+    diagnosis_model = load_model(_bundle(tmp_path, 'tembakau'))
+    base = diagnosis_model.nbytes
+
+    diagnosis_model.pruned.posterior_vector({'Akar_busuk': 1})
+    with_subnetwork = diagnosis_model.nbytes
+    assert with_subnetwork == base + diagnosis_model.pruned.nbytes > base
+
+    diagnosis_model.posteriors({'Daun_layu': 1})
+    with_posterior = diagnosis_model.nbytes
+    assert with_posterior > with_subnetwork
+
+    diagnosis_model.bayesian_model
+    assert diagnosis_model.nbytes > with_posterior
@@ -0,0 +1,22 @@
+import numpy as np
+
+from conftest import random_evidence
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.sampling import LikelihoodWeighting
+
+
+def test_confidence_intervals_cover_exact_posterior(diagnosis_model):
+    model = diagnosis_model.noisy_or
+    engine = QuickscoreInference(model)
+    sampler = LikelihoodWeighting(model, seed=0)
+
+    covered = []
+    for evidence in random_evidence(model.symptoms, 10, max_observed=4, seed=2):
+        exact = engine.posterior_vector(evidence)
+        result = sampler.estimate(evidence, n_samples=20_000)
+        assert result['samples'] == 20_000
+        covered.append((result['lower'] - 1e-12 <= exact) & (exact <= result['upper'] + 1e-12))
+        np.testing.assert_allclose(result['posterior'], exact, atol=0.05)
+
+    # Interval 95% (Wald): sebagian kecil boleh meleset, terutama posterior mendekati 0
+    assert np.mean(covered) >= 0.85
@@ -0,0 +1,30 @@
+from diagnosis.search import SymptomSearchIndex
+
+NAMES = ['Daun_layu', 'Bercak_daun', 'Akar_busuk', 'Daun_berlubang', 'Batang_layu',
+         'Busuk_batang']
+
+
+def test_short_terms_match_word_prefixes_only():
+    index = SymptomSearchIndex(NAMES)
+
+    # "ba" cocok dengan awal kata "batang", bukan "ba" di tengah kata lain
+    assert index.search('ba') == ['Batang_layu', 'Busuk_batang']
+    assert index.search('d') == ['Daun_layu', 'Bercak_daun', 'Daun_berlubang']
+    assert index.search('un') == []
+
+
+def test_long_terms_match_substrings():
+    index = SymptomSearchIndex(NAMES)
+
+    assert index.search('aun') == ['Daun_layu', 'Bercak_daun', 'Daun_berlubang']
+    assert index.search('usu') == ['Akar_busuk', 'Busuk_batang']
+    assert index.search('daun_bercak') == ['Bercak_daun']
+
+
+def test_every_term_must_match_and_order_follows_names():
+    index = SymptomSearchIndex(list(reversed(NAMES)))
+
+    assert index.search('lay b') == ['Batang_layu']
+    assert index.search('DAUN') == ['Daun_berlubang', 'Bercak_daun', 'Daun_layu']
+    assert index.search('  ') == list(reversed(NAMES))
+    assert index.search('layu xyz') == []
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from diagnosis.noisy_or import NoisyOrModel
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.sensitivity import SensitivityAnalysis
+
+pytest.importorskip('torch')
+
+EVIDENCE = [
+    {'Akar_busuk': 1, 'Daun_layu': 1, 'Tanaman_kerdil': 0},
+    {'Daun_mengkerut': 1, 'Tanaman_kerdil': 1, 'Daun_berlubang': 0},
+    {'Perlukaan_akar': 0, 'Daun_layu': 1},
+]
+STEP = 1e-6
+
+
+def _posterior(model, prior=None, link=None, leak=None):
+    perturbed = NoisyOrModel(model.diseases, model.symptoms,
+                             model.prior if prior is None else prior,
+                             model.link if link is None else link, model.mask,
+                             model.leak if leak is None else leak)
+    engine = QuickscoreInference(perturbed)
+    return np.array([engine.posterior_vector(evidence) for evidence in EVIDENCE])
+
+
+def _central(model, name, index):
+    values = {'prior': model.prior, 'link': model.link, 'leak': model.leak}[name]
+    up, down = values.copy(), values.copy()
+    up[index] += STEP
+    down[index] -= STEP
+    return (_posterior(model, **{name: up}) - _posterior(model, **{name: down})) / (2 * STEP)
+
+
+def test_derivatives_match_finite_differences(diagnosis_model):
+    model = diagnosis_model.noisy_or
+    analysis = SensitivityAnalysis(model)
+    result = analysis.derivatives(diagnosis_model.vocabulary.state_matrix(EVIDENCE),
+                                  chunk_size=2)
+
+    np.testing.assert_allclose(result['posterior'], _posterior(model), atol=1e-12)
+    for e, (i, j) in enumerate(analysis.edges):
+        np.testing.assert_allclose(result['skor'][:, :, e], _central(model, 'link', (i, j)),
+                                   atol=1e-7)
+    for j in range(model.n_diseases):
+        np.testing.assert_allclose(result['prior'][:, :, j], _central(model, 'prior', j),
+                                   atol=1e-7)
+    for i in range(model.n_symptoms):
+        np.testing.assert_allclose(result['leak'][:, :, i], _central(model, 'leak', i),
+                                   atol=1e-7)
+
+
+def test_chunk_rows_bound_the_jacobian(diagnosis_model, monkeypatch):
+    from diagnosis import sensitivity
+
+    analysis = SensitivityAnalysis(diagnosis_model.noisy_or)
+    model = diagnosis_model.noisy_or
+    per_row = model.n_diseases * (len(analysis.edges) + model.n_diseases + model.n_symptoms)
+    monkeypatch.setattr(sensitivity, 'MAX_JACOBIAN_ELEMENTS', 3 * per_row)
+
+    assert analysis.chunk_rows(1024) == 3
+    assert analysis.chunk_rows(2) == 2
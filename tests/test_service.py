@@ -0,0 +1,122 @@
+import asyncio
+import json
+import shutil
+
+from tornado.testing import AsyncHTTPTestCase
+
+from conftest import RULE_PATH
+from diagnosis.artifact import DEFAULT_ARTIFACT_PATH
+from diagnosis.registry import DEFAULT_CROP
+from diagnosis.service import DiagnosisService, make_app
+from diagnosis.telemetry import telemetry
+
+
+class DiagnosisServiceTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.service = DiagnosisService(RULE_PATH, workers=1, bundle_dir='')
+        return make_app(self.service)
+
+    def setUp(self):
+        super().setUp()
+        self.io_loop.run_sync(self.service.start)
+
+    def tearDown(self):
+        self.service.shutdown()
+        super().tearDown()
+
+    def post_diagnosis(self, body):
+        response = self.fetch('/diagnosis', method='POST', body=json.dumps(body))
+        return response.code, json.loads(response.body)
+
+    def test_conflicting_evidence_is_rejected(self):
+        code, payload = self.post_diagnosis({'gejala': ['Daun_layu'],
+                                             'gejala_tidak_ada': ['Daun_layu']})
+        assert code == 400
+        assert 'Daun_layu' in payload['error']
+
+    def test_valid_request_returns_ranked_posteriors(self):
+        code, payload = self.post_diagnosis({'gejala': ['Akar_busuk'], 'top': 3})
+        assert code == 200
+        assert len(payload['posterior']) == 3
+        probabilities = [item['probabilitas'] for item in payload['posterior']]
+        assert probabilities == sorted(probabilities, reverse=True)
+
+    def test_symptoms_must_be_a_list_of_names(self):
+        for body in ({'gejala': 'Akar_busuk'}, {'gejala': ['Akar_busuk', 1]},
+                     {'gejala': ['Akar_busuk'], 'gejala_tidak_ada': {'Daun_layu': 0}}):
+            code, payload = self.post_diagnosis(body)
+            assert code == 400
+            assert 'list nama gejala' in payload['error']
+
+    def test_crop_must_be_a_name(self):
+        for crop in (['tembakau'], {'nama': 'tembakau'}, 1):
+            code, payload = self.post_diagnosis({'gejala': ['Akar_busuk'], 'tanaman': crop})
+            assert code == 400
+            assert 'tanaman' in payload['error']
+
+    def test_negative_top_is_rejected(self):
+        code, payload = self.post_diagnosis({'gejala': ['Akar_busuk'], 'top': -2})
+        assert code == 400
+        assert 'top' in payload['error']
+
+    def test_zero_top_returns_all_diseases(self):
+        code, payload = self.post_diagnosis({'gejala': ['Akar_busuk'], 'top': 0})
+        assert code == 200
+        assert len(payload['posterior']) == len(self.service.diagnosis_model.hama_penyakit_list)
+
+
+class WarmWorkersTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.service = DiagnosisService(RULE_PATH, workers=2, bundle_dir='')
+        return make_app(self.service)
+
+    def tearDown(self):
+        self.service.shutdown()
+        super().tearDown()
+
+    def test_ready_only_after_every_worker_loaded_the_model(self):
+        assert self.fetch('/ready').code == 503
+        self.io_loop.run_sync(self.service.start)
+        assert self.fetch('/ready').code == 200
+
+        # Setiap proses di pool sudah memuat model tanaman default
+        pids = self.io_loop.run_sync(lambda: self.service._warm_workers(self.service.default_crop))
+        assert pids == sorted(self.service._executor._processes)
+        assert len(pids) == 2
+
+
+def test_default_crop_uses_artifact_next_to_rule(tmp_path):
+    rule_path = tmp_path / 'rule_list.json'
+    shutil.copy(RULE_PATH, rule_path)
+    assert DiagnosisService(str(rule_path), bundle_dir='').registry.bundles[DEFAULT_CROP][
+        'artifact_path'] is None
+
+    (tmp_path / DEFAULT_ARTIFACT_PATH).touch()
+    bundle = DiagnosisService(str(rule_path), bundle_dir='').registry.bundles[DEFAULT_CROP]
+    assert bundle['artifact_path'] == str(tmp_path / DEFAULT_ARTIFACT_PATH)
+
+
+def test_identical_concurrent_requests_share_one_computation(diagnosis_model, monkeypatch):
+    monkeypatch.setattr(telemetry, 'enabled', True)
+    telemetry.reset()
+    service = DiagnosisService(RULE_PATH, workers=1, bundle_dir='')
+    calls = []
+
+    async def compute(crop, evidence):
+        calls.append((crop, evidence))
+        await asyncio.sleep(0.01)
+        return diagnosis_model.content_hash, [('Kutu_kebul', 0.5)]
+
+    monkeypatch.setattr(service, '_compute', compute)
+
+    async def run(n):
+        return await asyncio.gather(*[service.diagnose({'Akar_busuk': 1}, crop=DEFAULT_CROP,
+                                                       diagnosis_model=diagnosis_model)
+                                      for _ in range(n)])
+
+    results = asyncio.run(run(5))
+
+    assert len(calls) == 1
+    assert results == [(diagnosis_model.content_hash, {'Kutu_kebul': 0.5})] * 5
+    assert telemetry.snapshot()['counters']['service_coalesced'] == 4
+    assert service._inflight == {}
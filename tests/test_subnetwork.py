@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from conftest import RULE_PATH
+from diagnosis import service
+from diagnosis.batch import diagnose_records
+from diagnosis.cache import PosteriorCache
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.registry import ModelRegistry
+from diagnosis.subnetwork import PrunedInference
+
+EVIDENCE = {'Akar_busuk': 1, 'Daun_layu': 1, 'Batang_layu': 0}
+
+
+@pytest.fixture
+def engine_sizes(monkeypatch):
+    """Jumlah penyakit model di setiap pemanggilan QuickscoreInference.posterior_vector"""
+    sizes = []
+    original = QuickscoreInference.posterior_vector
+
+    def spy(self, evidence, index=None):
+        sizes.append(self.model.n_diseases)
+        return original(self, evidence, index)
+
+    monkeypatch.setattr(QuickscoreInference, 'posterior_vector', spy)
+    return sizes
+
+
+def test_pruned_posterior_matches_full_model(diagnosis_model):
+    full = diagnosis_model.engine.posterior_vector(EVIDENCE)
+    pruned = diagnosis_model.pruned.posterior_vector(EVIDENCE)
+    np.testing.assert_allclose(pruned, full, atol=1e-12)
+
+    index = np.array([5, 0, 11, 3])
+    np.testing.assert_allclose(diagnosis_model.pruned.posterior_vector(EVIDENCE, index),
+                               full[index], atol=1e-12)
+
+
+def test_served_path_uses_pruned_engine(diagnosis_model, engine_sizes):
+    registry = ModelRegistry()
+    registry.register('tembakau', RULE_PATH)
+    service._init_worker(registry.bundles, registry.memory_cap)
+
+    _, posterior, _ = service._worker_posterior('tembakau', tuple(sorted(EVIDENCE.items())))
+
+    assert engine_sizes and max(engine_sizes) < diagnosis_model.noisy_or.n_diseases
+    expected = diagnosis_model.engine.query(EVIDENCE)
+    for name, prob in posterior:
+        assert prob == pytest.approx(expected[name], abs=1e-12)
+
+
+def test_top_k_uses_pruned_engine(diagnosis_model, engine_sizes):
+    result = diagnosis_model.top_k(EVIDENCE, k=3, cache=PosteriorCache())
+
+    assert max(engine_sizes) < diagnosis_model.noisy_or.n_diseases
+    expected = diagnosis_model.engine.query(EVIDENCE)
+    for name in result['ranking']:
+        lower, upper = result['bounds'][name]
+        assert lower <= expected[name] + 1e-12 and expected[name] <= upper + 1e-12
+
+
+def test_batch_uses_pruned_engine(diagnosis_model, engine_sizes):
+    records = [('1', EVIDENCE, None)]
+    [(_, posterior, error)] = diagnose_records(records, engine=diagnosis_model.pruned, workers=1)
+
+    assert error is None
+    assert max(engine_sizes) < diagnosis_model.noisy_or.n_diseases
+
+
+def test_subnetwork_cache_is_bounded_and_counted_in_nbytes(diagnosis_model):
+    engine = PrunedInference(diagnosis_model.noisy_or, cache_size=2)
+    assert engine.nbytes == 0
+
+    first = engine.subnetwork({'Akar_busuk': 1})
+    assert engine.subnetwork({'Akar_busuk': 0}) is first
+    assert engine.nbytes == first.nbytes > 0
+
+    engine.subnetwork({'Daun_layu': 1})
+    engine.subnetwork({'Batang_layu': 1})
+    # Subnetwork paling lama tidak dipakai dibuang dan dikompilasi ulang
+    assert engine.subnetwork({'Akar_busuk': 1}) is not first
+    assert engine.nbytes == sum(engine.subnetwork({s: 1}).nbytes
+                                for s in ('Batang_layu', 'Akar_busuk'))
@@ -0,0 +1,95 @@
+import pstats
+
+from conftest import RULE_PATH
+from diagnosis import service
+from diagnosis.registry import ModelRegistry
+from diagnosis.telemetry import PROFILE_ENV, Telemetry, profile, telemetry
+
+
+def test_prometheus_export_lists_stages_counters_and_gauges():
+    metrics = Telemetry(enabled=True)
+    metrics.record('top_k', 0.25)
+    metrics.record('top_k', 0.5)
+    metrics.count('queries', 3)
+    metrics.gauge('model_diseases', 12)
+
+    lines = metrics.to_prometheus().splitlines()
+
+    assert 'diagnosis_stage_seconds_count{stage="top_k"} 2' in lines
+    assert 'diagnosis_stage_seconds_sum{stage="top_k"} 0.750000000' in lines
+    assert 'diagnosis_stage_seconds_max{stage="top_k"} 0.500000000' in lines
+    assert '# TYPE diagnosis_queries_total counter' in lines
+    assert 'diagnosis_queries_total 3' in lines
+    assert 'diagnosis_model_diseases 12' in lines
+    assert any(line.startswith('diagnosis_posterior_cache_hit_ratio ') for line in lines)
+    assert not any('posterior_cache' in line
+                   for line in metrics.to_prometheus(include_cache=False).splitlines())
+
+
+def test_disabled_telemetry_records_nothing():
+    metrics = Telemetry()
+    with metrics.stage('top_k'):
+        metrics.count('queries')
+
+    assert metrics.drain() is None
+    snapshot = metrics.snapshot()
+    assert snapshot['stages'] == {} and snapshot['counters'] == {}
+
+
+def test_worker_metrics_are_merged_into_parent():
+    parent, worker = Telemetry(enabled=True), Telemetry(enabled=True)
+    parent.record('service.diagnosis', 1.0)
+    parent.count('queries')
+    worker.record('worker.posterior', 0.5)
+    worker.count('queries', 2)
+
+    parent.merge(worker.drain())
+    parent.merge(worker.drain())
+
+    snapshot = parent.snapshot()
+    assert snapshot['stages']['worker.posterior'] == {'count': 1, 'total_seconds': 0.5,
+                                                      'max_seconds': 0.5}
+    assert snapshot['counters']['queries'] == 3
+    assert worker.snapshot()['stages'] == {}
+
+
+def test_worker_result_carries_its_stage_timings(monkeypatch):
+    monkeypatch.setattr(telemetry, 'enabled', True)
+    telemetry.reset()
+    registry = ModelRegistry()
+    registry.register('tembakau', RULE_PATH)
+    service._init_worker(registry.bundles, registry.memory_cap)
+
+    _, _, metrics = service._worker_posterior('tembakau', (('Akar_busuk', 1),))
+
+    assert metrics['stages']['worker.posterior']['count'] == 1
+    assert telemetry.snapshot()['stages'] == {}
+
+
+def test_profile_writes_cprofile_stats(tmp_path):
+    path = str(tmp_path / 'diagnosis.prof')
+    with profile(path):
+        sorted(range(1000), key=lambda x: -x)
+
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_profile_env_flag_writes_profile(tmp_path, monkeypatch):
+    path = tmp_path / 'diagnosis.prof'
+    monkeypatch.setenv(PROFILE_ENV, str(path))
+
+    with profile():
+        sorted(range(1000), key=lambda x: -x)
+
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_profiling_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    with profile() as profiler:
+        sorted(range(1000))
+
+    assert profiler is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from conftest import random_evidence
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.topk import complete_posterior, posterior_bounds, top_k
+
+SYMPTOMS = ['Akar_busuk', 'Daun_layu', 'Tanaman_kerdil', 'Daun_berlubang', 'Daun_mengkerut',
+            'Perlukaan_akar', 'Batang_layu']
+
+
+@pytest.mark.parametrize('evidence', random_evidence(SYMPTOMS, 12, max_observed=5, seed=3))
+def test_posterior_bounds_bracket_exact_posterior(diagnosis_model, evidence):
+    model = diagnosis_model.noisy_or
+    exact = QuickscoreInference(model).posterior_vector(evidence)
+
+    lower, upper = posterior_bounds(model, evidence)
+
+    assert np.all(lower <= exact + 1e-12)
+    assert np.all(exact <= upper + 1e-12)
+
+
+@pytest.mark.parametrize('evidence', random_evidence(SYMPTOMS, 12, max_observed=5, seed=4))
+@pytest.mark.parametrize('k', [1, 3, 5])
+def test_top_k_returns_exact_top_k_set(diagnosis_model, evidence, k):
+    engine = QuickscoreInference(diagnosis_model.noisy_or)
+    exact = engine.posterior_vector(evidence)
+
+    result = top_k(engine, evidence, k)
+
+    assert result['gap'] >= 0
+    # Ties di batas ke-k boleh tertukar: bandingkan nilai posteriornya
+    expected = np.sort(exact)[::-1][:k]
+    ranked = [exact[engine.model.disease_index[d]] for d in result['ranking']]
+    np.testing.assert_allclose(ranked, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize('evidence', random_evidence(SYMPTOMS, 4, max_observed=5, seed=5))
+def test_complete_posterior_matches_full_quickscore(diagnosis_model, evidence):
+    engine = diagnosis_model.pruned
+    result = top_k(engine, evidence, 3)
+
+    np.testing.assert_allclose(complete_posterior(engine, evidence, result),
+                               diagnosis_model.engine.posterior_vector(evidence), atol=1e-12)
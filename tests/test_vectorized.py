@@ -0,0 +1,22 @@
+import numpy as np
+
+from conftest import random_evidence
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.vectorized import VectorizedInference
+
+
+def test_posterior_matrix_matches_quickscore_per_row(diagnosis_model):
+    model = diagnosis_model.noisy_or
+    cases = random_evidence(model.symptoms, 50)
+    matrix = np.full((len(cases), model.n_symptoms), UNOBSERVED, dtype=np.int8)
+    for row, evidence in enumerate(cases):
+        for symptom, state in evidence.items():
+            matrix[row, model.symptom_index[symptom]] = PRESENT if state else ABSENT
+
+    # chunk_size kecil agar baris satu pola terbagi ke beberapa blok
+    posterior = VectorizedInference(model).posterior_matrix(matrix, chunk_size=8)
+
+    engine = QuickscoreInference(model)
+    expected = np.array([engine.posterior_vector(evidence) for evidence in cases])
+    np.testing.assert_allclose(posterior, expected, atol=1e-12)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from conftest import random_evidence
+from diagnosis.evidence import ABSENT, PRESENT, UNOBSERVED
+
+SYMPTOMS = ['Akar_busuk', 'Daun_layu', 'Tanaman_kerdil', 'Daun_berlubang', 'Batang_layu']
+
+
+@pytest.mark.parametrize('evidence', random_evidence(SYMPTOMS, 6, max_observed=5, seed=2))
+def test_encode_decode_round_trip(diagnosis_model, evidence):
+    vocabulary = diagnosis_model.vocabulary
+
+    assert vocabulary.decode(vocabulary.encode(evidence)) == evidence
+
+
+def test_unobserved_symptoms_are_not_encoded(diagnosis_model):
+    vocabulary = diagnosis_model.vocabulary
+
+    bits = vocabulary.encode({'Akar_busuk': PRESENT, 'Daun_layu': UNOBSERVED,
+                              'Batang_layu': ABSENT})
+
+    assert bits == vocabulary.encode({'Akar_busuk': PRESENT, 'Batang_layu': ABSENT})
+    assert vocabulary.encode({'Daun_layu': UNOBSERVED}) == (0, 0)
+    np.testing.assert_array_equal(
+        vocabulary.state_matrix([{'Daun_layu': UNOBSERVED}]),
+        np.full((1, len(vocabulary.symptoms)), UNOBSERVED))
+
+
+def test_unknown_state_is_rejected(diagnosis_model):
+    with pytest.raises(ValueError, match='Daun_layu'):
+        diagnosis_model.vocabulary.encode({'Daun_layu': 7})
+    with pytest.raises(ValueError, match='Daun_layu'):
+        diagnosis_model.vocabulary.state_matrix([{'Daun_layu': 7}])
+
+
+def test_related_mask_matches_adjacency(diagnosis_model):
+    vocabulary = diagnosis_model.vocabulary
+    mask = diagnosis_model.noisy_or.mask
+    present, absent = vocabulary.encode({'Akar_busuk': PRESENT, 'Batang_layu': ABSENT})
+
+    expected = mask[[vocabulary.symptom_index['Akar_busuk'],
+                     vocabulary.symptom_index['Batang_layu']]].any(axis=0)
+    np.testing.assert_array_equal(vocabulary.related_mask(present | absent), expected)
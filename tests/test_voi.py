@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from diagnosis.quickscore import QuickscoreInference
+from diagnosis.voi import recommend_symptoms
+
+EVIDENCE = {'Akar_busuk': 1, 'Daun_layu': 0}
+TOP_DISEASES = 4
+
+
+def _entropy(p):
+    p = np.clip(p, 1e-300, 1 - 1e-16)
+    return float(-(p * np.log2(p) + (1 - p) * np.log2(1 - p)).sum())
+
+
+def test_gain_matches_per_outcome_recomputation(diagnosis_model):
+    model = diagnosis_model.noisy_or
+    engine = QuickscoreInference(model)
+    base = engine.posterior_vector(EVIDENCE)
+    targets = np.argsort(-base, kind='stable')[:TOP_DISEASES]
+
+    recommendations = recommend_symptoms(diagnosis_model.vectorized, EVIDENCE, TOP_DISEASES)
+    assert recommendations
+    assert [r['gain'] for r in recommendations] == sorted((r['gain'] for r in recommendations),
+                                                          reverse=True)
+    for item in recommendations:
+        symptom = item['gejala']
+        # P(gejala ada | evidence) dari variable elimination pgmpy
+        p_present = diagnosis_model.infer.query([symptom], evidence=EVIDENCE,
+                                                show_progress=False).values[1]
+        present = engine.posterior_vector({**EVIDENCE, symptom: 1})[targets]
+        absent = engine.posterior_vector({**EVIDENCE, symptom: 0})[targets]
+        gain = _entropy(base[targets]) - (p_present * _entropy(present)
+                                          + (1 - p_present) * _entropy(absent))
+
+        assert item['p_ada'] == pytest.approx(p_present, abs=1e-10)
+        assert item['gain'] == pytest.approx(max(gain, 0.0), abs=1e-9)